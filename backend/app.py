@@ -3,32 +3,55 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_jwt_extended import JWTManager
 from flask_cors import CORS
+from werkzeug.middleware.proxy_fix import ProxyFix
 from config import Config
+from backend.utils.json_provider import FastJSONProvider
+from backend.utils.database import RoutingSession
 
 # Initialize extensions
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 migrate = Migrate()
 jwt = JWTManager()
 
 def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
+    app.json = FastJSONProvider(app)
+    
+    # Behind reverse proxies remote_addr is the proxy; login rate limits need the client
+    hops = app.config['TRUSTED_PROXY_HOPS']
+    if hops:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=hops, x_proto=hops)
     
     # FIX: Disable strict slashes to prevent 308 redirects
     app.url_map.strict_slashes = False
     
     # Initialize extensions
+    from backend.utils import database
+    database.init_app(app)  # Engine options must be set before db.init_app creates the engines
     db.init_app(app)
     migrate.init_app(app, db)
     jwt.init_app(app)
     
+    from backend.services.cache_service import response_cache
+    response_cache.init_app(app)
+    
+    from backend.utils import compression
+    compression.init_app(app)
+    
+    from backend.utils import profiling
+    profiling.init_app(app)
+    
+    from backend.utils import metrics
+    metrics.init_app(app)
+    
     # Configure CORS with specific settings
     CORS(app, 
          origins=['http://localhost:5173', 'http://127.0.0.1:5173'],
          methods=['GET', 'POST', 'PUT', 'DELETE', 'OPTIONS'],
-         allow_headers=['Content-Type', 'Authorization'],
+         allow_headers=['Content-Type', 'Authorization', 'X-Read-After'],
          supports_credentials=True,
-         expose_headers=['Content-Length', 'X-JSON'])
+         expose_headers=['Content-Length', 'X-JSON', 'X-Read-After'])
     
     # Import models (needed for migrations)
     from backend.models.user import User
@@ -36,6 +59,16 @@ def create_app():
     from backend.models.service import Service, ServiceCategory, ServiceSubcategory
     from backend.models.trade import Trade
     from backend.models.favorite import Favorite
+    from backend.models.outbox import OutboxEvent
+    from backend.models.stream_event import StreamEvent
+    
+    # Register model event listeners that maintain listing counters, notifications and the outbox
+    from backend.services import counter_service
+    from backend.services import notification_service
+    from backend.services import outbox_service
+    
+    # Evict cached users (see get_current_user) when their rows change
+    from backend.services import user_cache
     
     # Register blueprints
     from backend.routes.auth import auth_bp
@@ -43,12 +76,22 @@ def create_app():
     from backend.routes.services import services_bp
     from backend.routes.search import search_bp
     from backend.routes.utils import utils_bp
+    from backend.routes.export import export_bp
+    from backend.routes.listings import listings_bp
+    from backend.routes.trades import trades_bp
+    from backend.routes.events import events_bp
+    from backend.routes.changes import changes_bp
     
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
     app.register_blueprint(products_bp, url_prefix='/api/products')
     app.register_blueprint(services_bp, url_prefix='/api/services')
     app.register_blueprint(search_bp, url_prefix='/api/search')
     app.register_blueprint(utils_bp, url_prefix='/api/utils')
+    app.register_blueprint(export_bp, url_prefix='/api/export')
+    app.register_blueprint(listings_bp, url_prefix='/api/listings')
+    app.register_blueprint(trades_bp, url_prefix='/api/trades')
+    app.register_blueprint(events_bp, url_prefix='/api/events')
+    app.register_blueprint(changes_bp, url_prefix='/api/changes')
     
     # Health check route
     @app.route('/api/health')
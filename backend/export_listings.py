@@ -0,0 +1,30 @@
+import sys
+import os
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.app import create_app
+from backend.services.export_service import ExportService
+
+def run_export(output, entities, user_id=None, data_format='ndjson'):
+    """Stream listings and trades to a file-like object"""
+    app = create_app()
+    with app.app_context():
+        for chunk in ExportService.generate(entities, user_id, data_format):
+            output.write(chunk)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Export SwapCycle listings and trades')
+    parser.add_argument('--user-id', type=int, help='Only export data owned by this user')
+    parser.add_argument('--types', help='Comma separated list of products, services, trades')
+    parser.add_argument('--format', dest='data_format', choices=ExportService.SUPPORTED_FORMATS, default='ndjson')
+    parser.add_argument('--output', help='Output file (defaults to stdout)')
+    args = parser.parse_args()
+
+    entities = ExportService.parse_entities(args.types)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8', newline='') as f:
+            run_export(f, entities, args.user_id, args.data_format)
+    else:
+        run_export(sys.stdout, entities, args.user_id, args.data_format)
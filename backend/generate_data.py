@@ -0,0 +1,415 @@
+import sys
+import os
+import argparse
+import multiprocessing
+import random
+import time
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import bindparam, func, insert, select, text, update
+
+from backend.app import create_app, db
+from backend.models.user import User
+from backend.models.product import Product, ProductCategory, ProductSubcategory
+from backend.models.service import Service, ServiceCategory, ServiceSubcategory
+from backend.models.trade import Trade
+from backend.models.favorite import Favorite
+from backend.seed_data import seed_product_categories, seed_service_categories
+from backend.services.password_service import password_hasher
+
+# (name, latitude, longitude, weight)
+CITIES = [
+    ('Barcelona', 41.3874, 2.1686, 30),
+    ('Madrid', 40.4168, -3.7038, 25),
+    ('Lisbon', 38.7223, -9.1393, 15),
+    ('Paris', 48.8566, 2.3522, 15),
+    ('Berlin', 52.5200, 13.4050, 10),
+    ('Sao Paulo', -23.5505, -46.6333, 5)
+]
+
+CLUSTER_SPREAD = 0.05  # Standard deviation in degrees (~5 km)
+ONLINE_SERVICE_SHARE = 0.3
+SERVICE_TRADE_SHARE = 0.25
+SERVICE_FAVORITE_SHARE = 0.3
+TRADE_STATUSES = ['pending', 'accepted', 'declined', 'cancelled']
+TRADE_STATUS_WEIGHTS = [6, 2, 1, 1]
+
+# Rows are generated in fixed chunks, each from its own seeded RNG, so the
+# data depends only on the seed and the sizes, never on the worker count
+CHUNK_SIZE = 5000
+MAX_OWNER_ATTEMPTS = 20
+
+WORDS = [
+    'vintage', 'bike', 'camera', 'guitar', 'sofa', 'lamp', 'laptop', 'jacket', 'books',
+    'lessons', 'repair', 'garden', 'yoga', 'cleaning', 'translation', 'design', 'toys', 'phone'
+]
+
+CONDITIONS = ['new', 'like_new', 'good', 'fair']
+
+TABLES = {
+    'users': User.__table__,
+    'products': Product.__table__,
+    'services': Service.__table__,
+    'trades': Trade.__table__,
+    'favorites': Favorite.__table__
+}
+
+# Each phase only references rows inserted by earlier phases
+PHASES = [('users',), ('products', 'services'), ('trades', 'favorites')]
+
+
+def _owner(index, plan, kind):
+    """User index owning a listing; a hash instead of a random pick so other chunks can recover it"""
+    salt = 0 if kind == 'products' else 7919
+    return ((index + salt) * 2654435761 + plan['seed']) % plan['sizes']['users']
+
+
+def _user_id(plan, user_index):
+    return plan['start']['users'] + user_index
+
+
+def _place(rng, city):
+    _, latitude, longitude, _ = city
+    return round(rng.gauss(latitude, CLUSTER_SPREAD), 6), round(rng.gauss(longitude, CLUSTER_SPREAD), 6)
+
+
+def _listing(rng, plan, index, kind, taxonomy):
+    user_index = _owner(index, plan, kind)
+    city = CITIES[plan['user_cities'][user_index]]
+    category_id, subcategories = rng.choice(taxonomy)
+    created_at = plan['now'] - timedelta(minutes=rng.randint(0, 60 * 24 * 90))
+    return city, {
+        'id': plan['start'][kind] + index,
+        'name': f'{rng.choice(WORDS).title()} {rng.choice(WORDS)}',
+        'description': ' '.join(rng.choice(WORDS) for _ in range(rng.randint(10, 60))),
+        'estimated_value': round(rng.lognormvariate(3.5, 1.0), 2),
+        'images': [f'/static/uploads/generated-{rng.randint(1, 500)}.jpg' for _ in range(rng.randint(0, 4))],
+        'address': f'{rng.randint(1, 300)} Generated Street, {city[0]}',
+        'user_id': _user_id(plan, user_index),
+        'category_id': category_id,
+        'subcategory_id': rng.choice(subcategories) if subcategories else None,
+        'availability_status': 'available',
+        'created_at': created_at,
+        'updated_at': created_at
+    }
+
+
+def _user_rows(rng, plan, start, stop):
+    rows = []
+    for index in range(start, stop):
+        user_id = _user_id(plan, index)
+        name, latitude, longitude, _ = CITIES[plan['user_cities'][index]]
+        created_at = plan['now'] - timedelta(days=rng.randint(90, 720))
+        rows.append({
+            'id': user_id,
+            'email': f'user{user_id}@generated.swapcycle.test',
+            'username': f'user{user_id}',
+            'password_hash': plan['password_hash'],
+            'name': 'Generated',
+            'surname': f'User {user_id}',
+            'address': f'{name} center',
+            'latitude': latitude,
+            'longitude': longitude,
+            'created_at': created_at,
+            'updated_at': created_at
+        })
+    return rows
+
+
+def _product_rows(rng, plan, start, stop):
+    rows = []
+    for index in range(start, stop):
+        city, row = _listing(rng, plan, index, 'products', plan['product_taxonomy'])
+        latitude, longitude = _place(rng, city)
+        row.update({
+            'condition': rng.choice(CONDITIONS),
+            'quantity': rng.choice([1, 1, 1, 2, 5]),
+            'latitude': latitude,
+            'longitude': longitude
+        })
+        rows.append(row)
+    return rows
+
+
+def _service_rows(rng, plan, start, stop):
+    rows = []
+    for index in range(start, stop):
+        city, row = _listing(rng, plan, index, 'services', plan['service_taxonomy'])
+        is_online = rng.random() < ONLINE_SERVICE_SHARE
+        latitude, longitude = (None, None) if is_online else _place(rng, city)
+        row.update({
+            'is_online': is_online,
+            'address': None if is_online else row['address'],
+            'latitude': latitude,
+            'longitude': longitude
+        })
+        rows.append(row)
+    return rows
+
+
+def _trade_rows(rng, plan, start, stop):
+    products, services = plan['sizes']['products'], plan['sizes']['services']
+    rows = []
+    for index in range(start, stop):
+        offered = rng.randrange(products)
+        proposer = _owner(offered, plan, 'products')
+
+        # Trades between a user and themselves are rejected by the API; tiny
+        # datasets may hold no listing of another user, leaving an id gap
+        requested_kind = 'services' if services and rng.random() < SERVICE_TRADE_SHARE else 'products'
+        for _ in range(MAX_OWNER_ATTEMPTS):
+            requested = rng.randrange(plan['sizes'][requested_kind])
+            receiver = _owner(requested, plan, requested_kind)
+            if receiver != proposer:
+                break
+        else:
+            continue
+
+        requested_id = plan['start'][requested_kind] + requested
+        created_at = plan['now'] - timedelta(minutes=rng.randint(0, 60 * 24 * 30))
+        rows.append({
+            'id': plan['start']['trades'] + index,
+            'proposer_id': _user_id(plan, proposer),
+            'receiver_id': _user_id(plan, receiver),
+            'offered_product_id': plan['start']['products'] + offered,
+            'offered_service_id': None,
+            'requested_product_id': requested_id if requested_kind == 'products' else None,
+            'requested_service_id': requested_id if requested_kind == 'services' else None,
+            'status': rng.choices(TRADE_STATUSES, weights=TRADE_STATUS_WEIGHTS)[0],
+            'proposal_message': 'Generated trade',
+            'created_at': created_at,
+            'updated_at': created_at
+        })
+    return rows
+
+
+def _favorite_rows(rng, plan, start, stop):
+    # The n-th favorite of a user walks the listings from a per-user offset,
+    # so (user, listing) pairs are unique without remembering earlier chunks
+    products, services, users = plan['sizes']['products'], plan['sizes']['services'], plan['sizes']['users']
+    rows = []
+    for index in range(start, stop):
+        user_index, position = index % users, index // users
+        use_service = services and (not products or rng.random() < SERVICE_FAVORITE_SHARE)
+        kind, count = ('services', services) if use_service else ('products', products)
+        item = (_owner(user_index, plan, kind) * 31 + position) % count
+        rows.append({
+            'id': plan['start']['favorites'] + index,
+            'user_id': _user_id(plan, user_index),
+            'product_id': None if use_service else plan['start']['products'] + item,
+            'service_id': plan['start']['services'] + item if use_service else None,
+            'created_at': plan['now'] - timedelta(minutes=rng.randint(0, 60 * 24 * 30))
+        })
+    return rows
+
+
+GENERATORS = {
+    'users': _user_rows,
+    'products': _product_rows,
+    'services': _service_rows,
+    'trades': _trade_rows,
+    'favorites': _favorite_rows
+}
+
+
+def _insert_chunk(plan, kind, chunk):
+    start = chunk * CHUNK_SIZE
+    stop = min(start + CHUNK_SIZE, plan['sizes'][kind])
+    rng = random.Random(f"{plan['seed']}:{kind}:{chunk}")
+    rows = GENERATORS[kind](rng, plan, start, stop)
+    db.session.execute(insert(TABLES[kind]), rows)
+    db.session.commit()
+    return kind, len(rows)
+
+
+_worker_plan = None
+
+
+def _init_worker(plan):
+    global _worker_plan
+    _worker_plan = plan
+    # Each worker opens its own engine and connections
+    create_app().app_context().push()
+
+
+def _run_worker_chunk(task):
+    return _insert_chunk(_worker_plan, *task)
+
+
+def _taxonomy(category_table, subcategory_table):
+    """[(category_id, [subcategory_id, ...])] from the seeded taxonomy"""
+    categories = {category_id: [] for category_id in db.session.execute(select(category_table.c.id)).scalars()}
+    for row in db.session.execute(select(subcategory_table.c.id, subcategory_table.c.category_id)):
+        categories.setdefault(row.category_id, []).append(row.id)
+    return sorted((category_id, sorted(ids)) for category_id, ids in categories.items())
+
+
+def _build_plan(sizes, seed, password):
+    if not db.session.execute(select(func.count()).select_from(ProductCategory.__table__)).scalar():
+        seed_product_categories()
+        seed_service_categories()
+        db.session.commit()
+
+    # Generated rows carry explicit ids after whatever the tables already hold
+    start = {
+        kind: (db.session.execute(select(func.max(table.c.id))).scalar() or 0) + 1
+        for kind, table in TABLES.items()
+    }
+
+    city_rng = random.Random(f'{seed}:cities')
+    user_cities = city_rng.choices(range(len(CITIES)), weights=[city[3] for city in CITIES], k=sizes['users'])
+
+    return {
+        'seed': seed,
+        'sizes': sizes,
+        'start': start,
+        # Timestamps are relative to the start of the current day
+        'now': datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0),
+        # One hash shared by every user: hashing per row would dominate generation time
+        'password_hash': password_hasher.hash(password),
+        'user_cities': bytes(user_cities),
+        'product_taxonomy': _taxonomy(ProductCategory.__table__, ProductSubcategory.__table__),
+        'service_taxonomy': _taxonomy(ServiceCategory.__table__, ServiceSubcategory.__table__)
+    }
+
+
+def _sync_sequences():
+    """Move PostgreSQL id sequences past the explicit ids we inserted"""
+    if db.engine.dialect.name != 'postgresql':
+        return
+
+    quote = db.engine.dialect.identifier_preparer.quote
+    for table in TABLES.values():
+        db.session.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{quote(table.name)}', 'id'), "
+            f"(SELECT COALESCE(MAX(id), 1) FROM {quote(table.name)}))"
+        ))
+    db.session.commit()
+
+
+def _rebuild_counters(plan):
+    """Fill favorite_count and pending_trade_count of the generated listings.
+
+    CounterService.repair_all runs a correlated count per listing; at millions
+    of rows one grouped scan of favorites and trades is far cheaper. Counters
+    of generated listings start at zero, so only listings with a count are updated.
+    """
+    favorites, trades = Favorite.__table__, Trade.__table__
+    for kind, column in (('products', 'product_id'), ('services', 'service_id')):
+        first_id = plan['start'][kind]
+        counts = {}
+
+        for item_id, count in db.session.execute(
+            select(favorites.c[column], func.count())
+            .where(favorites.c[column] >= first_id)
+            .group_by(favorites.c[column])
+        ):
+            counts[item_id] = [count, 0]
+
+        for side in ('offered', 'requested'):
+            trade_column = trades.c[f'{side}_{column}']
+            for item_id, count in db.session.execute(
+                select(trade_column, func.count())
+                .where(trade_column >= first_id, trades.c.status == 'pending')
+                .group_by(trade_column)
+            ):
+                counts.setdefault(item_id, [0, 0])[1] += count
+
+        table = TABLES[kind]
+        stmt = (
+            update(table)
+            .where(table.c.id == bindparam('item_id'))
+            .values(
+                favorite_count=bindparam('favorites'),
+                pending_trade_count=bindparam('pending'),
+                # Counter changes are not listing edits
+                updated_at=table.c.updated_at
+            )
+        )
+        rows = [
+            {'item_id': item_id, 'favorites': favorite_count, 'pending': pending_count}
+            for item_id, (favorite_count, pending_count) in sorted(counts.items())
+        ]
+        for start in range(0, len(rows), CHUNK_SIZE):
+            db.session.connection().execute(stmt, rows[start:start + CHUNK_SIZE])
+    db.session.commit()
+
+
+def generate(users=1000, products=10000, services=5000, trades=5000, favorites=20000,
+             seed=42, workers=1, password='swapcycle', verbose=False):
+    """Insert a synthetic dataset; must run inside an app context. Returns the row counts inserted"""
+    if users < 1:
+        raise ValueError('At least one user is required')
+    if users < 2 or not products:
+        trades = 0
+    listing_counts = [count for count in (products, services) if count]
+    favorites = min(favorites, users * min(listing_counts)) if listing_counts else 0
+
+    sizes = {'users': users, 'products': products, 'services': services, 'trades': trades, 'favorites': favorites}
+    plan = _build_plan(sizes, seed, password)
+
+    if workers > 1 and db.engine.dialect.name == 'sqlite':
+        # SQLite takes one writer at a time; extra processes would only wait on the lock
+        workers = 1
+
+    inserted = dict.fromkeys(sizes, 0)
+    pool = None
+    if workers > 1:
+        db.session.remove()
+        db.engine.dispose()
+        pool = multiprocessing.get_context('spawn').Pool(workers, initializer=_init_worker, initargs=(plan,))
+
+    try:
+        for phase in PHASES:
+            started = time.perf_counter()
+            tasks = [
+                (kind, chunk)
+                for kind in phase
+                for chunk in range((sizes[kind] + CHUNK_SIZE - 1) // CHUNK_SIZE)
+            ]
+            if pool is not None:
+                results = pool.imap_unordered(_run_worker_chunk, tasks)
+            else:
+                results = (_insert_chunk(plan, *task) for task in tasks)
+            for kind, count in results:
+                inserted[kind] += count
+            if verbose:
+                elapsed = time.perf_counter() - started
+                total = sum(inserted[kind] for kind in phase)
+                print(f"Inserted {total} {' and '.join(phase)} in {elapsed:.1f}s ({total / max(elapsed, 1e-6):.0f} rows/s)")
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    _sync_sequences()
+    _rebuild_counters(plan)
+    return inserted
+
+
+def run_generate(**options):
+    """Generate a large synthetic dataset for performance testing and staging"""
+    app = create_app()
+    with app.app_context():
+        print("Generating synthetic data...")
+        started = time.perf_counter()
+        sizes = generate(**options, verbose=True)
+        print(f"Generated {sizes} in {time.perf_counter() - started:.1f}s")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generate synthetic SwapCycle users, listings, trades and favorites')
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--products', type=int, default=10000)
+    parser.add_argument('--services', type=int, default=5000)
+    parser.add_argument('--trades', type=int, default=5000)
+    parser.add_argument('--favorites', type=int, default=20000)
+    parser.add_argument('--seed', type=int, default=42, help='Same seed and sizes produce the same rows')
+    parser.add_argument('--workers', type=int, default=1, help='Insert processes (PostgreSQL/MySQL; SQLite uses one)')
+    parser.add_argument('--password', default='swapcycle', help='Password of every generated user')
+    args = parser.parse_args()
+
+    run_generate(
+        users=args.users, products=args.products, services=args.services, trades=args.trades,
+        favorites=args.favorites, seed=args.seed, workers=args.workers, password=args.password
+    )
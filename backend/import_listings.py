@@ -0,0 +1,47 @@
+import sys
+import os
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.app import create_app, db
+from backend.models.user import User
+from backend.services.import_service import ImportService
+
+def run_import(path, user_id, item_type='product', data_format=None, geocode=True, batch_size=None):
+    """Bulk import listings from a JSON, CSV or NDJSON file"""
+    app = create_app()
+    with app.app_context():
+        if not db.session.get(User, user_id):
+            print(f"User {user_id} not found")
+            return None
+
+        data_format = data_format or ImportService.detect_format(None, path)
+        print(f"Importing {item_type}s from {path} ({data_format})...")
+
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            records = ImportService.parse_records(f, data_format)
+            result = ImportService.import_listings(
+                item_type, user_id, records, geocode=geocode, batch_size=batch_size
+            )
+
+        for error in result['errors']:
+            print(f"Row {error['row']}: {error['message']}")
+
+        print(f"Imported {result['created']} of {result['total']} {item_type}s "
+              f"({result['failed']} failed)")
+        return result
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Bulk import SwapCycle listings')
+    parser.add_argument('path', help='JSON array, CSV or NDJSON file')
+    parser.add_argument('--user-id', type=int, required=True, help='Owner of the imported listings')
+    parser.add_argument('--type', dest='item_type', choices=['product', 'service'], default='product')
+    parser.add_argument('--format', dest='data_format', choices=ImportService.SUPPORTED_FORMATS)
+    parser.add_argument('--batch-size', type=int, default=ImportService.BATCH_SIZE)
+    parser.add_argument('--no-geocode', action='store_true', help='Skip geocoding of missing coordinates')
+    args = parser.parse_args()
+
+    run_import(
+        args.path, args.user_id, args.item_type, args.data_format,
+        geocode=not args.no_geocode, batch_size=args.batch_size
+    )
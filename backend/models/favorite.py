@@ -81,3 +81,12 @@ class Favorite(db.Model):
         elif service_id:
             return cls.query.filter_by(user_id=user_id, service_id=service_id).first() is not None
         return False
+    
+    @classmethod
+    def get_user_favorite_ids(cls, user_id):
+        """Return all favorited product and service ids for a user in a single query"""
+        rows = db.session.query(cls.product_id, cls.service_id).filter_by(user_id=user_id).all()
+        
+        favorited_products = {row.product_id for row in rows if row.product_id}
+        favorited_services = {row.service_id for row in rows if row.service_id}
+        return favorited_products, favorited_services
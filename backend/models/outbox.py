@@ -0,0 +1,28 @@
+from backend.app import db
+from datetime import datetime
+
+class OutboxEvent(db.Model):
+    # Monotonic sequence number consumers resume from
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    entity_type = db.Column(db.String(20), nullable=False)  # product, service, trade, favorite
+    entity_id = db.Column(db.Integer, nullable=False)
+    operation = db.Column(db.String(10), nullable=False)  # insert, update, delete
+    # Users allowed to read a trade or favorite entry; NULL for public listing changes
+    user_id = db.Column(db.Integer)
+    other_user_id = db.Column(db.Integer)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        db.Index('ix_outbox_event_entity_type_id', 'entity_type', 'id'),
+        # Never reuse ids after pruning, or consumers would skip new entries
+        {'sqlite_autoincrement': True},
+    )
+    
+    def to_dict(self):
+        return {
+            'seq': self.id,
+            'type': self.entity_type,
+            'id': self.entity_id,
+            'op': self.operation,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
@@ -31,6 +31,8 @@ class Product(db.Model):
     longitude = db.Column(db.Float)
     images = db.Column(db.JSON)  # Array of image paths
     availability_status = db.Column(db.String(20), default='available')  # available, unavailable
+    favorite_count = db.Column(db.Integer, default=0, nullable=False)  # Maintained by CounterService
+    pending_trade_count = db.Column(db.Integer, default=0, nullable=False)  # Maintained by CounterService
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -44,6 +46,12 @@ class Product(db.Model):
     trades_requested = db.relationship('Trade', foreign_keys='Trade.requested_product_id', backref='requested_product', lazy=True)
     favorites = db.relationship('Favorite', backref='product', lazy=True)
     
+    # Indexes for "most wanted" sorting of available listings
+    __table_args__ = (
+        db.Index('ix_product_availability_favorite_count', 'availability_status', 'favorite_count'),
+        db.Index('ix_product_availability_pending_trade_count', 'availability_status', 'pending_trade_count'),
+    )
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -57,6 +65,8 @@ class Product(db.Model):
             'longitude': self.longitude,
             'images': self.images,
             'availability_status': self.availability_status,
+            'favorite_count': self.favorite_count or 0,
+            'pending_trade_count': self.pending_trade_count or 0,
             'category': self.category.name if self.category else None,
             'subcategory': self.subcategory.name if self.subcategory else None,
             'user_id': self.user_id,
@@ -30,6 +30,8 @@ class Service(db.Model):
     longitude = db.Column(db.Float)  # Optional for online services
     images = db.Column(db.JSON)  # Array of image paths
     availability_status = db.Column(db.String(20), default='available')  # available, unavailable
+    favorite_count = db.Column(db.Integer, default=0, nullable=False)  # Maintained by CounterService
+    pending_trade_count = db.Column(db.Integer, default=0, nullable=False)  # Maintained by CounterService
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -43,6 +45,12 @@ class Service(db.Model):
     trades_requested = db.relationship('Trade', foreign_keys='Trade.requested_service_id', backref='requested_service', lazy=True)
     favorites = db.relationship('Favorite', backref='service', lazy=True)
     
+    # Indexes for "most wanted" sorting of available listings
+    __table_args__ = (
+        db.Index('ix_service_availability_favorite_count', 'availability_status', 'favorite_count'),
+        db.Index('ix_service_availability_pending_trade_count', 'availability_status', 'pending_trade_count'),
+    )
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -55,6 +63,8 @@ class Service(db.Model):
             'longitude': self.longitude,
             'images': self.images,
             'availability_status': self.availability_status,
+            'favorite_count': self.favorite_count or 0,
+            'pending_trade_count': self.pending_trade_count or 0,
             'category': self.category.name if self.category else None,
             'subcategory': self.subcategory.name if self.subcategory else None,
             'user_id': self.user_id,
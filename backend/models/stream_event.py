@@ -0,0 +1,17 @@
+from backend.app import db
+from datetime import datetime
+
+class StreamEvent(db.Model):
+    # Event id streams resume from with Last-Event-ID, on any worker
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    user_id = db.Column(db.Integer, nullable=False)
+    event_type = db.Column(db.String(40), nullable=False)  # trade.proposed, trade.accepted, listing.favorited, ...
+    data = db.Column(db.JSON, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        db.Index('ix_stream_event_user_id_id', 'user_id', 'id'),
+        # Never reuse ids after pruning, or resuming streams would skip new events
+        {'sqlite_autoincrement': True},
+    )
+
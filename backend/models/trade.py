@@ -1,6 +1,9 @@
 from backend.app import db
 from datetime import datetime
 
+# SQLite's current time in the format SQLAlchemy stores, so server-filled values sort with the rest
+CREATED_AT_DEFAULT = "(strftime('%Y-%m-%d %H:%M:%f000', 'now'))"
+
 class Trade(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     
@@ -20,12 +23,18 @@ class Trade(db.Model):
     response_message = db.Column(db.Text)  # Message from receiver when accepting/declining
     
     # Timestamps
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, server_default=db.text(CREATED_AT_DEFAULT))  # Keyset cursors sort by it
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    # Relationships
-    proposer = db.relationship('User', foreign_keys=[proposer_id], backref='trades_proposed')
-    receiver = db.relationship('User', foreign_keys=[receiver_id], backref='trades_received')
+    # Relationships (dynamic backrefs so a user's trades are queried, never loaded wholesale)
+    proposer = db.relationship('User', foreign_keys=[proposer_id], backref=db.backref('trades_proposed', lazy='dynamic'))
+    receiver = db.relationship('User', foreign_keys=[receiver_id], backref=db.backref('trades_received', lazy='dynamic'))
+    
+    # Indexes backing the inbox/outbox listings (filter by user and status, newest first)
+    __table_args__ = (
+        db.Index('ix_trade_receiver_status_created', 'receiver_id', 'status', 'created_at'),
+        db.Index('ix_trade_proposer_status_created', 'proposer_id', 'status', 'created_at'),
+    )
     
     def to_dict(self):
         # Determine offered and requested items
@@ -0,0 +1,17 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.app import create_app
+from backend.services.counter_service import CounterService
+
+def run_repair():
+    """Recompute listing favorite and pending trade counters from source tables"""
+    app = create_app()
+    with app.app_context():
+        print("Recomputing listing counters...")
+        result = CounterService.repair_all()
+        print(f"Updated {result['products']} products and {result['services']} services")
+
+if __name__ == '__main__':
+    run_repair()
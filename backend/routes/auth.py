@@ -1,10 +1,22 @@
 from flask import Blueprint, request, jsonify
 from backend.app import db
 from backend.models.user import User
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
+from backend.services.password_service import HashingBusy, password_hasher
+from backend.services.user_cache import get_current_user
+from backend.utils.conditional import make_etag, is_not_modified, not_modified, conditional_response
+from backend.utils.rate_limit import rate_limiter
+from config import Config
+from flask_jwt_extended import create_access_token, jwt_required
+import math
 
 auth_bp = Blueprint('auth', __name__)
 
+login_ip_limiter = rate_limiter('login_ip', Config.LOGIN_MAX_ATTEMPTS_PER_IP, Config.LOGIN_RATE_WINDOW_SECONDS)
+login_email_limiter = rate_limiter('login_email', Config.LOGIN_MAX_ATTEMPTS_PER_EMAIL, Config.LOGIN_RATE_WINDOW_SECONDS)
+
+def hashing_busy():
+    return jsonify({'message': 'Server busy, please try again'}), 503, {'Retry-After': '1'}
+
 @auth_bp.route('/register', methods=['POST'])
 def register():
     data = request.get_json()
@@ -27,7 +39,10 @@ def register():
         longitude=data.get('longitude'),
         birth_date=data.get('birth_date')
     )
-    user.set_password(data['password'])
+    try:
+        user.set_password(data['password'])
+    except HashingBusy:
+        return hashing_busy()
     
     db.session.add(user)
     db.session.commit()
@@ -43,10 +58,35 @@ def register():
 @auth_bp.route('/login', methods=['POST'])
 def login():
     data = request.get_json()
+    email_key = data['email'].strip().lower()
+    
+    # Checked before any hashing, so throttled attempts cost no CPU
+    retry_after = login_ip_limiter.hit(request.remote_addr) or login_email_limiter.hit(email_key)
+    if retry_after:
+        return jsonify({'message': 'Too many login attempts, please try again later'}), 429, {
+            'Retry-After': str(math.ceil(retry_after))
+        }
     
     user = User.query.filter_by(email=data['email']).first()
     
-    if user and user.check_password(data['password']):
+    try:
+        if user is not None:
+            valid = user.check_password(data['password'])
+        else:
+            valid = password_hasher.verify_unknown(data['password'])
+    except HashingBusy:
+        return hashing_busy()
+    
+    if valid:
+        login_email_limiter.reset(email_key)
+        if user.password_needs_rehash():
+            # Hash parameters changed since this password was set; upgrade it while we know it
+            try:
+                user.set_password(data['password'])
+                db.session.commit()
+            except HashingBusy:
+                pass  # Rehashed on a later login
+        
         token = user.generate_token()
         return jsonify({
             'message': 'Login successful',
@@ -59,10 +99,13 @@ def login():
 @auth_bp.route('/profile', methods=['GET'])
 @jwt_required()
 def profile():
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    
-    if not user:
+    # Usually from the user cache without a query
+    user = get_current_user()
+    if user is None:
         return jsonify({'message': 'User not found'}), 404
     
-    return jsonify({'user': user.to_dict()})
+    etag = make_etag('user', user.id, user.updated_at)
+    if is_not_modified(etag, user.updated_at):
+        return not_modified(etag, user.updated_at, private=True)
+    
+    return conditional_response(jsonify({'user': user.to_dict()}), etag, user.updated_at, private=True)
@@ -0,0 +1,29 @@
+from flask import Blueprint, request, jsonify
+from backend.services.outbox_service import OutboxService
+from flask_jwt_extended import jwt_required, get_jwt_identity
+
+changes_bp = Blueprint('changes', __name__)
+
+@changes_bp.route('/', methods=['GET'])
+@jwt_required()
+def get_changes():
+    """Change feed of product and service mutations, and of the caller's trades and favorites, after a sequence number"""
+    since = request.args.get('since', 0, type=int)
+    limit = request.args.get('limit', OutboxService.DEFAULT_LIMIT, type=int)
+    limit = max(1, min(limit, OutboxService.MAX_LIMIT))
+    types = request.args.get('types')
+
+    entity_types = None
+    if types:
+        entity_types = [entity_type.strip() for entity_type in types.split(',') if entity_type.strip()]
+        for entity_type in entity_types:
+            if entity_type not in OutboxService.ENTITY_TYPES:
+                return jsonify({'message': f'Unknown change type: {entity_type}'}), 400
+
+    changes = OutboxService.read_changes(since, limit, entity_types, get_jwt_identity())
+
+    return jsonify({
+        'changes': [change.to_dict() for change in changes],
+        'next_since': changes[-1].id if changes else since,
+        'has_more': len(changes) == limit
+    })
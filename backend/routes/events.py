@@ -0,0 +1,65 @@
+from flask import Blueprint, request, jsonify, Response, current_app
+from backend.services.event_bus import StreamLimitReached, event_bus
+from flask_jwt_extended import jwt_required, get_jwt_identity
+import json
+
+events_bp = Blueprint('events', __name__)
+
+def format_event(event_data):
+    """Format a bus event as a Server-Sent Events message"""
+    return (
+        f"id: {event_data['id']}\n"
+        f"event: {event_data['type']}\n"
+        f"data: {json.dumps(event_data['data'])}\n\n"
+    )
+
+@events_bp.route('/stream', methods=['GET'])
+@jwt_required(locations=['headers', 'query_string'])
+def stream_events():
+    """Server-Sent Events stream of trade and listing notifications for the current user"""
+    user_id = get_jwt_identity()
+    heartbeat = current_app.config['EVENT_STREAM_HEARTBEAT_SECONDS']
+    buffer_size = current_app.config['EVENT_STREAM_BUFFER_SIZE']
+
+    # Browsers send Last-Event-ID on reconnect; allow a query param for manual resumes
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    try:
+        last_event_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        last_event_id = None
+
+    # Each open stream holds a server thread until the client goes away
+    try:
+        subscription, complete = event_bus.subscribe(
+            user_id, last_event_id, buffer_size, current_app.config['EVENT_STREAM_MAX_CONNECTIONS']
+        )
+    except StreamLimitReached:
+        response = jsonify({'message': 'Too many open event streams, try again later'})
+        response.headers['Retry-After'] = str(heartbeat)
+        return response, 503
+
+    def generate():
+        yield f"retry: {heartbeat * 1000}\n\n"
+
+        # Tell the client to refetch state when events were missed
+        if not complete:
+            yield "event: reset\ndata: {}\n\n"
+
+        while True:
+            events, overflowed = subscription.get(timeout=heartbeat)
+
+            if overflowed:
+                yield "event: reset\ndata: {}\n\n"
+            if not events:
+                yield ": heartbeat\n\n"
+
+            for event_data in events:
+                yield format_event(event_data)
+
+    response = Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+    # Also runs when the client leaves before the stream starts
+    response.call_on_close(lambda: event_bus.unsubscribe(subscription))
+    return response
@@ -0,0 +1,28 @@
+from flask import Blueprint, request, jsonify, Response, stream_with_context
+from backend.services.export_service import ExportService
+from flask_jwt_extended import jwt_required, get_jwt_identity
+
+export_bp = Blueprint('export', __name__)
+
+@export_bp.route('/', methods=['GET'])
+@jwt_required()
+def export_listings():
+    """Stream the current user's products, services and trades as NDJSON or CSV"""
+    user_id = get_jwt_identity()
+    data_format = request.args.get('format', 'ndjson').lower()
+
+    if data_format not in ExportService.SUPPORTED_FORMATS:
+        return jsonify({'message': f'Unsupported format: {data_format}'}), 400
+
+    try:
+        entities = ExportService.parse_entities(request.args.get('types'))
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+
+    extension = 'csv' if data_format == 'csv' else 'ndjson'
+
+    return Response(
+        stream_with_context(ExportService.generate(entities, user_id, data_format)),
+        mimetype=ExportService.mimetype(data_format),
+        headers={'Content-Disposition': f'attachment; filename=swapcycle-export.{extension}'}
+    )
@@ -0,0 +1,107 @@
+from flask import Blueprint, request, jsonify
+from backend.models.product import Product
+from backend.models.service import Service
+from backend.services.favorite_service import FavoriteService
+from backend.utils.serializers import ListingSerializer
+from backend.utils.database import read_replica
+from flask_jwt_extended import jwt_required, get_jwt_identity
+
+listings_bp = Blueprint('listings', __name__)
+
+MAX_BATCH_SIZE = 100
+
+LISTING_MODELS = {
+    'product': Product,
+    'service': Service
+}
+
+def fetch_listings(item_type, ids, fields=None):
+    """Load serialized listings by id in one query (category names joined), keyed by id"""
+    if not ids:
+        return {}
+
+    model = LISTING_MODELS[item_type]
+    rows = ListingSerializer.select_from(model.query.filter(model.id.in_(ids)), item_type, fields).all()
+
+    return {row.id: ListingSerializer.to_dict(row, item_type, fields) for row in rows}
+
+@listings_bp.route('/batch', methods=['POST'])
+@read_replica
+def get_listings_batch():
+    """Get products and services by id in one query per type, preserving request order"""
+    data = request.get_json(silent=True) or {}
+    items = data.get('items')
+
+    if not isinstance(items, list):
+        return jsonify({'message': 'items is required'}), 400
+    if len(items) > MAX_BATCH_SIZE:
+        return jsonify({'message': f'At most {MAX_BATCH_SIZE} items per batch'}), 400
+
+    # Sparse fieldset from the body (list or comma separated) or the query string
+    fields = data.get('fields', request.args.get('fields'))
+    if isinstance(fields, list):
+        fields = ','.join(str(field) for field in fields)
+    try:
+        fields = ListingSerializer.parse_fields(fields)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+
+    requested = []
+    ids_by_type = {item_type: set() for item_type in LISTING_MODELS}
+
+    for item in items:
+        if not isinstance(item, dict) or item.get('type') not in LISTING_MODELS:
+            return jsonify({'message': 'Each item needs a type of product or service'}), 400
+        try:
+            item_id = int(item['id'])
+        except (KeyError, TypeError, ValueError):
+            return jsonify({'message': 'Each item needs a numeric id'}), 400
+
+        requested.append((item['type'], item_id))
+        ids_by_type[item['type']].add(item_id)
+
+    found = {
+        item_type: fetch_listings(item_type, ids_by_type[item_type], fields)
+        for item_type in LISTING_MODELS
+    }
+
+    results = []
+    missing = []
+    for item_type, item_id in requested:
+        listing = found[item_type].get(item_id)
+        if listing is None:
+            missing.append({'type': item_type, 'id': item_id})
+            continue
+
+        # Copy: the same listing may be requested more than once
+        results.append(dict(listing))
+
+    if FavoriteService.wants_favorites(request.args):
+        FavoriteService.annotate(results, FavoriteService.get_optional_user_id())
+
+    return jsonify({
+        'results': results,
+        'missing': missing
+    })
+
+@listings_bp.route('/favorites/status', methods=['POST'])
+@jwt_required()
+def get_favorite_status():
+    """Return which of the given product and service ids the current user has favorited"""
+    user_id = get_jwt_identity()
+    data = request.get_json(silent=True) or {}
+
+    try:
+        product_ids = [int(item_id) for item_id in data.get('product_ids') or []]
+        service_ids = [int(item_id) for item_id in data.get('service_ids') or []]
+    except (TypeError, ValueError):
+        return jsonify({'message': 'Ids must be numeric'}), 400
+
+    favorited_products, favorited_services = FavoriteService.get_favorited_subset(
+        user_id, product_ids, service_ids
+    )
+
+    return jsonify({
+        'product_ids': sorted(favorited_products),
+        'service_ids': sorted(favorited_services)
+    })
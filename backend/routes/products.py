@@ -1,12 +1,23 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, abort
 from backend.app import db
 from backend.models.product import Product, ProductCategory, ProductSubcategory
 from backend.models.user import User
+from backend.services.taxonomy_service import TaxonomyService
+from backend.services.import_service import ImportService
+from backend.services.favorite_service import FavoriteService
+from backend.services.cache_service import response_cache
+from backend.utils.serializers import ListingSerializer
+from backend.utils.database import read_replica
+from backend.utils.conditional import (
+    make_etag, is_not_modified, not_modified, add_validators, conditional_response
+)
 from flask_jwt_extended import jwt_required, get_jwt_identity
 
 products_bp = Blueprint('products', __name__)
 
 @products_bp.route('/', methods=['GET'])
+@response_cache.cached('product')
+@read_replica
 def get_products():
     """Get all products with optional filtering"""
     page = request.args.get('page', 1, type=int)
@@ -14,6 +25,11 @@ def get_products():
     category_id = request.args.get('category_id', type=int)
     subcategory_id = request.args.get('subcategory_id', type=int)
     user_id = request.args.get('user_id', type=int)
+    sort = request.args.get('sort')  # popular, most_wanted
+    try:
+        fields = ListingSerializer.parse_fields(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
     
     query = Product.query
     
@@ -28,12 +44,22 @@ def get_products():
     # Only show available products by default
     query = query.filter_by(availability_status='available')
     
-    products = query.paginate(
+    # Sort by maintained counters (backed by availability/counter indexes)
+    if sort == 'popular':
+        query = query.order_by(Product.favorite_count.desc(), Product.id.desc())
+    elif sort == 'most_wanted':
+        query = query.order_by(Product.pending_trade_count.desc(), Product.id.desc())
+    
+    products = ListingSerializer.select_from(query, 'product', fields).paginate(
         page=page, per_page=per_page, error_out=False
     )
     
+    results = [ListingSerializer.to_dict(product, fields=fields) for product in products.items]
+    if FavoriteService.wants_favorites(request.args):
+        FavoriteService.annotate(results, FavoriteService.get_optional_user_id(), 'product')
+    
     return jsonify({
-        'products': [product.to_dict() for product in products.items],
+        'products': results,
         'total': products.total,
         'pages': products.pages,
         'current_page': page
@@ -52,16 +78,10 @@ def create_product():
         if field not in data:
             return jsonify({'message': f'{field} is required'}), 400
     
-    # Validate category exists
-    category = ProductCategory.query.get(data['category_id'])
-    if not category:
-        return jsonify({'message': 'Invalid category'}), 400
-    
-    # Validate subcategory if provided
-    if 'subcategory_id' in data and data['subcategory_id']:
-        subcategory = ProductSubcategory.query.get(data['subcategory_id'])
-        if not subcategory or subcategory.category_id != data['category_id']:
-            return jsonify({'message': 'Invalid subcategory'}), 400
+    # Validate category and subcategory against the cached taxonomy
+    error = TaxonomyService.validate_category('product', data['category_id'], data.get('subcategory_id'))
+    if error:
+        return jsonify({'message': error}), 400
     
     try:
         product = Product(
@@ -95,11 +115,45 @@ def create_product():
         db.session.rollback()
         return jsonify({'message': 'Error creating product'}), 500
 
+@products_bp.route('/import', methods=['POST'])
+@jwt_required()
+def import_products():
+    """Bulk import products from a JSON array, CSV or NDJSON body"""
+    user_id = get_jwt_identity()
+    geocode = request.args.get('geocode', 'true').lower() == 'true'
+    
+    try:
+        records = ImportService.parse_request(request)
+        result = ImportService.import_listings('product', user_id, records, geocode=geocode)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    
+    return jsonify({
+        'message': f"Imported {result['created']} of {result['total']} products",
+        **result
+    }), 201 if result['created'] else 400
+
 @products_bp.route('/<int:product_id>', methods=['GET'])
+@read_replica
 def get_product(product_id):
     """Get a specific product"""
-    product = Product.query.get_or_404(product_id)
-    return jsonify({'product': product.to_dict()})
+    # Validate the client's copy from a narrow select before loading and serializing the row
+    state = db.session.execute(
+        db.select(
+            Product.updated_at, Product.favorite_count, Product.pending_trade_count,
+            Product.category_id, Product.subcategory_id
+        ).where(Product.id == product_id)
+    ).first()
+    if state is None:
+        abort(404)
+    
+    # Only the ETag is trusted for revalidation: counter changes keep updated_at
+    etag = make_etag('product', product_id, *state)
+    if is_not_modified(etag):
+        return not_modified(etag, state.updated_at)
+    
+    product = db.session.get(Product, product_id)
+    return add_validators(jsonify({'product': product.to_dict()}), etag, state.updated_at)
 
 @products_bp.route('/<int:product_id>', methods=['PUT'])
 @jwt_required()
@@ -163,6 +217,8 @@ def delete_product(product_id):
         return jsonify({'message': 'Error deleting product'}), 500
 
 @products_bp.route('/categories', methods=['GET'])
+@response_cache.cached('taxonomy')
+@read_replica
 def get_product_categories():
     """Get all product categories with subcategories"""
     categories = ProductCategory.query.all()
@@ -183,4 +239,4 @@ def get_product_categories():
             'subcategories': subcategories
         })
     
-    return jsonify({'categories': categories_data})
+    return conditional_response(jsonify({'categories': categories_data}))
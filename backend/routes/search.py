@@ -2,11 +2,21 @@ from flask import Blueprint, request, jsonify
 from backend.app import db
 from backend.models.product import Product, ProductCategory
 from backend.models.service import Service, ServiceCategory
+from backend.services.favorite_service import FavoriteService
+from backend.services.exchange_service import ExchangeService
+from backend.services.cache_service import response_cache
+from backend.utils.serializers import ListingSerializer
+from backend.utils.database import read_replica
 from sqlalchemy import and_, or_, func
+from sqlalchemy.orm import selectinload
+from datetime import datetime
 import math
 
 search_bp = Blueprint('search', __name__)
 
+# Columns search_all needs for distance and date sorting, whatever fields are requested
+SEARCH_SORT_FIELDS = ('latitude', 'longitude', 'created_at')
+
 def calculate_distance(lat1, lng1, lat2, lng2):
     """Calculate distance between two points in kilometers"""
     if not all([lat1, lng1, lat2, lng2]):
@@ -26,6 +36,8 @@ def calculate_distance(lat1, lng1, lat2, lng2):
     return c * r
 
 @search_bp.route('/', methods=['GET'])
+@response_cache.cached('product', 'service')
+@read_replica
 def search_all():
     """Universal search for products and services with map support"""
     # Get search parameters
@@ -50,6 +62,11 @@ def search_all():
     page = request.args.get('page', 1, type=int)
     per_page = min(request.args.get('per_page', 20, type=int), 100)
     
+    try:
+        fields = ListingSerializer.parse_fields(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    
     results = []
     
     # Search products
@@ -92,11 +109,12 @@ def search_all():
                 )
             )
         
-        products = product_query.all()
+        products = ListingSerializer.select_from(
+            product_query, 'product', fields, required=SEARCH_SORT_FIELDS
+        ).all()
         
         for product in products:
-            result = product.to_dict()
-            result['type'] = 'product'
+            result = ListingSerializer.to_dict(product, 'product')
             
             # Calculate distance if user location provided
             if lat and lng and product.latitude and product.longitude:
@@ -146,15 +164,16 @@ def search_all():
             service_query = service_query.filter(
                 and_(
                     Service.latitude.between(lat - lat_range, lat + lat_range),
-                    Service.longitude.between(west - lng_range, lng + lng_range)
+                    Service.longitude.between(lng - lng_range, lng + lng_range)
                 )
             )
         
-        services = service_query.all()
+        services = ListingSerializer.select_from(
+            service_query, 'service', fields, required=SEARCH_SORT_FIELDS
+        ).all()
         
         for service in services:
-            result = service.to_dict()
-            result['type'] = 'service'
+            result = ListingSerializer.to_dict(service, 'service')
             
             # Calculate distance if user location provided
             if lat and lng and service.latitude and service.longitude:
@@ -167,13 +186,16 @@ def search_all():
     if lat and lng:
         results.sort(key=lambda x: x.get('distance') or float('inf'))
     else:
-        results.sort(key=lambda x: x.get('created_at', ''), reverse=True)
+        results.sort(key=lambda x: x.get('created_at') or datetime.min, reverse=True)
     
     # Manual pagination
     total = len(results)
     start = (page - 1) * per_page
     end = start + per_page
-    paginated_results = results[start:end]
+    paginated_results = [ListingSerializer.restrict(result, fields) for result in results[start:end]]
+    
+    if FavoriteService.wants_favorites(request.args):
+        FavoriteService.annotate(paginated_results, FavoriteService.get_optional_user_id())
     
     return jsonify({
         'results': paginated_results,
@@ -185,6 +207,8 @@ def search_all():
     })
 
 @search_bp.route('/map-data', methods=['GET'])
+@response_cache.cached('product', 'service', 'taxonomy')
+@read_replica
 def get_map_data():
     """Get simplified data for map markers"""
     # Get search parameters
@@ -220,7 +244,8 @@ def get_map_data():
         if category_id:
             product_query = product_query.filter_by(category_id=category_id)
         
-        products = product_query.limit(100).all()  # Limit for performance
+        # Category names for all markers in one query
+        products = product_query.options(selectinload(Product.category)).limit(100).all()  # Limit for performance
         
         for product in products:
             markers.append({
@@ -228,10 +253,10 @@ def get_map_data():
                 'type': 'product',
                 'title': product.name,
                 'price': product.estimated_value,
-                'currency': product.currency,
+                'currency': ExchangeService.BASE_CURRENCY,
                 'latitude': product.latitude,
                 'longitude': product.longitude,
-                'image_url': product.image_url,
+                'image_url': product.images[0] if product.images else None,
                 'category': product.category.name if product.category else None
             })
     
@@ -253,7 +278,7 @@ def get_map_data():
         if category_id:
             service_query = service_query.filter_by(category_id=category_id)
         
-        services = service_query.limit(100).all()
+        services = service_query.options(selectinload(Service.category)).limit(100).all()
         
         for service in services:
             markers.append({
@@ -261,10 +286,10 @@ def get_map_data():
                 'type': 'service',
                 'title': service.name,
                 'price': service.estimated_value,
-                'currency': service.currency,
+                'currency': ExchangeService.BASE_CURRENCY,
                 'latitude': service.latitude,
                 'longitude': service.longitude,
-                'image_url': service.image_url,
+                'image_url': service.images[0] if service.images else None,
                 'category': service.category.name if service.category else None
             })
     
@@ -274,6 +299,7 @@ def get_map_data():
     })
 
 @search_bp.route('/products', methods=['GET'])
+@read_replica
 def search_products():
     """Search only products"""
     args = dict(request.args)
@@ -284,6 +310,7 @@ def search_products():
     return search_all()
 
 @search_bp.route('/services', methods=['GET'])
+@read_replica
 def search_services():
     """Search only physical services"""
     args = dict(request.args)
@@ -293,6 +320,8 @@ def search_services():
     return search_all()
 
 @search_bp.route('/online-services', methods=['GET'])
+@response_cache.cached('service')
+@read_replica
 def search_online_services():
     """Search only online services (no map needed)"""
     keyword = request.args.get('keyword', '').strip()
@@ -304,6 +333,11 @@ def search_online_services():
     page = request.args.get('page', 1, type=int)
     per_page = min(request.args.get('per_page', 12, type=int), 100)
     
+    try:
+        fields = ListingSerializer.parse_fields(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    
     query = Service.query.filter(
         and_(
             Service.availability_status == 'available',
@@ -326,15 +360,14 @@ def search_online_services():
     if max_price:
         query = query.filter(Service.estimated_value <= max_price)
     
-    services = query.paginate(
+    services = ListingSerializer.select_from(query, 'service', fields).paginate(
         page=page, per_page=per_page, error_out=False
     )
     
-    results = []
-    for service in services.items:
-        result = service.to_dict()
-        result['type'] = 'service'
-        results.append(result)
+    results = [ListingSerializer.to_dict(service, 'service', fields) for service in services.items]
+    
+    if FavoriteService.wants_favorites(request.args):
+        FavoriteService.annotate(results, FavoriteService.get_optional_user_id())
     
     return jsonify({
         'results': results,
@@ -345,6 +378,8 @@ def search_online_services():
     })
 
 @search_bp.route('/categories', methods=['GET'])
+@response_cache.cached('product', 'service', 'taxonomy')
+@read_replica
 def get_search_categories():
     """Get categories for search filters"""
     search_type = request.args.get('type', 'all')
@@ -380,6 +415,7 @@ def get_search_categories():
     return jsonify({'categories': categories})
 
 @search_bp.route('/subcategories', methods=['GET'])
+@read_replica
 def get_subcategories():
     """Get subcategories for a specific category"""
     category_id = request.args.get('category_id', type=int)
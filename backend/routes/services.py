@@ -1,12 +1,23 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, abort
 from backend.app import db
 from backend.models.service import Service, ServiceCategory, ServiceSubcategory
 from backend.models.user import User
+from backend.services.taxonomy_service import TaxonomyService
+from backend.services.import_service import ImportService
+from backend.services.favorite_service import FavoriteService
+from backend.services.cache_service import response_cache
+from backend.utils.serializers import ListingSerializer
+from backend.utils.database import read_replica
+from backend.utils.conditional import (
+    make_etag, is_not_modified, not_modified, add_validators, conditional_response
+)
 from flask_jwt_extended import jwt_required, get_jwt_identity
 
 services_bp = Blueprint('services', __name__)
 
 @services_bp.route('/', methods=['GET'])
+@response_cache.cached('service')
+@read_replica
 def get_services():
     """Get all services with optional filtering"""
     page = request.args.get('page', 1, type=int)
@@ -14,6 +25,11 @@ def get_services():
     category_id = request.args.get('category_id', type=int)
     subcategory_id = request.args.get('subcategory_id', type=int)
     user_id = request.args.get('user_id', type=int)
+    sort = request.args.get('sort')  # popular, most_wanted
+    try:
+        fields = ListingSerializer.parse_fields(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
     is_online = request.args.get('is_online', type=str)
     
     query = Service.query
@@ -31,12 +47,22 @@ def get_services():
     # Only show available services by default
     query = query.filter_by(availability_status='available')
     
-    services = query.paginate(
+    # Sort by maintained counters (backed by availability/counter indexes)
+    if sort == 'popular':
+        query = query.order_by(Service.favorite_count.desc(), Service.id.desc())
+    elif sort == 'most_wanted':
+        query = query.order_by(Service.pending_trade_count.desc(), Service.id.desc())
+    
+    services = ListingSerializer.select_from(query, 'service', fields).paginate(
         page=page, per_page=per_page, error_out=False
     )
     
+    results = [ListingSerializer.to_dict(service, fields=fields) for service in services.items]
+    if FavoriteService.wants_favorites(request.args):
+        FavoriteService.annotate(results, FavoriteService.get_optional_user_id(), 'service')
+    
     return jsonify({
-        'services': [service.to_dict() for service in services.items],
+        'services': results,
         'total': services.total,
         'pages': services.pages,
         'current_page': page
@@ -55,16 +81,10 @@ def create_service():
         if field not in data:
             return jsonify({'message': f'{field} is required'}), 400
     
-    # Validate category exists
-    category = ServiceCategory.query.get(data['category_id'])
-    if not category:
-        return jsonify({'message': 'Invalid category'}), 400
-    
-    # Validate subcategory if provided
-    if 'subcategory_id' in data and data['subcategory_id']:
-        subcategory = ServiceSubcategory.query.get(data['subcategory_id'])
-        if not subcategory or subcategory.category_id != data['category_id']:
-            return jsonify({'message': 'Invalid subcategory'}), 400
+    # Validate category and subcategory against the cached taxonomy
+    error = TaxonomyService.validate_category('service', data['category_id'], data.get('subcategory_id'))
+    if error:
+        return jsonify({'message': error}), 400
     
     # Validate location for physical services
     if not data['is_online'] and not data.get('address'):
@@ -101,11 +121,45 @@ def create_service():
         db.session.rollback()
         return jsonify({'message': 'Error creating service'}), 500
 
+@services_bp.route('/import', methods=['POST'])
+@jwt_required()
+def import_services():
+    """Bulk import services from a JSON array, CSV or NDJSON body"""
+    user_id = get_jwt_identity()
+    geocode = request.args.get('geocode', 'true').lower() == 'true'
+    
+    try:
+        records = ImportService.parse_request(request)
+        result = ImportService.import_listings('service', user_id, records, geocode=geocode)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    
+    return jsonify({
+        'message': f"Imported {result['created']} of {result['total']} services",
+        **result
+    }), 201 if result['created'] else 400
+
 @services_bp.route('/<int:service_id>', methods=['GET'])
+@read_replica
 def get_service(service_id):
     """Get a specific service"""
-    service = Service.query.get_or_404(service_id)
-    return jsonify({'service': service.to_dict()})
+    # Validate the client's copy from a narrow select before loading and serializing the row
+    state = db.session.execute(
+        db.select(
+            Service.updated_at, Service.favorite_count, Service.pending_trade_count,
+            Service.category_id, Service.subcategory_id
+        ).where(Service.id == service_id)
+    ).first()
+    if state is None:
+        abort(404)
+    
+    # Only the ETag is trusted for revalidation: counter changes keep updated_at
+    etag = make_etag('service', service_id, *state)
+    if is_not_modified(etag):
+        return not_modified(etag, state.updated_at)
+    
+    service = db.session.get(Service, service_id)
+    return add_validators(jsonify({'service': service.to_dict()}), etag, state.updated_at)
 
 @services_bp.route('/<int:service_id>', methods=['PUT'])
 @jwt_required()
@@ -169,6 +223,8 @@ def delete_service(service_id):
         return jsonify({'message': 'Error deleting service'}), 500
 
 @services_bp.route('/categories', methods=['GET'])
+@response_cache.cached('taxonomy')
+@read_replica
 def get_service_categories():
     """Get all service categories with subcategories"""
     categories = ServiceCategory.query.all()
@@ -189,15 +245,21 @@ def get_service_categories():
             'subcategories': subcategories
         })
     
-    return jsonify({'categories': categories_data})
+    return conditional_response(jsonify({'categories': categories_data}))
 
 @services_bp.route('/online', methods=['GET'])
+@response_cache.cached('service')
+@read_replica
 def get_online_services():
     """Get only online services"""
     page = request.args.get('page', 1, type=int)
     per_page = min(request.args.get('per_page', 12, type=int), 100)
     category_id = request.args.get('category_id', type=int)
     keyword = request.args.get('keyword', '')
+    try:
+        fields = ListingSerializer.parse_fields(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
     
     query = Service.query.filter_by(is_online=True, availability_status='available')
     
@@ -207,12 +269,16 @@ def get_online_services():
     if keyword:
         query = query.filter(Service.name.ilike(f'%{keyword}%'))
     
-    services = query.paginate(
+    services = ListingSerializer.select_from(query, 'service', fields).paginate(
         page=page, per_page=per_page, error_out=False
     )
     
+    results = [ListingSerializer.to_dict(service, fields=fields) for service in services.items]
+    if FavoriteService.wants_favorites(request.args):
+        FavoriteService.annotate(results, FavoriteService.get_optional_user_id(), 'service')
+    
     return jsonify({
-        'services': [service.to_dict() for service in services.items],
+        'services': results,
         'total': services.total,
         'pages': services.pages,
         'current_page': page
@@ -0,0 +1,176 @@
+from flask import Blueprint, request, jsonify
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import joinedload
+from backend.models.trade import Trade
+from backend.models.product import Product
+from backend.models.service import Service
+from backend.services.trade_service import TradeService, TradeError
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from datetime import datetime
+
+trades_bp = Blueprint('trades', __name__)
+
+TRADE_STATUSES = ['pending', 'accepted', 'declined', 'cancelled']
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+def encode_cursor(trade):
+    """Encode a trade's sort key as an opaque keyset cursor"""
+    return f"{trade.created_at.isoformat()}_{trade.id}"
+
+def decode_cursor(cursor):
+    """Decode a keyset cursor into (created_at, id)"""
+    try:
+        created_at, trade_id = cursor.rsplit('_', 1)
+        return datetime.fromisoformat(created_at), int(trade_id)
+    except (AttributeError, ValueError):
+        raise ValueError('Invalid cursor')
+
+def with_trade_items(query):
+    """Eager-load the four item relationships used by Trade.to_dict, only the columns it reads"""
+    return query.options(
+        joinedload(Trade.offered_product).load_only(Product.id, Product.name, Product.estimated_value),
+        joinedload(Trade.offered_service).load_only(Service.id, Service.name, Service.estimated_value),
+        joinedload(Trade.requested_product).load_only(Product.id, Product.name, Product.estimated_value),
+        joinedload(Trade.requested_service).load_only(Service.id, Service.name, Service.estimated_value)
+    )
+
+def paginate_trades(query):
+    """Apply status filter and keyset pagination (newest first) and build the response"""
+    limit = request.args.get('limit', DEFAULT_LIMIT, type=int)
+    limit = max(1, min(limit, MAX_LIMIT))
+    cursor = request.args.get('cursor')
+
+    if cursor:
+        try:
+            created_at, trade_id = decode_cursor(cursor)
+        except ValueError as e:
+            return jsonify({'message': str(e)}), 400
+
+        query = query.filter(
+            or_(
+                Trade.created_at < created_at,
+                and_(Trade.created_at == created_at, Trade.id < trade_id)
+            )
+        )
+
+    # Fetch one extra row to know whether another page exists
+    trades = with_trade_items(query).order_by(
+        Trade.created_at.desc(), Trade.id.desc()
+    ).limit(limit + 1).all()
+
+    has_more = len(trades) > limit
+    trades = trades[:limit]
+
+    return jsonify({
+        'trades': [trade.to_dict() for trade in trades],
+        'next_cursor': encode_cursor(trades[-1]) if has_more and trades else None,
+        'limit': limit
+    })
+
+def get_status_filter(default=None):
+    status = request.args.get('status', default)
+    if status and status not in TRADE_STATUSES:
+        raise ValueError('Invalid status')
+    return status
+
+@trades_bp.route('/inbox', methods=['GET'])
+@jwt_required()
+def get_inbox():
+    """Trades proposed to the current user (pending by default)"""
+    user_id = get_jwt_identity()
+
+    try:
+        status = get_status_filter('pending')
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+
+    query = Trade.query.filter(Trade.receiver_id == user_id, Trade.status == status)
+    return paginate_trades(query)
+
+@trades_bp.route('/outbox', methods=['GET'])
+@jwt_required()
+def get_outbox():
+    """Trades proposed by the current user (pending by default)"""
+    user_id = get_jwt_identity()
+
+    try:
+        status = get_status_filter('pending')
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+
+    query = Trade.query.filter(Trade.proposer_id == user_id, Trade.status == status)
+    return paginate_trades(query)
+
+@trades_bp.route('/history', methods=['GET'])
+@jwt_required()
+def get_history():
+    """Closed trades on either side for the current user, optionally filtered by status"""
+    user_id = get_jwt_identity()
+
+    try:
+        status = get_status_filter()
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+
+    query = Trade.query.filter(
+        or_(Trade.proposer_id == user_id, Trade.receiver_id == user_id)
+    )
+
+    if status:
+        query = query.filter(Trade.status == status)
+    else:
+        query = query.filter(Trade.status != 'pending')
+
+    return paginate_trades(query)
+
+@trades_bp.route('/<int:trade_id>/accept', methods=['POST'])
+@jwt_required()
+def accept_trade(trade_id):
+    """Accept a pending trade (receiver only)"""
+    user_id = get_jwt_identity()
+    data = request.get_json(silent=True) or {}
+
+    try:
+        trade, declined_ids = TradeService.accept_trade(trade_id, user_id, data.get('response_message'))
+    except TradeError as e:
+        return jsonify({'message': e.message}), e.status_code
+
+    return jsonify({
+        'message': 'Trade accepted successfully',
+        'trade': trade.to_dict(),
+        'declined_trade_ids': declined_ids
+    })
+
+@trades_bp.route('/<int:trade_id>/decline', methods=['POST'])
+@jwt_required()
+def decline_trade(trade_id):
+    """Decline a pending trade (receiver only)"""
+    user_id = get_jwt_identity()
+    data = request.get_json(silent=True) or {}
+
+    try:
+        trade = TradeService.decline_trade(trade_id, user_id, data.get('response_message'))
+    except TradeError as e:
+        return jsonify({'message': e.message}), e.status_code
+
+    return jsonify({
+        'message': 'Trade declined successfully',
+        'trade': trade.to_dict()
+    })
+
+@trades_bp.route('/<int:trade_id>/cancel', methods=['POST'])
+@jwt_required()
+def cancel_trade(trade_id):
+    """Cancel a pending trade (proposer only)"""
+    user_id = get_jwt_identity()
+
+    try:
+        trade = TradeService.cancel_trade(trade_id, user_id)
+    except TradeError as e:
+        return jsonify({'message': e.message}), e.status_code
+
+    return jsonify({
+        'message': 'Trade cancelled successfully',
+        'trade': trade.to_dict()
+    })
@@ -1,17 +1,24 @@
 from flask import Blueprint, request, jsonify
 from backend.services.exchange_service import ExchangeService
 from backend.services.geocoding_service import GeocodingService
+from backend.services.http_client import request_deadline
+from backend.services.cache_service import response_cache
+from backend.utils.conditional import conditional_response
+from backend.utils.database import read_replica
+from backend.utils.internal import internal_only
 from backend.models.product import ProductCategory, ProductSubcategory
 from backend.models.service import ServiceCategory, ServiceSubcategory
 
 utils_bp = Blueprint('utils', __name__)
 
+MAX_GEOCODE_BATCH_SIZE = 50
+
 @utils_bp.route('/currencies', methods=['GET'])
-def get_currencies():
+async def get_currencies():
     """Get supported currencies with current exchange rates"""
     try:
         currencies = ExchangeService.get_supported_currencies()
-        rates = ExchangeService.get_exchange_rates()
+        rates = await ExchangeService.get_exchange_rates_async(request_deadline())
         
         currency_data = []
         for currency in currencies:
@@ -69,7 +76,7 @@ def convert_currency():
         return jsonify({'message': 'Error converting currency'}), 500
 
 @utils_bp.route('/geocode', methods=['POST'])
-def geocode_address():
+async def geocode_address():
     """Convert address to coordinates"""
     data = request.get_json()
     
@@ -77,7 +84,7 @@ def geocode_address():
         return jsonify({'message': 'Address is required'}), 400
     
     try:
-        latitude, longitude = GeocodingService.geocode_address(data['address'])
+        latitude, longitude = await GeocodingService.geocode_address_async(data['address'], request_deadline())
         
         if latitude is not None and longitude is not None:
             return jsonify({
@@ -97,8 +104,34 @@ def geocode_address():
     except Exception as e:
         return jsonify({'message': 'Error geocoding address'}), 500
 
+@utils_bp.route('/geocode/batch', methods=['POST'])
+async def geocode_addresses():
+    """Convert several addresses to coordinates with concurrent geocoder calls"""
+    data = request.get_json(silent=True) or {}
+    addresses = data.get('addresses')
+    
+    if not isinstance(addresses, list) or not all(isinstance(address, str) for address in addresses):
+        return jsonify({'message': 'addresses must be a list of strings'}), 400
+    if len(addresses) > MAX_GEOCODE_BATCH_SIZE:
+        return jsonify({'message': f'At most {MAX_GEOCODE_BATCH_SIZE} addresses per batch'}), 400
+    
+    # Duplicates are geocoded once
+    unique = list(dict.fromkeys(addresses))
+    coordinates = dict(zip(unique, await GeocodingService.geocode_many_async(unique, request_deadline())))
+    
+    results = []
+    for address in addresses:
+        latitude, longitude = coordinates[address]
+        results.append({
+            'address': address,
+            'coordinates': {'latitude': latitude, 'longitude': longitude} if latitude is not None else None,
+            'success': latitude is not None and longitude is not None
+        })
+    
+    return jsonify({'results': results})
+
 @utils_bp.route('/reverse-geocode', methods=['POST'])
-def reverse_geocode():
+async def reverse_geocode():
     """Convert coordinates to address"""
     data = request.get_json()
     
@@ -114,7 +147,7 @@ def reverse_geocode():
         if not GeocodingService.validate_coordinates(latitude, longitude):
             return jsonify({'message': 'Invalid coordinates'}), 400
         
-        address = GeocodingService.reverse_geocode(latitude, longitude)
+        address = await GeocodingService.reverse_geocode_async(latitude, longitude, request_deadline())
         
         if address:
             return jsonify({
@@ -137,6 +170,8 @@ def reverse_geocode():
         return jsonify({'message': 'Error reverse geocoding'}), 500
 
 @utils_bp.route('/categories/all', methods=['GET'])
+@response_cache.cached('taxonomy')
+@read_replica
 def get_all_categories():
     """Get all product and service categories"""
     try:
@@ -168,11 +203,11 @@ def get_all_categories():
                 'subcategories': subcategories
             })
         
-        return jsonify({
+        return conditional_response(jsonify({
             'product_categories': product_categories,
             'service_categories': service_categories,
             'total_categories': len(product_categories) + len(service_categories)
-        })
+        }))
         
     except Exception as e:
         return jsonify({'message': 'Error fetching categories'}), 500
@@ -207,3 +242,9 @@ def calculate_distance():
         return jsonify({'message': 'Invalid coordinate values'}), 400
     except Exception as e:
         return jsonify({'message': 'Error calculating distance'}), 500
+
+@utils_bp.route('/cache-stats', methods=['GET'])
+@internal_only
+def get_cache_stats():
+    """Get response cache hit/miss statistics"""
+    return jsonify(response_cache.stats())
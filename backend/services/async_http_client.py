@@ -0,0 +1,90 @@
+from backend.services.http_client import DeadlineExceeded
+from backend.utils.circuit_breaker import CircuitOpenError, circuit_breaker
+from backend.utils.metrics import record_outbound
+from config import Config
+import asyncio
+import httpx
+import os
+import threading
+import time
+
+class AsyncHttpClient:
+    """One pooled httpx.AsyncClient per process, shared by every thread and view.
+
+    Flask runs each async view in a fresh event loop, so a client bound to the
+    view's loop would lose its keep-alive connections after every request.
+    Calls therefore run on a background loop owned by this client and are
+    awaited from the caller's loop. The loop is recreated after a fork.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loop = None
+        self._client = None
+        self._pid = None
+
+    def _ensure_loop(self):
+        with self._lock:
+            if self._pid != os.getpid():
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name='async-http-client', daemon=True).start()
+                self._loop, self._client, self._pid = loop, None, os.getpid()
+            return self._loop
+
+    def _get_client(self):
+        # Only called on the loop thread, so no lock is needed
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=Config.OUTBOUND_MAX_CONNECTIONS,
+                    max_keepalive_connections=Config.OUTBOUND_MAX_KEEPALIVE,
+                    keepalive_expiry=Config.OUTBOUND_KEEPALIVE_SECONDS
+                ),
+                timeout=Config.OUTBOUND_TIMEOUT
+            )
+        return self._client
+
+    def run(self, coroutine):
+        """Run a coroutine on the shared loop from synchronous code and return its result"""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._ensure_loop()).result()
+
+    async def get(self, provider, url, params=None, deadline=None):
+        """GET through the provider's circuit breaker, giving up at deadline (a time.monotonic() value)"""
+        future = asyncio.run_coroutine_threadsafe(self._get(provider, url, params, deadline), self._ensure_loop())
+        return await asyncio.wrap_future(future)
+
+    async def _get(self, provider, url, params, deadline):
+        timeout = Config.OUTBOUND_TIMEOUT
+        if deadline is not None:
+            timeout = min(timeout, deadline - time.monotonic())
+            if timeout <= 0:
+                record_outbound(provider, 'deadline')
+                raise DeadlineExceeded(f"No time left to call {provider}")
+
+        breaker = circuit_breaker(provider)
+        if not breaker.allow():
+            record_outbound(provider, 'circuit_open')
+            raise CircuitOpenError(f"Circuit open for {provider}")
+
+        started = time.perf_counter()
+        try:
+            response = await self._get_client().get(url, params=params, timeout=timeout)
+        except BaseException as e:
+            timed_out = isinstance(e, httpx.TimeoutException)
+            if isinstance(e, asyncio.CancelledError) or (timed_out and timeout < Config.OUTBOUND_TIMEOUT):
+                # Cut short by the caller's deadline, not a sign the provider is down
+                breaker.release()
+            else:
+                breaker.record_failure()
+            outcome = 'timeout' if timed_out else 'cancelled' if isinstance(e, asyncio.CancelledError) else 'error'
+            record_outbound(provider, outcome, time.perf_counter() - started)
+            raise
+
+        if response.status_code >= 500 or response.status_code == 429:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        record_outbound(provider, response.status_code, time.perf_counter() - started)
+        return response
+
+async_http_client = AsyncHttpClient()
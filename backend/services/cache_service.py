@@ -0,0 +1,313 @@
+from collections import OrderedDict
+from functools import wraps
+from flask import current_app, request, make_response
+from werkzeug.http import unquote_etag
+from backend.services.outbox_service import OutboxService
+from backend.utils import compression, json_provider
+from backend.utils.metrics import record_cache
+from backend.utils.conditional import is_not_modified, not_modified
+from backend.utils.database import reading_from_replica
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+class MemoryCacheBackend:
+    """In-process LRU + TTL store; suitable for a single worker"""
+
+    def __init__(self, max_entries=1000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def get_versions(self, names):
+        with self._lock:
+            return [self._versions.get(name, 0) for name in names]
+
+    def bump_versions(self, names):
+        with self._lock:
+            for name in names:
+                self._versions[name] = self._versions.get(name, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteCacheBackend:
+    """LRU + TTL store in a local SQLite file shared by every worker on the host"""
+
+    def __init__(self, path, max_entries=1000):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+
+        with self._connect() as connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS cache_entry ('
+                'key TEXT PRIMARY KEY, value BLOB NOT NULL, '
+                'expires_at REAL NOT NULL, accessed_at REAL NOT NULL)'
+            )
+            connection.execute(
+                'CREATE INDEX IF NOT EXISTS ix_cache_entry_accessed_at ON cache_entry (accessed_at)'
+            )
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS cache_version (name TEXT PRIMARY KEY, version INTEGER NOT NULL)'
+            )
+
+    def _connect(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or getattr(self._local, 'pid', None) != os.getpid():
+            # One connection per thread, reopened after fork
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def get(self, key):
+        connection = self._connect()
+        now = time.time()
+        row = connection.execute(
+            'SELECT value, expires_at FROM cache_entry WHERE key = ?', (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        if row[1] < now:
+            connection.execute('DELETE FROM cache_entry WHERE key = ?', (key,))
+            return None
+        connection.execute('UPDATE cache_entry SET accessed_at = ? WHERE key = ?', (now, key))
+        return row[0]
+
+    def set(self, key, value, ttl):
+        connection = self._connect()
+        now = time.time()
+        connection.execute(
+            'INSERT OR REPLACE INTO cache_entry (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)',
+            (key, value, now + ttl, now)
+        )
+        # Evict least recently used entries beyond the limit
+        connection.execute(
+            'DELETE FROM cache_entry WHERE key IN ('
+            'SELECT key FROM cache_entry ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)',
+            (self.max_entries,)
+        )
+
+    def get_versions(self, names):
+        connection = self._connect()
+        placeholders = ','.join('?' * len(names))
+        versions = dict(connection.execute(
+            f'SELECT name, version FROM cache_version WHERE name IN ({placeholders})', tuple(names)
+        ).fetchall())
+        return [versions.get(name, 0) for name in names]
+
+    def bump_versions(self, names):
+        connection = self._connect()
+        for name in names:
+            connection.execute(
+                'INSERT INTO cache_version (name, version) VALUES (?, 1) '
+                'ON CONFLICT(name) DO UPDATE SET version = version + 1',
+                (name,)
+            )
+
+    def clear(self):
+        self._connect().execute('DELETE FROM cache_entry')
+
+    def __len__(self):
+        return self._connect().execute('SELECT COUNT(*) FROM cache_entry').fetchone()[0]
+
+
+class ResponseCache:
+    """Caches anonymous GET responses keyed by path and normalized query string.
+
+    Keys embed a version counter per entity type, so bumping the version after a
+    write makes every cached response depending on that type unreachable.
+    Compressed variants are stored next to each entry the first time a client
+    asks for them, so hits are compressed once rather than per request.
+    """
+
+    SEPARATOR = b'\n'
+    STORED_HEADERS = ['Content-Type', 'ETag', 'Last-Modified', 'Cache-Control']
+
+    def __init__(self):
+        self.backend = None
+        self.ttl = 60
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.invalidated_at = 0.0
+        self._stats_lock = threading.Lock()
+
+    def init_app(self, app):
+        backend = app.config.get('RESPONSE_CACHE_BACKEND', 'memory')
+        max_entries = app.config.get('RESPONSE_CACHE_MAX_ENTRIES', 1000)
+        self.ttl = app.config.get('RESPONSE_CACHE_TTL', 60)
+
+        if backend == 'sqlite':
+            self.backend = SQLiteCacheBackend(app.config['RESPONSE_CACHE_PATH'], max_entries)
+        elif backend == 'memory':
+            self.backend = MemoryCacheBackend(max_entries)
+        else:
+            self.backend = None
+
+        app.extensions['response_cache'] = self
+
+    @staticmethod
+    def normalize_query(args):
+        """Sorted, whitespace-trimmed query parameters without empty values"""
+        items = sorted(
+            (key, value.strip()) for key, value in args.items(multi=True)
+            if value is not None and value.strip() != ''
+        )
+        return '&'.join(f'{key}={value}' for key, value in items)
+
+    def make_key(self, entity_types):
+        versions = self.backend.get_versions(entity_types)
+        version_tag = ','.join(f'{name}:{version}' for name, version in zip(entity_types, versions))
+        raw = f'{request.path}?{ResponseCache.normalize_query(request.args)}|{version_tag}'
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def is_cacheable_request():
+        """Only anonymous requests: personalised responses must never be shared"""
+        if request.method != 'GET':
+            return False
+        if request.headers.get('Authorization') or request.args.get('jwt'):
+            return False
+        return request.args.get('with_favorites', 'false').lower() != 'true'
+
+    def _count(self, attribute):
+        with self._stats_lock:
+            setattr(self, attribute, getattr(self, attribute) + 1)
+
+    def _serialize(self, response):
+        headers = {
+            name: response.headers[name] for name in ResponseCache.STORED_HEADERS
+            if name in response.headers
+        }
+        return json_provider.dumps_bytes(headers) + ResponseCache.SEPARATOR + response.get_data()
+
+    def _deserialize(self, value):
+        headers, body = bytes(value).split(ResponseCache.SEPARATOR, 1)
+        return json_provider.loads(headers), body
+
+    def _hit_response(self, key, headers, body):
+        """Build a response from a cached entry, serving a stored compressed variant when accepted"""
+        etag = headers.get('ETag')
+        if etag and is_not_modified(unquote_etag(etag)[0]):
+            return not_modified(unquote_etag(etag)[0])
+
+        encoding = compression.negotiate_encoding()
+        if encoding is None or len(body) < current_app.config.get('COMPRESSION_MIN_SIZE', 500):
+            return make_response(body, 200, headers)
+
+        # The checksum ties the variant to this body if the entry is re-rendered under the same key
+        variant_key = f'{key}:{encoding}:{zlib.crc32(body)}'
+        variant = self.backend.get(variant_key)
+        if variant is None:
+            variant = compression.compress(body, encoding, 'static')
+            self.backend.set(variant_key, variant, self.ttl)
+
+        return compression.mark_encoded(make_response(variant, 200, headers), encoding)
+
+    def cached(self, *entity_types):
+        """Decorator caching a view's 200 responses until TTL expiry or a write to entity_types"""
+        entity_types = sorted(entity_types)
+
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if self.backend is None or not ResponseCache.is_cacheable_request():
+                    return view(*args, **kwargs)
+
+                key = self.make_key(entity_types)
+                value = self.backend.get(key)
+                if value is not None:
+                    self._count('hits')
+                    record_cache('response', True)
+                    response = self._hit_response(key, *self._deserialize(value))
+                    response.headers['X-Cache'] = 'HIT'
+                    return response
+
+                self._count('misses')
+                record_cache('response', False)
+                response = make_response(view(*args, **kwargs))
+                if response.status_code == 200 and not response.is_streamed and not self._replica_may_lag():
+                    self.backend.set(key, self._serialize(response), self.ttl)
+                    self._count('stores')
+                response.headers['X-Cache'] = 'MISS'
+                return response
+
+            return wrapper
+        return decorator
+
+    def _replica_may_lag(self):
+        """A replica read just after an invalidation may predate the write that caused it"""
+        lag = current_app.config.get('DATABASE_REPLICA_LAG_SECONDS', 5)
+        return reading_from_replica() and time.monotonic() - self.invalidated_at < lag
+
+    def invalidate(self, entity_types):
+        """Bump the version of each entity type so dependent entries are never served again"""
+        if self.backend is not None and entity_types:
+            self.backend.bump_versions(sorted(entity_types))
+            self.invalidated_at = time.monotonic()
+
+    def clear(self):
+        if self.backend is not None:
+            self.backend.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'backend': type(self.backend).__name__ if self.backend else None,
+            'entries': len(self.backend) if self.backend is not None else 0,
+            'hits': self.hits,
+            'misses': self.misses,
+            'stores': self.stores,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else None
+        }
+
+
+response_cache = ResponseCache()
+_local_versions = MemoryCacheBackend(0)
+
+
+def shared_versions():
+    """Version counters of the response cache backend, seen by every worker when it is SQLite.
+
+    In-process caches tag entries with a version and bump it on writes, so an
+    entry cached by one worker is not served after another worker's write.
+    """
+    return response_cache.backend if response_cache.backend is not None else _local_versions
+
+# Listing writes recorded in the outbox invalidate cached responses on commit
+OutboxService.on_commit(response_cache.invalidate)
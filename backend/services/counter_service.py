@@ -0,0 +1,143 @@
+from sqlalchemy import case, event, func, inspect, or_, select, update
+from backend.app import db
+from backend.models.product import Product
+from backend.models.service import Service
+from backend.models.favorite import Favorite
+from backend.models.trade import Trade
+
+class CounterService:
+    """Keeps Product/Service favorite_count and pending_trade_count in step with their source rows"""
+
+    @staticmethod
+    def _table(item_type):
+        return Product.__table__ if item_type == 'product' else Service.__table__
+
+    @staticmethod
+    def adjust(connection, item_type, item_ids, column, delta):
+        """Atomically add delta to a counter column for the given listings"""
+        item_ids = [item_id for item_id in item_ids if item_id]
+        if not item_ids:
+            return
+
+        table = CounterService._table(item_type)
+        new_value = table.c[column] + delta
+        if delta < 0:
+            new_value = case((new_value < 0, 0), else_=new_value)
+
+        connection.execute(
+            update(table)
+            .where(table.c.id.in_(item_ids))
+            .values({
+                column: new_value,
+                # Counter changes are not listing edits
+                'updated_at': table.c.updated_at
+            })
+        )
+
+    @staticmethod
+    def _trade_items(trade):
+        return (
+            [trade.offered_product_id, trade.requested_product_id],
+            [trade.offered_service_id, trade.requested_service_id]
+        )
+
+    @staticmethod
+    def adjust_pending_trades(connection, trade, delta):
+        product_ids, service_ids = CounterService._trade_items(trade)
+        CounterService.adjust(connection, 'product', product_ids, 'pending_trade_count', delta)
+        CounterService.adjust(connection, 'service', service_ids, 'pending_trade_count', delta)
+
+    @staticmethod
+    def _favorite_count_query(table, column):
+        return (
+            select(func.count(Favorite.__table__.c.id))
+            .where(Favorite.__table__.c[column] == table.c.id)
+            .scalar_subquery()
+        )
+
+    @staticmethod
+    def _pending_trade_count_query(table, offered_column, requested_column):
+        trades = Trade.__table__
+        return (
+            select(func.count(trades.c.id))
+            .where(
+                trades.c.status == 'pending',
+                or_(trades.c[offered_column] == table.c.id, trades.c[requested_column] == table.c.id)
+            )
+            .scalar_subquery()
+        )
+
+    @staticmethod
+    def recompute(item_type, item_ids=None):
+        """Recompute counters from the favorite and trade tables, optionally for some listings only"""
+        table = CounterService._table(item_type)
+        stmt = update(table).values(
+            favorite_count=CounterService._favorite_count_query(table, f'{item_type}_id'),
+            pending_trade_count=CounterService._pending_trade_count_query(
+                table, f'offered_{item_type}_id', f'requested_{item_type}_id'
+            ),
+            updated_at=table.c.updated_at
+        )
+
+        if item_ids is not None:
+            item_ids = [item_id for item_id in item_ids if item_id]
+            if not item_ids:
+                return 0
+            stmt = stmt.where(table.c.id.in_(item_ids))
+
+        return db.session.execute(stmt).rowcount
+
+    @staticmethod
+    def repair_all():
+        """Recompute every listing counter; returns rows updated per type"""
+        result = {
+            'products': CounterService.recompute('product'),
+            'services': CounterService.recompute('service')
+        }
+        db.session.commit()
+        return result
+
+
+@event.listens_for(Favorite, 'after_insert')
+def _favorite_inserted(mapper, connection, target):
+    CounterService.adjust(connection, 'product', [target.product_id], 'favorite_count', 1)
+    CounterService.adjust(connection, 'service', [target.service_id], 'favorite_count', 1)
+
+
+@event.listens_for(Favorite, 'after_delete')
+def _favorite_deleted(mapper, connection, target):
+    CounterService.adjust(connection, 'product', [target.product_id], 'favorite_count', -1)
+    CounterService.adjust(connection, 'service', [target.service_id], 'favorite_count', -1)
+
+
+@event.listens_for(Trade, 'after_insert')
+def _trade_inserted(mapper, connection, target):
+    if (target.status or 'pending') == 'pending':
+        CounterService.adjust_pending_trades(connection, target, 1)
+
+
+@event.listens_for(Trade.status, 'set', active_history=True)
+def _load_previous_trade_status(target, value, oldvalue, initiator):
+    # active_history makes the ORM load the old status so after_update can see it
+    return value
+
+
+@event.listens_for(Trade, 'after_update')
+def _trade_updated(mapper, connection, target):
+    history = inspect(target).attrs.status.history
+    if not history.has_changes():
+        return
+
+    was_pending = 'pending' in (history.deleted or ())
+    is_pending = target.status == 'pending'
+
+    if was_pending and not is_pending:
+        CounterService.adjust_pending_trades(connection, target, -1)
+    elif is_pending and not was_pending:
+        CounterService.adjust_pending_trades(connection, target, 1)
+
+
+@event.listens_for(Trade, 'after_delete')
+def _trade_deleted(mapper, connection, target):
+    if target.status == 'pending':
+        CounterService.adjust_pending_trades(connection, target, -1)
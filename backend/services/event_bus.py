@@ -0,0 +1,260 @@
+from collections import deque
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import delete, event, func, insert, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from backend.app import db
+from backend.models.stream_event import StreamEvent
+from config import Config
+import logging
+import os
+import threading
+import time
+
+class StreamLimitReached(Exception):
+    """Raised when this process already holds its maximum of open event streams"""
+
+
+class Subscription:
+    """A subscriber's bounded event buffer; the oldest events are dropped when it fills up"""
+
+    def __init__(self, user_id, buffer_size):
+        self.user_id = user_id
+        self.events = deque(maxlen=buffer_size)
+        self.condition = threading.Condition()
+        self.overflowed = False
+        # Replayed and polled events may overlap, and ids can arrive out of order
+        self._seen_ids = set()
+        self._seen_order = deque()
+        self._seen_limit = buffer_size + 1000
+
+    def push(self, event_data):
+        with self.condition:
+            if event_data['id'] in self._seen_ids:
+                return
+            self._seen_ids.add(event_data['id'])
+            self._seen_order.append(event_data['id'])
+            if len(self._seen_order) > self._seen_limit:
+                self._seen_ids.discard(self._seen_order.popleft())
+            if len(self.events) == self.events.maxlen:
+                self.overflowed = True
+            self.events.append(event_data)
+            self.condition.notify()
+
+    def get(self, timeout):
+        """Wait up to timeout seconds and return (events, overflowed)"""
+        with self.condition:
+            if not self.events:
+                self.condition.wait(timeout)
+
+            events = list(self.events)
+            self.events.clear()
+            overflowed, self.overflowed = self.overflowed, False
+            return events, overflowed
+
+
+class EventBus:
+    """Per-user notifications for event streams, shared by every worker process.
+
+    Events are stream_event rows written in the transaction that caused them.
+    While a process has subscribers, a background thread polls the table and
+    pushes new rows to that process's subscriptions, so an event reaches a
+    stream whichever worker holds it, and event ids are valid Last-Event-ID
+    values on every worker. Commits in the same process wake the poller at once.
+
+    Ids are allocated at insert but become visible at commit, so a row can
+    appear behind rows already delivered. Each poll re-reads the last lookback
+    ids behind the newest delivered row and pushes only those not seen yet.
+    """
+
+    def __init__(self, poll_interval=1.0, batch_size=500, retention=timedelta(days=1), lookback=100):
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._subscriptions = {}  # user_id -> set of Subscription
+        self._last_id = None  # Newest row pushed by this process; None while nobody listens
+        self._delivered = set()  # Ids pushed within the lookback window
+        self._poller_pid = None
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.retention = retention
+        self.lookback = lookback
+
+    def subscribe(self, user_id, last_event_id=None, buffer_size=100, max_subscriptions=None):
+        """Open a subscription, replaying events newer than last_event_id.
+
+        Returns (subscription, complete) where complete is False when more
+        events than the buffer holds were missed. Raises StreamLimitReached
+        when max_subscriptions are already open in this process.
+        """
+        subscription = Subscription(user_id, buffer_size)
+
+        with self._lock:
+            if max_subscriptions is not None and self._count() >= max_subscriptions:
+                raise StreamLimitReached()
+            if self._last_id is None:
+                self._last_id = db.session.execute(select(func.max(StreamEvent.id))).scalar() or 0
+                # Rows already committed are history, not news for the poller to push
+                self._delivered = set(db.session.execute(
+                    select(StreamEvent.id).where(StreamEvent.id > self._last_id - self.lookback)
+                ).scalars())
+            # Registered before replaying, so nothing committed in between is lost
+            self._subscriptions.setdefault(user_id, set()).add(subscription)
+            self._start_poller()
+
+        complete = True
+        if last_event_id is not None:
+            try:
+                missed = self._read_missed(user_id, last_event_id, buffer_size)
+            except BaseException:
+                self.unsubscribe(subscription)
+                raise
+            complete = len(missed) <= buffer_size
+            for event_data in reversed(missed[:buffer_size]):
+                subscription.push(event_data)
+
+        return subscription, complete
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.user_id)
+            if subscriptions:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.user_id]
+
+    def subscriber_count(self):
+        with self._lock:
+            return self._count()
+
+    def notify(self):
+        """Poll now rather than at the next interval"""
+        self._wakeup.set()
+
+    def _count(self):
+        return sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+
+    @staticmethod
+    def _read_missed(user_id, last_event_id, buffer_size):
+        """Up to buffer_size + 1 of the user's events after last_event_id, newest first"""
+        rows = db.session.execute(
+            select(StreamEvent.id, StreamEvent.event_type, StreamEvent.data)
+            .where(StreamEvent.user_id == user_id, StreamEvent.id > last_event_id)
+            .order_by(StreamEvent.id.desc())
+            .limit(buffer_size + 1)
+        ).all()
+        return [{'id': row.id, 'type': row.event_type, 'data': row.data} for row in rows]
+
+    def _start_poller(self):
+        # Called with the lock held; threads do not survive a fork
+        if self._poller_pid == os.getpid():
+            return
+        self._poller_pid = os.getpid()
+        app = current_app._get_current_object()
+        threading.Thread(target=self._poll, args=(app,), name='event-bus-poller', daemon=True).start()
+
+    def _poll(self, app):
+        pruned_at = 0
+        with app.app_context():
+            while True:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+
+                with self._lock:
+                    if not self._subscriptions:
+                        # Nobody to deliver to; the next subscriber starts from the newest row
+                        self._last_id = None
+                        self._delivered.clear()
+                        continue
+                    last_id = self._last_id
+
+                try:
+                    with db.engine.connect() as connection:
+                        rows = connection.execute(
+                            select(StreamEvent.id, StreamEvent.user_id, StreamEvent.event_type, StreamEvent.data)
+                            .where(StreamEvent.id > last_id - self.lookback)
+                            .order_by(StreamEvent.id)
+                            .limit(self.batch_size + self.lookback)
+                        ).all()
+                    if time.monotonic() - pruned_at > 3600:
+                        self.prune()
+                        pruned_at = time.monotonic()
+                except SQLAlchemyError as e:
+                    logging.warning(f"Event stream poll failed: {e}")
+                    continue
+
+                if rows:
+                    self._dispatch(last_id, rows)
+                if len(rows) == self.batch_size + self.lookback:
+                    self._wakeup.set()
+
+    def _dispatch(self, last_id, rows):
+        deliveries = []
+        with self._lock:
+            # Everyone unsubscribed and the position was reset meanwhile
+            if self._last_id != last_id:
+                return
+            self._last_id = max(last_id, rows[-1].id)
+            for row in rows:
+                if row.id in self._delivered:
+                    continue
+                self._delivered.add(row.id)
+                for subscription in self._subscriptions.get(row.user_id, ()):
+                    deliveries.append((subscription, {'id': row.id, 'type': row.event_type, 'data': row.data}))
+            floor = self._last_id - self.lookback
+            self._delivered = {event_id for event_id in self._delivered if event_id > floor}
+
+        for subscription, event_data in deliveries:
+            subscription.push(event_data)
+
+    def prune(self):
+        """Delete events older than the retention period; returns rows removed"""
+        cutoff = datetime.utcnow() - self.retention
+        with db.engine.begin() as connection:
+            return connection.execute(delete(StreamEvent).where(StreamEvent.created_at < cutoff)).rowcount
+
+
+event_bus = EventBus(Config.EVENT_STREAM_POLL_SECONDS)
+
+
+def queue_event(session, user_id, event_type, data):
+    """Publish an event once the session's current transaction commits"""
+    session.info.setdefault('pending_events', []).append((user_id, event_type, data))
+
+
+def _write_pending_events(session):
+    """Insert queued events within the transaction, so they exist if and only if it commits"""
+    pending = session.info.pop('pending_events', None)
+    if not pending:
+        return
+
+    now = datetime.utcnow()
+    session.connection().execute(insert(StreamEvent.__table__), [
+        {'user_id': user_id, 'event_type': event_type, 'data': data, 'created_at': now}
+        for user_id, event_type, data in pending
+    ])
+    session.info['wrote_events'] = True
+
+
+@event.listens_for(Session, 'after_flush')
+def _write_flushed_events(session, flush_context):
+    # Events queued by mapper hooks during this flush
+    _write_pending_events(session)
+
+
+@event.listens_for(Session, 'before_commit')
+def _write_queued_events(session):
+    # Events queued after Core statements, which need no flush
+    _write_pending_events(session)
+
+
+@event.listens_for(Session, 'after_commit')
+def _wake_poller(session):
+    if session.info.pop('wrote_events', False):
+        event_bus.notify()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_pending_events(session):
+    session.info.pop('pending_events', None)
+    session.info.pop('wrote_events', None)
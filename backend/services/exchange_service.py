@@ -1,7 +1,9 @@
-import requests
 from datetime import datetime, timedelta
 from backend.app import db
 from config import Config
+from backend.services.async_http_client import async_http_client
+from backend.services.http_client import http_client
+from backend.utils.metrics import record_cache
 import json
 import os
 
@@ -50,6 +52,19 @@ class ExchangeService:
         except Exception as e:
             print(f"Error saving cached rates: {e}")
     
+    @staticmethod
+    def _rates_url(api_key):
+        return f"{Config.EXCHANGE_RATE_API_URL}/{api_key}/latest/USD"
+    
+    @staticmethod
+    def _parse_rates(response):
+        """Conversion rates from an API response, or None"""
+        if response.status_code == 200:
+            data = response.json()
+            if data.get('result') == 'success':
+                return data['conversion_rates']
+        return None
+    
     @staticmethod
     def _fetch_rates_from_api():
         """Fetch exchange rates from external API"""
@@ -59,24 +74,39 @@ class ExchangeService:
                 print("Warning: No Exchange Rate API key configured")
                 return None
             
-            url = f"https://v6.exchangerate-api.com/v6/{api_key}/latest/USD"
-            response = requests.get(url, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('result') == 'success':
-                    return data['conversion_rates']
+            response = http_client.get('exchange_rates', ExchangeService._rates_url(api_key))
+            return ExchangeService._parse_rates(response)
             
         except Exception as e:
             print(f"Error fetching exchange rates: {e}")
         
         return None
     
+    @staticmethod
+    async def _fetch_rates_from_api_async(deadline=None):
+        """Fetch exchange rates without blocking the event loop"""
+        try:
+            api_key = Config.EXCHANGE_RATE_API_KEY
+            if not api_key:
+                print("Warning: No Exchange Rate API key configured")
+                return None
+            
+            response = await async_http_client.get(
+                'exchange_rates', ExchangeService._rates_url(api_key), deadline=deadline
+            )
+            return ExchangeService._parse_rates(response)
+            
+        except Exception as e:
+            print(f"Error fetching exchange rates: {e!r}")
+        
+        return None
+    
     @staticmethod
     def get_exchange_rates():
         """Get current exchange rates (cached or fresh)"""
         # Try to load from cache first
         rates = ExchangeService._load_cached_rates()
+        record_cache('exchange_rates', rates is not None)
         
         if rates is None:
             # Fetch fresh rates from API
@@ -91,6 +121,22 @@ class ExchangeService:
         
         return rates
     
+    @staticmethod
+    async def get_exchange_rates_async(deadline=None):
+        """get_exchange_rates for async views, fetching within deadline (a time.monotonic() value)"""
+        rates = ExchangeService._load_cached_rates()
+        record_cache('exchange_rates', rates is not None)
+        
+        if rates is None:
+            rates = await ExchangeService._fetch_rates_from_api_async(deadline)
+            
+            if rates:
+                ExchangeService._save_cached_rates(rates)
+            else:
+                rates = ExchangeService._get_fallback_rates()
+        
+        return rates
+    
     @staticmethod
     def _get_fallback_rates():
         """Fallback exchange rates when API is unavailable"""
@@ -0,0 +1,129 @@
+from sqlalchemy import select, or_
+from datetime import date, datetime
+from backend.app import db
+from backend.models.product import Product
+from backend.models.service import Service
+from backend.models.trade import Trade
+from backend.utils import json_provider
+import csv
+import io
+import json
+
+class ExportService:
+
+    YIELD_PER = 1000  # Rows fetched per round trip from the server-side cursor
+    CSV_CHUNK_ROWS = 500  # Rows buffered before a CSV chunk is emitted
+    SUPPORTED_FORMATS = ['ndjson', 'csv']
+    ENTITIES = ['products', 'services', 'trades']
+
+    TYPES = {
+        'products': 'product',
+        'services': 'service',
+        'trades': 'trade'
+    }
+
+    @staticmethod
+    def _table(entity):
+        return {
+            'products': Product.__table__,
+            'services': Service.__table__,
+            'trades': Trade.__table__
+        }[entity]
+
+    @staticmethod
+    def parse_entities(value):
+        """Parse a comma separated entity list, defaulting to everything"""
+        if not value:
+            return list(ExportService.ENTITIES)
+
+        entities = [entity.strip() for entity in value.split(',') if entity.strip()]
+        for entity in entities:
+            if entity not in ExportService.ENTITIES:
+                raise ValueError(f'Unknown export type: {entity}')
+        return entities
+
+    @staticmethod
+    def iter_rows(entity, user_id=None):
+        """Stream raw table rows for an entity without hydrating ORM objects"""
+        table = ExportService._table(entity)
+        stmt = select(table).order_by(table.c.id)
+
+        if user_id is not None:
+            if entity == 'trades':
+                stmt = stmt.where(or_(table.c.proposer_id == user_id, table.c.receiver_id == user_id))
+            else:
+                stmt = stmt.where(table.c.user_id == user_id)
+
+        result = db.session.execute(stmt, execution_options={'yield_per': ExportService.YIELD_PER})
+        for row in result:
+            yield row._mapping
+
+    @staticmethod
+    def _csv_value(value):
+        if value is None:
+            return ''
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        if isinstance(value, (list, dict)):
+            return json.dumps(value)
+        return value
+
+    @staticmethod
+    def csv_columns(entities):
+        """Union of the exported tables' columns, prefixed by the record type"""
+        columns = ['type']
+        for entity in entities:
+            for column in ExportService._table(entity).columns.keys():
+                if column not in columns:
+                    columns.append(column)
+        return columns
+
+    @staticmethod
+    def generate_ndjson(entities, user_id=None):
+        """Yield one JSON document per line"""
+        for entity in entities:
+            record_type = ExportService.TYPES[entity]
+            for row in ExportService.iter_rows(entity, user_id):
+                record = {'type': record_type, **row}
+                yield json_provider.dumps(record) + '\n'
+
+    @staticmethod
+    def generate_csv(entities, user_id=None):
+        """Yield CSV text in chunks of CSV_CHUNK_ROWS rows"""
+        columns = ExportService.csv_columns(entities)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+
+        pending = 0
+        for entity in entities:
+            record_type = ExportService.TYPES[entity]
+            for row in ExportService.iter_rows(entity, user_id):
+                writer.writerow([
+                    record_type if column == 'type' else ExportService._csv_value(row.get(column))
+                    for column in columns
+                ])
+                pending += 1
+
+                if pending >= ExportService.CSV_CHUNK_ROWS:
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+                    pending = 0
+
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    @staticmethod
+    def generate(entities, user_id=None, data_format='ndjson'):
+        """Yield export chunks in the requested format"""
+        if data_format not in ExportService.SUPPORTED_FORMATS:
+            raise ValueError(f'Unsupported format: {data_format}')
+
+        if data_format == 'csv':
+            return ExportService.generate_csv(entities, user_id)
+        return ExportService.generate_ndjson(entities, user_id)
+
+    @staticmethod
+    def mimetype(data_format):
+        return 'text/csv' if data_format == 'csv' else 'application/x-ndjson'
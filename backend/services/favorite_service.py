@@ -0,0 +1,117 @@
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
+from backend.models.favorite import Favorite
+from backend.services.cache_service import shared_versions
+from backend.utils.metrics import record_cache
+import threading
+
+class FavoriteService:
+
+    CACHE_DURATION = timedelta(seconds=30)
+    MAX_CACHED_USERS = 10000
+
+    _cache = OrderedDict()  # user_id -> (timestamp, version, product_ids, service_ids)
+    _lock = threading.Lock()
+
+    @staticmethod
+    def get_user_favorite_ids(user_id):
+        """Get (product_ids, service_ids) favorited by a user, cached for a short TTL.
+
+        Entries carry the user's version from shared_versions(), bumped when
+        their favorites change, so no worker serves them after another's write.
+        Reading it before the ids also keeps ids read before a concurrent
+        commit from being served after it.
+        """
+        version, = shared_versions().get_versions([f'favorites:{user_id}'])
+
+        with FavoriteService._lock:
+            cached = FavoriteService._cache.get(user_id)
+            if cached and cached[1] == version and datetime.now() - cached[0] < FavoriteService.CACHE_DURATION:
+                FavoriteService._cache.move_to_end(user_id)
+                record_cache('favorites', True)
+                return cached[2], cached[3]
+
+        record_cache('favorites', False)
+
+        product_ids, service_ids = Favorite.get_user_favorite_ids(user_id)
+
+        with FavoriteService._lock:
+            FavoriteService._cache[user_id] = (datetime.now(), version, product_ids, service_ids)
+            FavoriteService._cache.move_to_end(user_id)
+            while len(FavoriteService._cache) > FavoriteService.MAX_CACHED_USERS:
+                FavoriteService._cache.popitem(last=False)
+
+        return product_ids, service_ids
+
+    @staticmethod
+    def get_favorited_subset(user_id, product_ids=None, service_ids=None):
+        """Return the favorited subset of the given ids"""
+        favorited_products, favorited_services = FavoriteService.get_user_favorite_ids(user_id)
+        return (
+            favorited_products.intersection(product_ids or []),
+            favorited_services.intersection(service_ids or [])
+        )
+
+    @staticmethod
+    def invalidate(user_id):
+        """Drop the cached favorites of a user in every worker"""
+        shared_versions().bump_versions([f'favorites:{user_id}'])
+        with FavoriteService._lock:
+            FavoriteService._cache.pop(user_id, None)
+
+    @staticmethod
+    def wants_favorites(args):
+        """Check whether a request asked for is_favorited annotations"""
+        return args.get('with_favorites', 'false').lower() == 'true'
+
+    @staticmethod
+    def get_optional_user_id():
+        """Return the authenticated user id if a valid token was sent, otherwise None"""
+        try:
+            verify_jwt_in_request(optional=True)
+            return get_jwt_identity()
+        except Exception:
+            return None
+
+    @staticmethod
+    def annotate(results, user_id, item_type=None):
+        """Set is_favorited on serialized listings (uses result['type'] unless item_type is given)"""
+        if user_id is None:
+            for result in results:
+                result['is_favorited'] = False
+            return results
+
+        favorited_products, favorited_services = FavoriteService.get_user_favorite_ids(user_id)
+        favorited = {
+            'product': favorited_products,
+            'service': favorited_services
+        }
+
+        for result in results:
+            result_type = item_type or result.get('type')
+            result['is_favorited'] = result['id'] in favorited.get(result_type, ())
+
+        return results
+
+
+@event.listens_for(Favorite, 'after_insert')
+@event.listens_for(Favorite, 'after_delete')
+def _queue_invalidation(mapper, connection, target):
+    session = Session.object_session(target)
+    if session is not None:
+        session.info.setdefault('changed_favorite_users', set()).add(target.user_id)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_favorites(session):
+    # Invalidating at flush would let a concurrent read re-cache the uncommitted state
+    for user_id in session.info.pop('changed_favorite_users', ()):
+        FavoriteService.invalidate(user_id)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_favorite_changes(session):
+    session.info.pop('changed_favorite_users', None)
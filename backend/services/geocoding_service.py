@@ -1,9 +1,34 @@
-import requests
+from backend.services.async_http_client import async_http_client
+from backend.services.http_client import http_client
+from backend.utils.circuit_breaker import CircuitOpenError
 from config import Config
+import asyncio
 import logging
 
 class GeocodingService:
     
+    @staticmethod
+    def _parse_geocode(data, address):
+        """Coordinates from a Geocoding API response body"""
+        if data['status'] == 'OK' and data['results']:
+            location = data['results'][0]['geometry']['location']
+            return location['lat'], location['lng']
+        elif data['status'] == 'ZERO_RESULTS':
+            logging.warning(f"No results found for address: {address}")
+            return None, None
+        else:
+            logging.error(f"Geocoding API error: {data['status']}")
+            return None, None
+    
+    @staticmethod
+    def _parse_reverse_geocode(data):
+        """Formatted address from a Geocoding API response body"""
+        if data['status'] == 'OK' and data['results']:
+            return data['results'][0]['formatted_address']
+        else:
+            logging.error(f"Reverse geocoding API error: {data['status']}")
+            return None
+    
     @staticmethod
     def geocode_address(address):
         """Convert address to latitude/longitude using Google Geocoding API"""
@@ -13,26 +38,15 @@ class GeocodingService:
                 logging.warning("No Google Maps API key configured")
                 return None, None
             
-            url = "https://maps.googleapis.com/maps/api/geocode/json"
             params = {
                 'address': address,
                 'key': api_key
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = http_client.get('geocoding', Config.GEOCODING_API_URL, params=params)
             
             if response.status_code == 200:
-                data = response.json()
-                
-                if data['status'] == 'OK' and data['results']:
-                    location = data['results'][0]['geometry']['location']
-                    return location['lat'], location['lng']
-                elif data['status'] == 'ZERO_RESULTS':
-                    logging.warning(f"No results found for address: {address}")
-                    return None, None
-                else:
-                    logging.error(f"Geocoding API error: {data['status']}")
-                    return None, None
+                return GeocodingService._parse_geocode(response.json(), address)
             else:
                 logging.error(f"Geocoding API request failed: {response.status_code}")
                 return None, None
@@ -50,22 +64,15 @@ class GeocodingService:
                 logging.warning("No Google Maps API key configured")
                 return None
             
-            url = "https://maps.googleapis.com/maps/api/geocode/json"
             params = {
                 'latlng': f"{latitude},{longitude}",
                 'key': api_key
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = http_client.get('geocoding', Config.GEOCODING_API_URL, params=params)
             
             if response.status_code == 200:
-                data = response.json()
-                
-                if data['status'] == 'OK' and data['results']:
-                    return data['results'][0]['formatted_address']
-                else:
-                    logging.error(f"Reverse geocoding API error: {data['status']}")
-                    return None
+                return GeocodingService._parse_reverse_geocode(response.json())
             else:
                 logging.error(f"Reverse geocoding API request failed: {response.status_code}")
                 return None
@@ -74,6 +81,75 @@ class GeocodingService:
             logging.error(f"Error reverse geocoding coordinates ({latitude}, {longitude}): {e}")
             return None
     
+    @staticmethod
+    async def geocode_address_async(address, deadline=None):
+        """geocode_address for async views, giving up at deadline (a time.monotonic() value)"""
+        try:
+            api_key = Config.GOOGLE_MAPS_API_KEY
+            if not api_key:
+                logging.warning("No Google Maps API key configured")
+                return None, None
+            
+            response = await async_http_client.get(
+                'geocoding', Config.GEOCODING_API_URL, params={'address': address, 'key': api_key}, deadline=deadline
+            )
+            
+            if response.status_code == 200:
+                return GeocodingService._parse_geocode(response.json(), address)
+            else:
+                logging.error(f"Geocoding API request failed: {response.status_code}")
+                return None, None
+                
+        except CircuitOpenError:
+            logging.warning(f"Geocoding API unavailable, skipped address: {address}")
+            return None, None
+        except Exception as e:
+            logging.error(f"Error geocoding address '{address}': {e!r}")
+            return None, None
+    
+    @staticmethod
+    async def reverse_geocode_async(latitude, longitude, deadline=None):
+        """reverse_geocode for async views, giving up at deadline (a time.monotonic() value)"""
+        try:
+            api_key = Config.GOOGLE_MAPS_API_KEY
+            if not api_key:
+                logging.warning("No Google Maps API key configured")
+                return None
+            
+            response = await async_http_client.get(
+                'geocoding', Config.GEOCODING_API_URL,
+                params={'latlng': f"{latitude},{longitude}", 'key': api_key}, deadline=deadline
+            )
+            
+            if response.status_code == 200:
+                return GeocodingService._parse_reverse_geocode(response.json())
+            else:
+                logging.error(f"Reverse geocoding API request failed: {response.status_code}")
+                return None
+                
+        except CircuitOpenError:
+            logging.warning(f"Geocoding API unavailable, skipped coordinates ({latitude}, {longitude})")
+            return None
+        except Exception as e:
+            logging.error(f"Error reverse geocoding coordinates ({latitude}, {longitude}): {e!r}")
+            return None
+    
+    @staticmethod
+    async def geocode_many_async(addresses, deadline=None):
+        """Geocode addresses concurrently, GEOCODING_CONCURRENCY at a time; results keep input order"""
+        semaphore = asyncio.Semaphore(Config.GEOCODING_CONCURRENCY)
+        
+        async def geocode(address):
+            async with semaphore:
+                return await GeocodingService.geocode_address_async(address, deadline)
+        
+        return await asyncio.gather(*(geocode(address) for address in addresses))
+    
+    @staticmethod
+    def geocode_many(addresses, deadline=None):
+        """geocode_many_async for synchronous callers"""
+        return async_http_client.run(GeocodingService.geocode_many_async(addresses, deadline))
+    
     @staticmethod
     def validate_coordinates(latitude, longitude):
         """Validate latitude and longitude values"""
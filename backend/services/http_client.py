@@ -0,0 +1,153 @@
+from flask import current_app, g, has_request_context
+from backend.utils.circuit_breaker import CircuitOpenError, circuit_breaker
+from backend.utils.metrics import metrics, record_outbound
+from config import Config
+from requests.adapters import HTTPAdapter
+import os
+import random
+import requests
+import threading
+import time
+
+RETRY_STATUSES = (429, 502, 503, 504)
+
+class DeadlineExceeded(Exception):
+    """Raised when a request's outbound time budget is spent before a call starts"""
+
+class HttpClient:
+    """Pooled requests.Session shared by the services' blocking upstream calls.
+
+    Connections are kept alive per host, idempotent GETs are retried a bounded
+    number of times with jittered exponential backoff, and each provider may
+    have at most OUTBOUND_PROVIDER_CONCURRENCY calls in flight per process.
+    Timeouts apply to each attempt, and no attempt or backoff runs past the
+    caller's deadline. The session is recreated after a fork.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._session = None
+        self._pid = None
+        self._semaphores = {}
+
+    def _get_session(self):
+        with self._lock:
+            if self._pid != os.getpid():
+                self._session, self._pid = self._build_session(), os.getpid()
+            return self._session
+
+    @staticmethod
+    def _build_session():
+        # Retries happen in get(), where each one can be fitted to the deadline
+        adapter = HTTPAdapter(
+            pool_connections=Config.OUTBOUND_POOLS,
+            pool_maxsize=Config.OUTBOUND_MAX_CONNECTIONS,
+            max_retries=0
+        )
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def _semaphore(self, provider):
+        with self._lock:
+            semaphore = self._semaphores.get(provider)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(Config.OUTBOUND_PROVIDER_CONCURRENCY)
+                self._semaphores[provider] = semaphore
+            return semaphore
+
+    @staticmethod
+    def _attempt_timeout(deadline):
+        if deadline is None:
+            return Config.OUTBOUND_TIMEOUT
+        return min(Config.OUTBOUND_TIMEOUT, deadline - time.monotonic())
+
+    @staticmethod
+    def _backoff(retries, response):
+        """Seconds to wait before retry number retries + 1, honouring a numeric Retry-After"""
+        delay = Config.OUTBOUND_RETRY_BACKOFF * 2 ** retries + random.uniform(0, Config.OUTBOUND_RETRY_BACKOFF)
+        retry_after = response.headers.get('Retry-After', '') if response is not None else ''
+        if retry_after.isdigit():
+            delay = max(delay, int(retry_after))
+        return delay
+
+    def get(self, provider, url, params=None, deadline=None):
+        """GET through the provider's circuit breaker, giving up at deadline (a time.monotonic() value)
+
+        Connection errors, timeouts and RETRY_STATUSES are retried up to
+        OUTBOUND_RETRIES times, but only while the backoff leaves time before
+        the deadline; otherwise the last error is raised or response returned.
+        """
+        timeout = self._attempt_timeout(deadline)
+        if timeout <= 0:
+            record_outbound(provider, 'deadline')
+            raise DeadlineExceeded(f"No time left to call {provider}")
+
+        breaker = circuit_breaker(provider)
+        if not breaker.allow():
+            record_outbound(provider, 'circuit_open')
+            raise CircuitOpenError(f"Circuit open for {provider}")
+
+        semaphore = self._semaphore(provider)
+        if not semaphore.acquire(timeout=timeout):
+            breaker.release()
+            record_outbound(provider, 'throttled')
+            raise DeadlineExceeded(f"Too many calls to {provider} in flight")
+
+        started = time.perf_counter()
+        retries = 0
+        try:
+            session = self._get_session()
+            while True:
+                response = error = None
+                try:
+                    response = session.get(url, params=params, timeout=timeout)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    error = e
+                if response is not None and response.status_code not in RETRY_STATUSES:
+                    break
+
+                delay = self._backoff(retries, response)
+                if (retries >= Config.OUTBOUND_RETRIES or delay > Config.OUTBOUND_TIMEOUT
+                        or (deadline is not None and time.monotonic() + delay >= deadline)):
+                    if error is not None:
+                        raise error
+                    break
+                if response is not None:
+                    response.close()
+                time.sleep(delay)
+                retries += 1
+                timeout = self._attempt_timeout(deadline)
+        except Exception as e:
+            timed_out = isinstance(e, requests.Timeout)
+            if timed_out and timeout < Config.OUTBOUND_TIMEOUT:
+                # Cut short by the caller's deadline, not a sign the provider is down
+                breaker.release()
+            else:
+                breaker.record_failure()
+            record_outbound(provider, 'timeout' if timed_out else 'error', time.perf_counter() - started)
+            raise
+        finally:
+            semaphore.release()
+            if retries:
+                metrics.inc('outbound_retries_total', retries, provider=provider)
+
+        if response.status_code >= 500 or response.status_code == 429:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        record_outbound(provider, response.status_code, time.perf_counter() - started)
+        return response
+
+def request_deadline():
+    """Deadline shared by all outbound calls of the current request, set on first use"""
+    if not has_request_context():
+        return None
+    if 'outbound_deadline' not in g:
+        g.outbound_deadline = time.monotonic() + current_app.config.get('OUTBOUND_DEADLINE_SECONDS', 15)
+    return g.outbound_deadline
+
+metrics.describe('outbound_retries_total', 'counter', 'Upstream API calls retried by the pooled client')
+
+http_client = HttpClient()
@@ -0,0 +1,271 @@
+from sqlalchemy import insert
+from backend.app import db
+from backend.models.product import Product
+from backend.models.service import Service
+from backend.services.taxonomy_service import TaxonomyService
+from backend.services.geocoding_service import GeocodingService
+from backend.services.outbox_service import OutboxService
+from backend.utils.metrics import record_cache
+import csv
+import io
+import json
+import logging
+
+class ImportService:
+
+    BATCH_SIZE = 1000
+    SUPPORTED_FORMATS = ['json', 'csv', 'ndjson']
+
+    MODELS = {
+        'product': Product,
+        'service': Service
+    }
+
+    REQUIRED_FIELDS = {
+        'product': ['name', 'estimated_value', 'condition', 'category_id', 'address'],
+        'service': ['name', 'estimated_value', 'category_id', 'is_online']
+    }
+
+    @staticmethod
+    def detect_format(content_type, filename=None):
+        """Guess payload format from a content type or file name"""
+        content_type = (content_type or '').lower()
+        filename = (filename or '').lower()
+
+        if 'csv' in content_type or filename.endswith('.csv'):
+            return 'csv'
+        if 'ndjson' in content_type or 'jsonl' in content_type or filename.endswith(('.ndjson', '.jsonl')):
+            return 'ndjson'
+        return 'json'
+
+    @staticmethod
+    def parse_records(stream, data_format):
+        """Yield raw records from a text stream in JSON array, CSV or NDJSON format"""
+        if data_format not in ImportService.SUPPORTED_FORMATS:
+            raise ValueError(f'Unsupported format: {data_format}')
+
+        if data_format == 'json':
+            try:
+                records = json.load(stream)
+            except json.JSONDecodeError:
+                raise ValueError('Invalid JSON payload')
+            if not isinstance(records, list):
+                raise ValueError('JSON payload must be an array of listings')
+            yield from records
+        elif data_format == 'csv':
+            yield from csv.DictReader(stream)
+        else:
+            for line_number, line in enumerate(stream, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # Keep row numbering aligned; validation reports the error
+                    yield {'_parse_error': f'Invalid JSON on line {line_number}'}
+
+    @staticmethod
+    def parse_request(flask_request):
+        """Yield raw records from the body of an import request"""
+        data_format = flask_request.args.get('format') or \
+            ImportService.detect_format(flask_request.content_type)
+
+        if data_format == 'json':
+            records = flask_request.get_json(silent=True)
+            if not isinstance(records, list):
+                raise ValueError('JSON payload must be an array of listings')
+            return iter(records)
+
+        stream = io.TextIOWrapper(flask_request.stream, encoding='utf-8')
+        return ImportService.parse_records(stream, data_format)
+
+    @staticmethod
+    def _to_bool(value):
+        if isinstance(value, str):
+            return value.strip().lower() in ('true', '1', 'yes', 'y')
+        return bool(value)
+
+    @staticmethod
+    def _to_optional(value, cast):
+        if value is None or value == '':
+            return None
+        return cast(value)
+
+    @staticmethod
+    def _to_images(value):
+        if value is None or value == '':
+            return None
+        if isinstance(value, str):
+            try:
+                return json.loads(value)
+            except json.JSONDecodeError:
+                return [path.strip() for path in value.split('|') if path.strip()]
+        return value
+
+    @staticmethod
+    def validate_record(item_type, record, user_id):
+        """Validate a raw record against the cached taxonomy and build an insert mapping"""
+        if not isinstance(record, dict):
+            raise ValueError('Listing must be an object')
+        if '_parse_error' in record:
+            raise ValueError(record['_parse_error'])
+
+        for field in ImportService.REQUIRED_FIELDS[item_type]:
+            if record.get(field) in (None, ''):
+                raise ValueError(f'{field} is required')
+
+        try:
+            category_id = int(record['category_id'])
+            subcategory_id = ImportService._to_optional(record.get('subcategory_id'), int)
+            estimated_value = float(record['estimated_value'])
+            latitude = ImportService._to_optional(record.get('latitude'), float)
+            longitude = ImportService._to_optional(record.get('longitude'), float)
+        except (TypeError, ValueError):
+            raise ValueError('Invalid numeric value')
+
+        error = TaxonomyService.validate_category(item_type, category_id, subcategory_id)
+        if error:
+            raise ValueError(error)
+
+        if latitude is not None and longitude is not None and \
+                not GeocodingService.validate_coordinates(latitude, longitude):
+            raise ValueError('Invalid coordinates')
+
+        mapping = {
+            'name': record['name'],
+            'description': record.get('description') or None,
+            'estimated_value': estimated_value,
+            'images': ImportService._to_images(record.get('images')),
+            'user_id': user_id,
+            'category_id': category_id,
+            'subcategory_id': subcategory_id
+        }
+
+        if item_type == 'product':
+            try:
+                quantity = ImportService._to_optional(record.get('quantity'), int)
+            except (TypeError, ValueError):
+                raise ValueError('Invalid numeric value')
+            if quantity is None:
+                quantity = 1
+
+            mapping.update({
+                'condition': record['condition'],
+                'quantity': quantity,
+                'address': record['address'],
+                'latitude': latitude,
+                'longitude': longitude,
+                'availability_status': 'available' if quantity > 0 else 'unavailable'
+            })
+        else:
+            is_online = ImportService._to_bool(record['is_online'])
+            if not is_online and not record.get('address'):
+                raise ValueError('Physical services must have an address')
+
+            mapping.update({
+                'is_online': is_online,
+                'address': record.get('address') if not is_online else None,
+                'latitude': latitude if not is_online else None,
+                'longitude': longitude if not is_online else None
+            })
+
+        return mapping
+
+    @staticmethod
+    def _normalize_address(address):
+        return ' '.join(address.split()).lower()
+
+    @staticmethod
+    def _geocode_batch(mappings, geocode_cache):
+        """Fill missing coordinates, geocoding each distinct address once and concurrently"""
+        pending = []
+        missing = {}  # normalized address -> address to geocode
+        for mapping in mappings:
+            if not mapping.get('address'):
+                continue
+            if mapping['latitude'] is not None and mapping['longitude'] is not None:
+                continue
+
+            key = ImportService._normalize_address(mapping['address'])
+            record_cache('geocoding', key in geocode_cache or key in missing)
+            if key not in geocode_cache:
+                missing.setdefault(key, mapping['address'])
+            pending.append((mapping, key))
+
+        if missing:
+            results = GeocodingService.geocode_many(list(missing.values()))
+            geocode_cache.update(zip(missing, results))
+
+        for mapping, key in pending:
+            mapping['latitude'], mapping['longitude'] = geocode_cache[key]
+
+    @staticmethod
+    def _execute_insert(item_type, mappings):
+        """Insert rows with one executemany and record them in the outbox"""
+        model = ImportService.MODELS[item_type]
+        result = db.session.execute(insert(model).returning(model.id), mappings)
+        OutboxService.record(db.session, item_type, result.scalars().all(), 'insert')
+        db.session.commit()
+
+    @staticmethod
+    def _insert_batch(item_type, batch, errors):
+        """Insert a batch with one executemany; isolate failing rows if the batch fails"""
+        try:
+            ImportService._execute_insert(item_type, [mapping for _, mapping in batch])
+            return len(batch)
+        except Exception as e:
+            db.session.rollback()
+            logging.warning(f"Bulk insert of {len(batch)} rows failed, retrying row by row: {e}")
+
+        created = 0
+        for row_number, mapping in batch:
+            try:
+                ImportService._execute_insert(item_type, [mapping])
+                created += 1
+            except Exception as e:
+                db.session.rollback()
+                errors.append({'row': row_number, 'message': 'Database error inserting listing'})
+                logging.error(f"Error importing row {row_number}: {e}")
+        return created
+
+    @staticmethod
+    def import_listings(item_type, user_id, records, geocode=True, batch_size=None):
+        """Validate and insert listings in batched transactions with per-row error reporting"""
+        if item_type not in ImportService.MODELS:
+            raise ValueError(f'Unknown item type: {item_type}')
+
+        batch_size = batch_size or ImportService.BATCH_SIZE
+
+        created = 0
+        total = 0
+        errors = []
+        geocode_cache = {}
+        batch = []
+
+        def flush(batch):
+            if geocode:
+                ImportService._geocode_batch([mapping for _, mapping in batch], geocode_cache)
+            return ImportService._insert_batch(item_type, batch, errors)
+
+        for row_number, record in enumerate(records, start=1):
+            total += 1
+            try:
+                batch.append((row_number, ImportService.validate_record(item_type, record, user_id)))
+            except ValueError as e:
+                errors.append({'row': row_number, 'message': str(e)})
+                continue
+
+            if len(batch) >= batch_size:
+                created += flush(batch)
+                batch = []
+
+        if batch:
+            created += flush(batch)
+
+        return {
+            'total': total,
+            'created': created,
+            'failed': total - created,
+            'errors': errors
+        }
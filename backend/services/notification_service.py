@@ -0,0 +1,70 @@
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import object_session
+from backend.models.product import Product
+from backend.models.service import Service
+from backend.models.favorite import Favorite
+from backend.models.trade import Trade
+from backend.services.event_bus import queue_event
+
+class NotificationService:
+    """Turns trade and listing changes into per-user events on the event bus"""
+
+    TRADE_EVENTS = {
+        'pending': 'trade.proposed',
+        'accepted': 'trade.accepted',
+        'declined': 'trade.declined',
+        'cancelled': 'trade.cancelled'
+    }
+
+    @staticmethod
+    def queue_trade_event(session, trade_id, status, proposer_id, receiver_id):
+        """Notify the users on both sides of a trade after commit (proposals go to the receiver only)"""
+        data = {
+            'trade_id': trade_id,
+            'status': status,
+            'proposer_id': proposer_id,
+            'receiver_id': receiver_id
+        }
+        event_type = NotificationService.TRADE_EVENTS.get(status, 'trade.updated')
+
+        queue_event(session, receiver_id, event_type, data)
+        if status != 'pending':
+            queue_event(session, proposer_id, event_type, data)
+
+    @staticmethod
+    def queue_trade_rows(session, rows, status):
+        """Queue events for trade rows changed by Core statements (which skip mapper events)"""
+        for row in rows:
+            NotificationService.queue_trade_event(session, row.id, status, row.proposer_id, row.receiver_id)
+
+
+@event.listens_for(Trade, 'after_insert')
+def _trade_proposed(mapper, connection, target):
+    NotificationService.queue_trade_event(
+        object_session(target), target.id, target.status or 'pending',
+        target.proposer_id, target.receiver_id
+    )
+
+
+@event.listens_for(Trade, 'after_update')
+def _trade_status_changed(mapper, connection, target):
+    if inspect(target).attrs.status.history.has_changes():
+        NotificationService.queue_trade_event(
+            object_session(target), target.id, target.status,
+            target.proposer_id, target.receiver_id
+        )
+
+
+@event.listens_for(Favorite, 'after_insert')
+def _listing_favorited(mapper, connection, target):
+    if target.product_id:
+        table, item_type, item_id = Product.__table__, 'product', target.product_id
+    else:
+        table, item_type, item_id = Service.__table__, 'service', target.service_id
+
+    owner_id = connection.execute(select(table.c.user_id).where(table.c.id == item_id)).scalar()
+    if owner_id and owner_id != target.user_id:
+        queue_event(object_session(target), owner_id, 'listing.favorited', {
+            'type': item_type,
+            'id': item_id
+        })
@@ -0,0 +1,190 @@
+from sqlalchemy import event, insert, or_
+from sqlalchemy.orm import Session
+from datetime import datetime, timedelta
+from backend.app import db
+from backend.models.outbox import OutboxEvent
+from backend.models.product import Product, ProductCategory, ProductSubcategory
+from backend.models.service import Service, ServiceCategory, ServiceSubcategory
+from backend.models.trade import Trade
+from backend.models.favorite import Favorite
+
+class OutboxService:
+    """Transactional outbox of listing mutations and the change feed that reads it.
+
+    Rows are written on the same connection as the change itself, so an
+    entry exists if and only if the change committed.
+    """
+
+    TRACKED_MODELS = {
+        Product: 'product',
+        Service: 'service',
+        Trade: 'trade',
+        Favorite: 'favorite'
+    }
+    ENTITY_TYPES = list(TRACKED_MODELS.values())
+    # Changed without an outbox entry, but still reported to commit listeners
+    TAXONOMY_MODELS = (ProductCategory, ProductSubcategory, ServiceCategory, ServiceSubcategory)
+    COMMIT_LISTENERS = []  # Called with the set of entity types changed by each commit
+    DEFAULT_LIMIT = 500
+    MAX_LIMIT = 5000
+    RETENTION = timedelta(days=7)
+
+    @staticmethod
+    def on_commit(listener):
+        """Register a callable receiving the entity types changed by each committed transaction"""
+        if listener not in OutboxService.COMMIT_LISTENERS:
+            OutboxService.COMMIT_LISTENERS.append(listener)
+
+    @staticmethod
+    def _mark_changed(session, entity_types):
+        session.info.setdefault('changed_entity_types', set()).update(entity_types)
+
+    @staticmethod
+    def record(session, entity_type, entity_ids, operation):
+        """Record listing changes made with Core statements, which bypass the flush hook"""
+        rows = [
+            {
+                'entity_type': entity_type,
+                'entity_id': entity_id,
+                'operation': operation,
+                'created_at': datetime.utcnow()
+            }
+            for entity_id in entity_ids if entity_id
+        ]
+        if rows:
+            session.execute(insert(OutboxEvent.__table__), rows)
+            OutboxService._mark_changed(session, [entity_type])
+
+    @staticmethod
+    def record_trades(session, trades, operation):
+        """Record Core-statement changes to trades, visible to both parties.
+
+        Takes trade objects or rows carrying id, proposer_id, receiver_id and
+        the offered/requested item ids, whose listing types are marked changed
+        as well since their pending_trade_count moves.
+        """
+        rows = [
+            {
+                'entity_type': 'trade',
+                'entity_id': trade.id,
+                'operation': operation,
+                'user_id': trade.proposer_id,
+                'other_user_id': trade.receiver_id,
+                'created_at': datetime.utcnow()
+            }
+            for trade in trades
+        ]
+        if rows:
+            session.execute(insert(OutboxEvent.__table__), rows)
+            OutboxService._mark_changed(session, {'trade'}.union(*map(_trade_listing_types, trades)))
+
+    @staticmethod
+    def read_changes(since=0, limit=None, entity_types=None, user_id=None):
+        """Return outbox entries with a sequence number greater than since, oldest first.
+
+        With user_id, trade and favorite entries of other users are left out.
+
+        On databases with concurrent writers a transaction can commit after one
+        with a higher sequence number, so consumers should re-read a small
+        window behind their position rather than trusting gaps.
+        """
+        limit = min(limit or OutboxService.DEFAULT_LIMIT, OutboxService.MAX_LIMIT)
+
+        query = OutboxEvent.query.filter(OutboxEvent.id > since)
+        if entity_types:
+            query = query.filter(OutboxEvent.entity_type.in_(entity_types))
+        if user_id is not None:
+            query = query.filter(or_(
+                OutboxEvent.user_id.is_(None),
+                OutboxEvent.user_id == user_id,
+                OutboxEvent.other_user_id == user_id
+            ))
+
+        return query.order_by(OutboxEvent.id).limit(limit).all()
+
+    @staticmethod
+    def prune(older_than=None):
+        """Delete entries older than the retention period; returns rows removed"""
+        cutoff = datetime.utcnow() - (older_than or OutboxService.RETENTION)
+        removed = OutboxEvent.query.filter(OutboxEvent.created_at < cutoff).delete()
+        db.session.commit()
+        return removed
+
+
+def _tracked_type(instance):
+    return OutboxService.TRACKED_MODELS.get(type(instance))
+
+
+def _trade_listing_types(trade):
+    """Listing types whose pending_trade_count a change to the trade moves"""
+    types = set()
+    if trade.offered_product_id or trade.requested_product_id:
+        types.add('product')
+    if trade.offered_service_id or trade.requested_service_id:
+        types.add('service')
+    return types
+
+
+def _audience(instance):
+    """The (user_id, other_user_id) allowed to see an entry; (None, None) when public"""
+    if isinstance(instance, Trade):
+        return instance.proposer_id, instance.receiver_id
+    if isinstance(instance, Favorite):
+        return instance.user_id, None
+    return None, None
+
+
+@event.listens_for(Session, 'after_flush')
+def _record_flushed_changes(session, flush_context):
+    rows = []
+    changed = set()
+    now = datetime.utcnow()
+
+    def add(instances, operation):
+        for instance in instances:
+            if isinstance(instance, OutboxService.TAXONOMY_MODELS):
+                changed.add('taxonomy')
+                continue
+            entity_type = _tracked_type(instance)
+            if entity_type is None:
+                continue
+            if operation == 'update' and not session.is_modified(instance, include_collections=False):
+                continue
+            user_id, other_user_id = _audience(instance)
+            rows.append({
+                'entity_type': entity_type,
+                'entity_id': instance.id,
+                'operation': operation,
+                'user_id': user_id,
+                'other_user_id': other_user_id,
+                'created_at': now
+            })
+            if isinstance(instance, Favorite):
+                # favorite_count orders sort=popular listings
+                changed.add('product' if instance.product_id else 'service')
+            elif isinstance(instance, Trade):
+                # pending_trade_count orders sort=most_wanted listings
+                changed.update(_trade_listing_types(instance))
+
+    add(session.new, 'insert')
+    add(session.dirty, 'update')
+    add(session.deleted, 'delete')
+
+    if rows:
+        session.connection().execute(insert(OutboxEvent.__table__), rows)
+        changed.update(row['entity_type'] for row in rows)
+    if changed:
+        OutboxService._mark_changed(session, changed)
+
+
+@event.listens_for(Session, 'after_commit')
+def _notify_commit_listeners(session):
+    entity_types = session.info.pop('changed_entity_types', None)
+    if entity_types:
+        for listener in OutboxService.COMMIT_LISTENERS:
+            listener(entity_types)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_changed_types(session):
+    session.info.pop('changed_entity_types', None)
@@ -0,0 +1,80 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from werkzeug.security import check_password_hash, generate_password_hash
+from config import Config
+import os
+import threading
+
+
+class HashingBusy(Exception):
+    """Raised when the password hashing pool has no room for another job"""
+
+
+class PasswordHasher:
+    """Hashes and verifies passwords on a small per-process thread pool.
+
+    scrypt and PBKDF2 are CPU-bound by design. Capping how many run at once
+    (PASSWORD_HASH_WORKERS) keeps a burst of logins from taking the CPU away
+    from every other request. Up to PASSWORD_HASH_QUEUE_SIZE jobs wait for a
+    worker; beyond that HashingBusy is raised instead of queueing without limit.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._slots = None
+        self._pid = None
+
+    def _run(self, function, *args):
+        with self._lock:
+            # Pool threads do not survive a fork
+            if self._pid != os.getpid():
+                self._executor = ThreadPoolExecutor(Config.PASSWORD_HASH_WORKERS, thread_name_prefix='password-hash')
+                self._slots = threading.BoundedSemaphore(Config.PASSWORD_HASH_WORKERS + Config.PASSWORD_HASH_QUEUE_SIZE)
+                self._pid = os.getpid()
+            executor, slots = self._executor, self._slots
+
+        if not slots.acquire(blocking=False):
+            raise HashingBusy()
+        try:
+            future = executor.submit(function, *args)
+        except BaseException:
+            slots.release()
+            raise
+        future.add_done_callback(lambda _: slots.release())
+        return future.result()
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, Config.PASSWORD_HASH_METHOD, Config.PASSWORD_SALT_LENGTH)
+
+    def verify(self, password_hash, password):
+        return self._run(check_password_hash, password_hash, password)
+
+    def verify_unknown(self, password):
+        """Spend as long as verify() for an account that does not exist; always False.
+
+        Login answers for unknown emails would otherwise come back without
+        hashing, revealing which emails are registered.
+        """
+        self.verify(_dummy_hash(Config.PASSWORD_HASH_METHOD, Config.PASSWORD_SALT_LENGTH), password)
+        return False
+
+    @staticmethod
+    def needs_rehash(password_hash):
+        """Whether a stored hash was made with other parameters than PASSWORD_HASH_METHOD"""
+        return password_hash.split('$', 1)[0] != _stored_method(Config.PASSWORD_HASH_METHOD)
+
+
+@lru_cache(maxsize=None)
+def _dummy_hash(method, salt_length):
+    """A hash made with the configured parameters that no password matches"""
+    return generate_password_hash(os.urandom(16).hex(), method, salt_length)
+
+
+@lru_cache(maxsize=None)
+def _stored_method(method):
+    """The method prefix Werkzeug stores for a configured method, e.g. 'scrypt' -> 'scrypt:32768:8:1'"""
+    return generate_password_hash('', method, salt_length=1).split('$', 1)[0]
+
+
+password_hasher = PasswordHasher()
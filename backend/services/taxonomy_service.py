@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta
+from backend.models.product import ProductCategory, ProductSubcategory
+from backend.models.service import ServiceCategory, ServiceSubcategory
+from backend.services.outbox_service import OutboxService
+import threading
+
+class TaxonomyService:
+
+    CACHE_DURATION = timedelta(minutes=10)  # Categories change very rarely
+
+    MODELS = {
+        'product': (ProductCategory, ProductSubcategory),
+        'service': (ServiceCategory, ServiceSubcategory)
+    }
+
+    _cache = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _load_taxonomy(item_type):
+        """Load categories and subcategories for an item type in two queries"""
+        category_model, subcategory_model = TaxonomyService.MODELS[item_type]
+
+        taxonomy = {}
+        for category in category_model.query.all():
+            taxonomy[category.id] = {
+                'id': category.id,
+                'name': category.name,
+                'subcategories': {}
+            }
+
+        for subcategory in subcategory_model.query.all():
+            if subcategory.category_id in taxonomy:
+                taxonomy[subcategory.category_id]['subcategories'][subcategory.id] = subcategory.name
+
+        return taxonomy
+
+    @staticmethod
+    def get_taxonomy(item_type):
+        """Get cached taxonomy for 'product' or 'service' keyed by category id"""
+        if item_type not in TaxonomyService.MODELS:
+            raise ValueError(f'Unknown item type: {item_type}')
+
+        cached = TaxonomyService._cache.get(item_type)
+        if cached and datetime.now() - cached['timestamp'] < TaxonomyService.CACHE_DURATION:
+            return cached['taxonomy']
+
+        with TaxonomyService._lock:
+            taxonomy = TaxonomyService._load_taxonomy(item_type)
+            TaxonomyService._cache[item_type] = {
+                'timestamp': datetime.now(),
+                'taxonomy': taxonomy
+            }
+
+        return taxonomy
+
+    @staticmethod
+    def validate_category(item_type, category_id, subcategory_id=None):
+        """Return an error message if the category/subcategory pair is invalid, otherwise None"""
+        taxonomy = TaxonomyService.get_taxonomy(item_type)
+
+        try:
+            category_id = int(category_id)
+            subcategory_id = int(subcategory_id) if subcategory_id else None
+        except (TypeError, ValueError):
+            return 'Invalid category'
+
+        category = taxonomy.get(category_id)
+        if not category:
+            return 'Invalid category'
+
+        if subcategory_id and subcategory_id not in category['subcategories']:
+            return 'Invalid subcategory'
+
+        return None
+
+    @staticmethod
+    def warm():
+        """Load every taxonomy into the cache"""
+        for item_type in TaxonomyService.MODELS:
+            TaxonomyService.get_taxonomy(item_type)
+
+    @staticmethod
+    def invalidate():
+        """Drop cached taxonomies; runs after every commit that edits categories"""
+        with TaxonomyService._lock:
+            TaxonomyService._cache.clear()
+
+
+def _invalidate_on_commit(entity_types):
+    if 'taxonomy' in entity_types:
+        TaxonomyService.invalidate()
+
+
+OutboxService.on_commit(_invalidate_on_commit)
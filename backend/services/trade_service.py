@@ -0,0 +1,199 @@
+from sqlalchemy import case, or_, select, update
+from sqlalchemy.exc import OperationalError
+from backend.app import db
+from backend.models.product import Product
+from backend.models.trade import Trade
+from backend.services.counter_service import CounterService
+from backend.services.notification_service import NotificationService
+from backend.services.outbox_service import OutboxService
+import logging
+
+class TradeError(Exception):
+    """Trade state change that cannot be applied; carries the HTTP status to return"""
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+class TradeService:
+
+    UNAVAILABLE_MESSAGE = 'Item is no longer available'
+
+    @staticmethod
+    def _get_trade(trade_id):
+        trade = db.session.get(Trade, trade_id)
+        if not trade:
+            raise TradeError('Trade not found', 404)
+        return trade
+
+    @staticmethod
+    def _set_status(trade_id, status, response_message=None):
+        """Move a pending trade to a new status; returns False if it was no longer pending"""
+        values = {'status': status}
+        if response_message is not None:
+            values['response_message'] = response_message
+
+        result = db.session.execute(
+            update(Trade.__table__)
+            .where(Trade.__table__.c.id == trade_id, Trade.__table__.c.status == 'pending')
+            .values(**values)
+        )
+        return result.rowcount == 1
+
+    @staticmethod
+    def _reserve_product(product_id):
+        """Take one unit of a product if any is left; returns False when out of stock"""
+        products = Product.__table__
+        remaining = products.c.quantity - 1
+
+        result = db.session.execute(
+            update(products)
+            .where(products.c.id == product_id, products.c.quantity > 0)
+            .values(
+                quantity=remaining,
+                availability_status=case((remaining <= 0, 'unavailable'), else_='available')
+            )
+        )
+        return result.rowcount == 1
+
+    @staticmethod
+    def _decline_siblings(trade_id, product_ids):
+        """Decline every other pending trade involving sold-out products in one statement"""
+        trades = Trade.__table__
+        involves_products = or_(
+            trades.c.offered_product_id.in_(product_ids),
+            trades.c.requested_product_id.in_(product_ids)
+        )
+
+        siblings = db.session.execute(
+            select(
+                trades.c.id, trades.c.proposer_id, trades.c.receiver_id,
+                trades.c.offered_product_id, trades.c.requested_product_id,
+                trades.c.offered_service_id, trades.c.requested_service_id
+            )
+            .where(trades.c.status == 'pending', trades.c.id != trade_id, involves_products)
+            .with_for_update()
+        ).all()
+
+        if not siblings:
+            return []
+
+        db.session.execute(
+            update(trades)
+            .where(trades.c.id.in_([row.id for row in siblings]), trades.c.status == 'pending')
+            .values(status='declined', response_message=TradeService.UNAVAILABLE_MESSAGE)
+        )
+        return siblings
+
+    @staticmethod
+    def _refresh_counters(rows):
+        product_ids = set()
+        service_ids = set()
+        for row in rows:
+            product_ids.update([row.offered_product_id, row.requested_product_id])
+            service_ids.update([row.offered_service_id, row.requested_service_id])
+
+        CounterService.recompute('product', product_ids)
+        CounterService.recompute('service', service_ids)
+
+    @staticmethod
+    def accept_trade(trade_id, user_id, response_message=None):
+        """Accept a pending trade atomically, reserving product quantity and
+        auto-declining sibling trades on items that sold out"""
+        trade = TradeService._get_trade(trade_id)
+
+        if trade.receiver_id != user_id:
+            raise TradeError('Unauthorized', 403)
+        if not trade.can_be_accepted():
+            raise TradeError('Trade is no longer pending', 409)
+
+        product_ids = [
+            product_id for product_id in (trade.offered_product_id, trade.requested_product_id)
+            if product_id
+        ]
+
+        try:
+            # Conditional UPDATEs: concurrent accepts serialize on the row and
+            # only the ones whose WHERE still matches take effect
+            if not TradeService._set_status(trade_id, 'accepted', response_message):
+                raise TradeError('Trade is no longer pending', 409)
+
+            # Lock products in id order so two accepts on the same pair cannot deadlock
+            for product_id in sorted(product_ids):
+                if not TradeService._reserve_product(product_id):
+                    raise TradeError(TradeService.UNAVAILABLE_MESSAGE, 409)
+
+            sold_out = []
+            if product_ids:
+                sold_out = db.session.execute(
+                    select(Product.__table__.c.id).where(
+                        Product.__table__.c.id.in_(product_ids),
+                        Product.__table__.c.quantity <= 0
+                    )
+                ).scalars().all()
+
+            declined = TradeService._decline_siblings(trade_id, sold_out) if sold_out else []
+
+            TradeService._refresh_counters([trade, *declined])
+            OutboxService.record_trades(db.session, [trade, *declined], 'update')
+            OutboxService.record(db.session, 'product', product_ids, 'update')
+            NotificationService.queue_trade_rows(db.session, [trade], 'accepted')
+            NotificationService.queue_trade_rows(db.session, declined, 'declined')
+            db.session.commit()
+
+        except TradeError:
+            db.session.rollback()
+            raise
+        except OperationalError as e:
+            db.session.rollback()
+            logging.warning(f"Database busy accepting trade {trade_id}: {e}")
+            raise TradeError('Trade is busy, please retry', 503)
+
+        db.session.refresh(trade)
+        return trade, [row.id for row in declined]
+
+    @staticmethod
+    def decline_trade(trade_id, user_id, response_message=None):
+        """Decline a pending trade (receiver only)"""
+        trade = TradeService._get_trade(trade_id)
+
+        if trade.receiver_id != user_id:
+            raise TradeError('Unauthorized', 403)
+
+        return TradeService._close_trade(trade, 'declined', response_message)
+
+    @staticmethod
+    def cancel_trade(trade_id, user_id):
+        """Cancel a pending trade (proposer only)"""
+        trade = TradeService._get_trade(trade_id)
+
+        if trade.proposer_id != user_id:
+            raise TradeError('Unauthorized', 403)
+        if not trade.can_be_cancelled():
+            raise TradeError('Trade is no longer pending', 409)
+
+        return TradeService._close_trade(trade, 'cancelled')
+
+    @staticmethod
+    def _close_trade(trade, status, response_message=None):
+        try:
+            if not TradeService._set_status(trade.id, status, response_message):
+                raise TradeError('Trade is no longer pending', 409)
+
+            TradeService._refresh_counters([trade])
+            OutboxService.record_trades(db.session, [trade], 'update')
+            NotificationService.queue_trade_rows(db.session, [trade], status)
+            db.session.commit()
+
+        except TradeError:
+            db.session.rollback()
+            raise
+        except OperationalError as e:
+            db.session.rollback()
+            logging.warning(f"Database busy updating trade {trade.id}: {e}")
+            raise TradeError('Trade is busy, please retry', 503)
+
+        db.session.refresh(trade)
+        return trade
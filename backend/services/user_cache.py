@@ -0,0 +1,94 @@
+from flask import current_app, g
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import event
+from sqlalchemy.orm import Session, make_transient_to_detached
+from backend.app import db
+from backend.models.user import User
+from backend.services.cache_service import MemoryCacheBackend, shared_versions
+from backend.utils.metrics import record_cache
+from config import Config
+
+
+class UserCache:
+    """Recently authenticated users, kept as detached copies keyed by id.
+
+    A hit is merged into the request's session with load=False, which issues
+    no query. Entries are keyed by a per-user version from shared_versions(),
+    bumped once a transaction that updated or deleted the user through the
+    ORM commits, so no worker serves the old row after that.
+    """
+
+    def __init__(self, max_entries=1000):
+        self._backend = MemoryCacheBackend(max_entries)
+
+    def get(self, user_id, ttl):
+        if ttl <= 0:
+            record_cache('users', False)
+            return db.session.get(User, user_id)
+
+        # Read before the row, so one read before a concurrent commit is cached under the old version
+        version, = shared_versions().get_versions([f'user:{user_id}'])
+        cached = self._backend.get((user_id, version))
+        record_cache('users', cached is not None)
+        if cached is not None:
+            return db.session.merge(cached, load=False)
+
+        user = db.session.get(User, user_id)
+        if user is not None and not db.session.is_modified(user):
+            self._backend.set((user_id, version), _detached_copy(user), ttl)
+        return user
+
+    def evict(self, user_ids):
+        shared_versions().bump_versions([f'user:{user_id}' for user_id in sorted(user_ids)])
+
+    def clear(self):
+        self._backend.clear()
+
+
+def _detached_copy(user):
+    """A copy holding the user's column values, never attached to any session"""
+    copy = User(**{attribute.key: getattr(user, attribute.key) for attribute in User.__mapper__.column_attrs})
+    make_transient_to_detached(copy)
+    return copy
+
+
+user_cache = UserCache(Config.USER_CACHE_MAX_ENTRIES)
+
+
+def get_current_user():
+    """The user of the request's JWT, or None if it no longer exists.
+
+    Looked up on first use and kept for the rest of the request. Unlike a
+    user_lookup_loader, which runs on every @jwt_required request, views
+    that only need the identity never load the user.
+    """
+    try:
+        user_id = int(get_jwt_identity())
+    except (TypeError, ValueError):
+        return None
+
+    # g outlives the request when an app context was pushed around it
+    loaded = g.get('_current_user')
+    if loaded is None or loaded[0] != user_id:
+        loaded = g._current_user = (user_id, user_cache.get(user_id, current_app.config.get('USER_CACHE_TTL', 60)))
+    return loaded[1]
+
+
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def _queue_eviction(mapper, connection, target):
+    session = Session.object_session(target)
+    if session is not None:
+        session.info.setdefault('changed_user_ids', set()).add(target.id)
+
+
+@event.listens_for(Session, 'after_commit')
+def _evict_changed_users(session):
+    user_ids = session.info.pop('changed_user_ids', None)
+    if user_ids:
+        user_cache.evict(user_ids)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_changed_users(session):
+    session.info.pop('changed_user_ids', None)
@@ -0,0 +1,56 @@
+import sys
+import os
+import argparse
+import sqlite3
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.app import create_app, db
+from backend.utils.database import REPLICA_BIND
+
+def copy_database(primary_path, replica_path):
+    """Copy a consistent snapshot of the primary over the replica, even while the app writes"""
+    source = sqlite3.connect(primary_path)
+    target = sqlite3.connect(replica_path, timeout=30)
+    try:
+        source.backup(target)
+    finally:
+        target.close()
+        source.close()
+
+def run_sync(interval, once=False):
+    """Stand-in for replication when DATABASE_URL and DATABASE_REPLICA_URL are SQLite files"""
+    app = create_app()
+    with app.app_context():
+        replica = db.engines.get(REPLICA_BIND)
+        if replica is None:
+            print("DATABASE_REPLICA_URL is not set")
+            return False
+
+        primary = db.engines[None]
+        if primary.dialect.name != 'sqlite' or replica.dialect.name != 'sqlite':
+            print("Only SQLite files can be synced; use the database's own replication otherwise")
+            return False
+
+        # Flask-SQLAlchemy has resolved relative paths against the instance folder
+        primary_path, replica_path = primary.url.database, replica.url.database
+
+    print(f"Syncing {primary_path} -> {replica_path} every {interval}s")
+    while True:
+        started = time.perf_counter()
+        copy_database(primary_path, replica_path)
+        print(f"Replica updated in {(time.perf_counter() - started) * 1000:.0f}ms")
+        if once:
+            return True
+        time.sleep(interval)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Copy the primary SQLite database to the replica file')
+    parser.add_argument('--interval', type=float, default=2, help='Seconds between copies, i.e. the simulated lag')
+    parser.add_argument('--once', action='store_true', help='Copy once and exit')
+    args = parser.parse_args()
+
+    try:
+        sys.exit(0 if run_sync(args.interval, args.once) else 1)
+    except KeyboardInterrupt:
+        pass
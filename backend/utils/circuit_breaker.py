@@ -0,0 +1,79 @@
+from backend.utils.metrics import metrics
+from config import Config
+import threading
+import time
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider whose circuit is open"""
+
+class CircuitBreaker:
+    """Stops calling an upstream provider that keeps failing.
+
+    After failure_threshold consecutive failures the circuit opens and calls
+    fail fast. Once reset_timeout seconds have passed a single trial call is
+    let through; its outcome closes the circuit or opens it again.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, name, failure_threshold=5, reset_timeout=30):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Whether a call may go out now; every allowed call must be followed by record_*"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                return True
+            # Open, or half-open with the trial call still in flight
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def release(self):
+        """End an allowed call that says nothing about the provider, such as one the caller abandoned"""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                # The reset timeout has passed, so the next call becomes the trial
+                self.state = self.OPEN
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+def circuit_breaker(provider):
+    """The process-wide breaker of an upstream provider"""
+    with _breakers_lock:
+        breaker = _breakers.get(provider)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                provider, Config.CIRCUIT_BREAKER_FAILURES, Config.CIRCUIT_BREAKER_RESET_SECONDS
+            )
+            _breakers[provider] = breaker
+        return breaker
+
+def _circuit_gauges():
+    return [
+        ('outbound_circuit_open', {'provider': name}, 0 if breaker.state == CircuitBreaker.CLOSED else 1)
+        for name, breaker in list(_breakers.items())
+    ]
+
+metrics.describe('outbound_circuit_open', 'gauge', 'Whether calls to an upstream provider are short-circuited')
+metrics.register_collector(_circuit_gauges)
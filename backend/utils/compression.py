@@ -0,0 +1,106 @@
+from flask import current_app, request
+import gzip
+import zlib
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'application/x-ndjson',
+    'text/csv',
+    'text/plain',
+    'text/html',
+    'text/css',
+    'application/javascript'
+}
+
+# Dynamic responses favour speed; precompressed cache variants are paid once and favour size
+LEVELS = {
+    'gzip': {'dynamic': 6, 'static': 9},
+    'br': {'dynamic': 4, 'static': 11}
+}
+
+def supported_encodings():
+    return ['br', 'gzip'] if brotli is not None else ['gzip']
+
+def negotiate_encoding():
+    """Best encoding accepted by the client, or None when compression is disabled or not accepted"""
+    if not current_app.config.get('COMPRESSION_ENABLED', True):
+        return None
+
+    best, best_quality = None, 0
+    for encoding in supported_encodings():
+        quality = request.accept_encodings[encoding]
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+def compress(data, encoding, mode='dynamic'):
+    level = LEVELS[encoding][mode]
+    if encoding == 'br':
+        return brotli.compress(data, quality=level)
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+def _compress_stream(chunks, encoding):
+    """Compress an iterable of chunks, flushing after each so streaming clients see data promptly"""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=LEVELS['br']['dynamic'])
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            yield compressor.process(chunk) + compressor.flush()
+        yield compressor.finish()
+    else:
+        compressor = zlib.compressobj(LEVELS['gzip']['dynamic'], zlib.DEFLATED, 31)  # 31: gzip container
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        yield compressor.flush()
+
+def mark_encoded(response, encoding):
+    """Set the headers of a response whose body is encoded"""
+    response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+
+    # The encoded body differs byte-wise, so a strong validator would be wrong
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+def is_compressible(response):
+    if response.status_code != 200 or 'Content-Encoding' in response.headers:
+        return False
+    if response.direct_passthrough or response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return False
+    return True
+
+def compress_response(response):
+    """after_request hook compressing eligible responses for the negotiated encoding"""
+    if response.mimetype in COMPRESSIBLE_MIMETYPES:
+        response.vary.add('Accept-Encoding')
+    if not is_compressible(response):
+        return response
+
+    encoding = negotiate_encoding()
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        response.response = _compress_stream(response.response, encoding)
+        response.headers.pop('Content-Length', None)
+        return mark_encoded(response, encoding)
+
+    data = response.get_data()
+    if len(data) < current_app.config.get('COMPRESSION_MIN_SIZE', 500):
+        return response
+
+    response.set_data(compress(data, encoding))
+    return mark_encoded(response, encoding)
+
+def init_app(app):
+    app.after_request(compress_response)
@@ -0,0 +1,60 @@
+from datetime import timezone
+from flask import request, make_response
+import hashlib
+
+def make_etag(*parts):
+    """Strong ETag from the values that determine a representation"""
+    raw = '|'.join('' if part is None else str(part) for part in parts)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+def content_etag(body):
+    """Strong ETag from a response body"""
+    return hashlib.sha1(body).hexdigest()
+
+def _http_date(last_modified):
+    """Naive UTC datetimes from the models, truncated to HTTP-date precision"""
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    return last_modified.replace(microsecond=0)
+
+def is_not_modified(etag, last_modified=None):
+    """Evaluate If-None-Match, falling back to If-Modified-Since when no ETag was sent"""
+    if request.if_none_match:
+        # Weak comparison: compressed variants carry the weak form of the same ETag
+        return request.if_none_match.contains_weak(etag)
+
+    if last_modified is not None and request.if_modified_since is not None:
+        return _http_date(last_modified) <= request.if_modified_since
+
+    return False
+
+def add_validators(response, etag, last_modified=None, private=False):
+    """Attach ETag / Last-Modified and require clients to revalidate before reuse"""
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = _http_date(last_modified)
+    response.headers['Cache-Control'] = 'private, no-cache' if private else 'no-cache'
+    if private:
+        response.vary.add('Authorization')
+    return response
+
+def not_modified(etag, last_modified=None, private=False):
+    """Empty 304 response carrying the same validators"""
+    return add_validators(make_response('', 304), etag, last_modified, private)
+
+def conditional_response(response, etag=None, last_modified=None, private=False):
+    """Return a 304 instead of response when the client's copy is current.
+
+    Without an explicit etag the body is hashed, which saves bandwidth but
+    not serialization; callers that can compute the validators cheaply
+    should check is_not_modified before building the body.
+    """
+    response = make_response(response)
+    if response.status_code != 200:
+        return response
+
+    etag = etag or content_etag(response.get_data())
+    if is_not_modified(etag, last_modified):
+        return not_modified(etag, last_modified, private)
+
+    return add_validators(response, etag, last_modified, private)
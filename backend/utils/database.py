@@ -0,0 +1,172 @@
+from flask import current_app, g, has_request_context, request
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from functools import wraps
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+import sqlite3
+
+SQLITE_JOURNAL_MODES = ('delete', 'truncate', 'persist', 'memory', 'wal', 'off')
+SQLITE_SYNCHRONOUS_MODES = ('off', 'normal', 'full', 'extra')
+REPLICA_BIND = 'replica'
+READ_AFTER_HEADER = 'X-Read-After'  # Signed proof of a recent write; clients echo it back
+
+_sqlite_pragmas = []
+
+def is_memory_sqlite(url):
+    url = make_url(url)
+    return url.get_backend_name() == 'sqlite' and (
+        url.database in (None, '', ':memory:') or url.query.get('mode') == 'memory'
+    )
+
+def engine_options(config, url=None):
+    """Pool and driver options for SQLALCHEMY_ENGINE_OPTIONS, from the DB_* settings"""
+    url = url or config['SQLALCHEMY_DATABASE_URI']
+    backend = make_url(url).get_backend_name()
+
+    # Flask-SQLAlchemy gives in-memory SQLite one static connection; pools would lose the data
+    if is_memory_sqlite(url):
+        return {}
+
+    options = {
+        'pool_size': config['DB_POOL_SIZE'],
+        'max_overflow': config['DB_MAX_OVERFLOW'],
+        'pool_timeout': config['DB_POOL_TIMEOUT']
+    }
+
+    # A local SQLite file has no server to drop idle connections
+    if backend != 'sqlite':
+        options['pool_pre_ping'] = config['DB_POOL_PRE_PING']
+        options['pool_recycle'] = config['DB_POOL_RECYCLE']
+
+    timeout = config['DB_STATEMENT_TIMEOUT_MS']
+    if timeout and backend == 'postgresql':
+        options['connect_args'] = {'options': f'-c statement_timeout={timeout}'}
+    elif timeout and backend in ('mysql', 'mariadb'):
+        options['connect_args'] = {'init_command': f'SET SESSION max_execution_time={timeout}'}
+
+    return options
+
+def sqlite_pragmas(config):
+    """PRAGMA statements run on every new SQLite connection"""
+    journal_mode = config['SQLITE_JOURNAL_MODE'].lower()
+    synchronous = config['SQLITE_SYNCHRONOUS'].lower()
+    # PRAGMA values cannot be bound as parameters, so only known words get through
+    if journal_mode not in SQLITE_JOURNAL_MODES:
+        raise ValueError(f"Invalid SQLITE_JOURNAL_MODE: {journal_mode}")
+    if synchronous not in SQLITE_SYNCHRONOUS_MODES:
+        raise ValueError(f"Invalid SQLITE_SYNCHRONOUS: {synchronous}")
+
+    return [
+        f'PRAGMA journal_mode={journal_mode}',
+        f'PRAGMA synchronous={synchronous}',
+        f"PRAGMA busy_timeout={int(config['SQLITE_BUSY_TIMEOUT_MS'])}",
+        f"PRAGMA mmap_size={int(config['SQLITE_MMAP_SIZE'])}"
+    ]
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    for pragma in _sqlite_pragmas:
+        cursor.execute(pragma)
+    cursor.close()
+
+def init_app(app):
+    """Apply engine options and SQLite pragmas; call before db.init_app creates the engines"""
+    # Options set explicitly in SQLALCHEMY_ENGINE_OPTIONS take precedence
+    explicit = app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {}
+    options = engine_options(app.config)
+    connect_args = {**options.get('connect_args', {}), **explicit.get('connect_args', {})}
+    options.update(explicit)
+    if connect_args:
+        options['connect_args'] = connect_args
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+
+    replica_url = app.config.get('DATABASE_REPLICA_URL')
+    if replica_url:
+        binds = app.config.setdefault('SQLALCHEMY_BINDS', {})
+        binds.setdefault(REPLICA_BIND, {'url': replica_url, **engine_options(app.config, replica_url)})
+        app.after_request(_stick_to_primary)
+
+    _sqlite_pragmas[:] = sqlite_pragmas(app.config)
+    if not event.contains(Engine, 'connect', _set_sqlite_pragmas):
+        event.listen(Engine, 'connect', _set_sqlite_pragmas)
+
+def _request_identity():
+    try:
+        verify_jwt_in_request(optional=True)
+        return get_jwt_identity()
+    except Exception:
+        # Invalid or expired tokens are rejected by the view itself
+        return None
+
+def _read_after_serializer():
+    return URLSafeTimedSerializer(current_app.config['SECRET_KEY'], salt='read-your-writes')
+
+def _primary_is_sticky():
+    """Whether the request carries a write token of its own user that is younger than the replica lag"""
+    token = request.headers.get(READ_AFTER_HEADER)
+    if not token:
+        return False
+    try:
+        identity = _read_after_serializer().loads(
+            token, max_age=current_app.config.get('DATABASE_REPLICA_LAG_SECONDS', 5)
+        )
+    except BadSignature:  # Also raised once the token expired
+        return False
+    return identity == str(_request_identity())
+
+def _stick_to_primary(response):
+    """Send a user's reads to the primary for a while after they write, so they see their changes.
+
+    The write time travels with the client in a signed header rather than in
+    process memory, so it holds whichever worker serves the next read.
+    """
+    if request.method in ('GET', 'HEAD', 'OPTIONS') or g.get('read_only_view') or response.status_code >= 400:
+        return response
+
+    try:
+        identity = get_jwt_identity()
+    except RuntimeError:  # The view did not verify a token
+        identity = None
+    if identity is None:
+        return response
+
+    response.headers[READ_AFTER_HEADER] = _read_after_serializer().dumps(str(identity))
+    return response
+
+def reading_from_replica():
+    return has_request_context() and g.get('use_replica', False)
+
+def read_replica(view):
+    """Let a read-only view query the replica, unless its user wrote within the replica lag window"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        # Also marks read-only POSTs such as listing batches, which must not make their user sticky
+        g.read_only_view = True
+        if current_app.config.get('DATABASE_REPLICA_URL') and not _primary_is_sticky():
+            g.use_replica = True
+        return view(*args, **kwargs)
+
+    return wrapper
+
+class RoutingSession(Session):
+    """Session sending the queries of read_replica views to the replica bind.
+
+    Flushes, DML and SELECT ... FOR UPDATE always use the primary, as does any
+    query once the session holds pending changes.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and reading_from_replica() and not self._flushing and not _is_write(clause):
+            replica = self._db.engines.get(REPLICA_BIND)
+            if replica is not None and not (self.new or self.dirty or self.deleted):
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+def _is_write(clause):
+    if clause is None:
+        return False
+    return getattr(clause, 'is_dml', False) or getattr(clause, '_for_update_arg', None) is not None
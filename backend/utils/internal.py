@@ -0,0 +1,21 @@
+from flask import current_app, jsonify, request
+from functools import wraps
+import hmac
+
+LOOPBACK_ADDRESSES = ('127.0.0.1', '::1')
+
+def internal_only(view):
+    """Serve a monitoring view only to callers sending INTERNAL_API_TOKEN, or to local clients when it is unset"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        token = current_app.config.get('INTERNAL_API_TOKEN')
+        if token:
+            presented = request.headers.get('X-Internal-Token', '')
+            allowed = hmac.compare_digest(presented.encode('utf-8'), token.encode('utf-8'))
+        else:
+            allowed = request.remote_addr in LOOPBACK_ADDRESSES
+        if not allowed:
+            return jsonify({'message': 'Forbidden'}), 403
+        return view(*args, **kwargs)
+
+    return wrapper
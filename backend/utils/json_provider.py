@@ -0,0 +1,70 @@
+from datetime import date, datetime
+from decimal import Decimal
+from flask.json.provider import DefaultJSONProvider
+import json
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib encoder produces the same documents
+    orjson = None
+
+def _default(value):
+    """Encode the non-JSON types found in query results; datetimes as ISO 8601 like to_dict()"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+def dumps_bytes(obj, sort_keys=False, indent=False):
+    """Serialize obj to UTF-8 JSON bytes with the fastest available encoder"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=_default, option=option)
+        except TypeError:
+            # e.g. integers beyond 64 bits; the stdlib encoder handles them
+            pass
+
+    return json.dumps(
+        obj, default=_default, sort_keys=sort_keys, indent=2 if indent else None,
+        ensure_ascii=False, separators=None if indent else (',', ':')
+    ).encode('utf-8')
+
+def dumps(obj, sort_keys=False, indent=False):
+    """Serialize obj to a JSON string with the fastest available encoder"""
+    return dumps_bytes(obj, sort_keys, indent).decode('utf-8')
+
+def loads(s):
+    if orjson is not None:
+        return orjson.loads(s)
+    return json.loads(s)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson when installed, the stdlib encoder otherwise"""
+
+    default = staticmethod(_default)
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs:
+            # Callers asking for encoder options get the stdlib encoder
+            return super().dumps(obj, **kwargs)
+        return dumps(obj, sort_keys=self.sort_keys)
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = self.compact is False or (self.compact is None and self._app.debug)
+        body = dumps_bytes(obj, sort_keys=self.sort_keys, indent=indent)
+        return self._app.response_class(body + b'\n', mimetype=self.mimetype)
@@ -0,0 +1,320 @@
+from flask import Response, current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from backend.utils.internal import internal_only
+import json
+import logging
+import os
+import threading
+import time
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PREFIX = 'swapcycle_'
+
+class Metrics:
+    """Prometheus-style counters, histograms and gauges.
+
+    Each thread increments its own dict, so the request path takes no lock;
+    readers sum the per-thread dicts. Counters of finished threads are folded
+    into a retired total. With METRICS_DIR set, each worker process writes its
+    snapshot to <pid>.json there and /metrics sums all of them.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._threads = []  # (thread, values)
+        self._retired = {}
+        self._lock = threading.Lock()  # Only taken when a thread registers or on snapshot
+        self._collectors = []
+        self._last_write = 0
+        self.descriptions = {}  # name -> (type, help)
+
+    def reset(self):
+        """Drop all values, e.g. those a forked worker inherited from its parent"""
+        with self._lock:
+            self._local = threading.local()
+            self._threads = []
+            self._retired = {}
+        self._last_write = 0
+
+    def describe(self, name, metric_type, description):
+        self.descriptions[name] = (metric_type, description)
+
+    def _values(self):
+        values = getattr(self._local, 'values', None)
+        if values is None:
+            values = {}
+            self._local.values = values
+            with self._lock:
+                self._threads.append((threading.current_thread(), values))
+        return values
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        values = self._values()
+        values[key] = values.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        """Record a histogram observation with cumulative buckets"""
+        values = self._values()
+        label_items = tuple(sorted(labels.items()))
+        for bound in LATENCY_BUCKETS:
+            if value <= bound:
+                key = (f'{name}_bucket', tuple(sorted({**labels, 'le': str(bound)}.items())))
+                values[key] = values.get(key, 0) + 1
+        for key, amount in (
+            ((f'{name}_bucket', tuple(sorted({**labels, 'le': '+Inf'}.items()))), 1),
+            ((f'{name}_sum', label_items), value),
+            ((f'{name}_count', label_items), 1)
+        ):
+            values[key] = values.get(key, 0) + amount
+
+    def register_collector(self, collector):
+        """Register a callable returning [(name, labels, value)] gauges read at scrape time"""
+        if collector not in self._collectors:
+            self._collectors.append(collector)
+
+    def counters(self):
+        """Sum of every thread's counters"""
+        with self._lock:
+            alive = []
+            for thread, values in self._threads:
+                if thread.is_alive():
+                    alive.append((thread, values))
+                else:
+                    _merge(self._retired, values)
+            self._threads = alive
+            totals = dict(self._retired)
+            for _, values in alive:
+                _merge(totals, values.copy())
+        return totals
+
+    def gauges(self):
+        gauges = {}
+        for collector in self._collectors:
+            try:
+                for name, labels, value in collector():
+                    gauges[(name, tuple(sorted(labels.items())))] = value
+            except Exception as e:
+                logging.error(f"Error collecting metrics from {collector.__name__}: {e}")
+        return gauges
+
+    def write_snapshot(self, directory):
+        """Publish this process's metrics for the other workers' /metrics"""
+        snapshot = {
+            'counters': [[name, list(labels), value] for (name, labels), value in self.counters().items()],
+            'gauges': [[name, list(labels), value] for (name, labels), value in self.gauges().items()]
+        }
+        path = os.path.join(directory, f'{os.getpid()}.json')
+        with open(f'{path}.tmp', 'w') as f:
+            json.dump(snapshot, f)
+        os.replace(f'{path}.tmp', path)
+
+    def aggregate(self, directory=None):
+        """Counters and gauges of this process plus, with a directory, every other worker"""
+        counters = self.counters()
+        gauges = {key: [value] for key, value in self.gauges().items()}
+
+        if directory and os.path.isdir(directory):
+            for filename in os.listdir(directory):
+                if not filename.endswith('.json') or not filename[:-5].isdigit():
+                    continue
+                pid = int(filename[:-5])
+                if pid == os.getpid():
+                    continue
+                try:
+                    with open(os.path.join(directory, filename)) as f:
+                        snapshot = json.load(f)
+                except (OSError, ValueError):
+                    continue
+
+                # Counters of exited workers still count; their gauges are stale
+                for name, labels, value in snapshot['counters']:
+                    key = (name, tuple(tuple(label) for label in labels))
+                    counters[key] = counters.get(key, 0) + value
+                if _pid_alive(pid):
+                    for name, labels, value in snapshot['gauges']:
+                        gauges.setdefault((name, tuple(tuple(label) for label in labels)), []).append(value)
+
+        return counters, {key: sum(values) for key, values in gauges.items()}
+
+    def render(self, directory=None):
+        """Prometheus text exposition format"""
+        counters, gauges = self.aggregate(directory)
+        samples = {**counters, **gauges, **_cache_ratios(counters)}
+
+        families = {}
+        for (name, labels), value in samples.items():
+            family = name
+            for suffix in ('_bucket', '_sum', '_count'):
+                if name.endswith(suffix) and name[:-len(suffix)] in self.descriptions:
+                    family = name[:-len(suffix)]
+            families.setdefault(family, []).append((name, labels, value))
+
+        lines = []
+        for family in sorted(families):
+            metric_type, description = self.descriptions.get(family, ('untyped', ''))
+            lines.append(f'# HELP {PREFIX}{family} {description}')
+            lines.append(f'# TYPE {PREFIX}{family} {metric_type}')
+            for name, labels, value in sorted(families[family], key=_sample_order):
+                label_text = ','.join(f'{key}="{_escape(label)}"' for key, label in labels)
+                lines.append(f'{PREFIX}{name}{{{label_text}}} {value}' if label_text else f'{PREFIX}{name} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+def _merge(totals, values):
+    for key, value in values.items():
+        totals[key] = totals.get(key, 0) + value
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _sample_order(sample):
+    name, labels, _ = sample
+    labels = dict(labels)
+    le = labels.pop('le', None)
+    bound = float('inf') if le == '+Inf' else float(le) if le else 0.0
+    return name, sorted(labels.items()), bound
+
+
+metrics = Metrics()
+
+metrics.describe('http_requests_total', 'counter', 'HTTP requests by route, method and status')
+metrics.describe('http_request_duration_seconds', 'histogram', 'HTTP request latency by route')
+metrics.describe('db_queries_total', 'counter', 'SQL statements executed, by route')
+metrics.describe('db_query_duration_seconds_total', 'counter', 'Time spent executing SQL, by route')
+metrics.describe('db_pool_size', 'gauge', 'Configured connection pool size')
+metrics.describe('db_pool_checked_out', 'gauge', 'Connections currently checked out of the pool')
+metrics.describe('db_pool_overflow', 'gauge', 'Connections open beyond the pool size')
+metrics.describe('cache_hits_total', 'counter', 'Cache hits by cache')
+metrics.describe('cache_misses_total', 'counter', 'Cache misses by cache')
+metrics.describe('cache_hit_ratio', 'gauge', 'Cache hits over lookups since start')
+metrics.describe('outbound_requests_total', 'counter', 'Calls to upstream APIs by provider and outcome')
+metrics.describe('outbound_request_duration_seconds', 'histogram', 'Upstream API latency by provider')
+
+
+def record_cache(cache, hit):
+    """Count a lookup in one of the application caches"""
+    metrics.inc('cache_hits_total' if hit else 'cache_misses_total', cache=cache)
+
+
+def record_outbound(provider, outcome, seconds=None):
+    """Count a call to an upstream API; outcome is a status code or an error kind"""
+    metrics.inc('outbound_requests_total', provider=provider, outcome=str(outcome))
+    if seconds is not None:
+        metrics.observe('outbound_request_duration_seconds', seconds, provider=provider)
+
+
+def _current_route():
+    if has_request_context() and request.url_rule is not None:
+        return request.url_rule.rule
+    return 'none'
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    route = _current_route()
+    metrics.inc('db_queries_total', route=route)
+    started = getattr(context, '_metrics_started', None)
+    if started is not None:
+        metrics.inc('db_query_duration_seconds_total', time.perf_counter() - started, route=route)
+
+
+def _pool_gauges():
+    from backend.app import db
+
+    pool = db.engine.pool
+    samples = []
+    for name, attribute in (
+        ('db_pool_size', 'size'),
+        ('db_pool_checked_out', 'checkedout'),
+        ('db_pool_overflow', 'overflow')
+    ):
+        # Only QueuePool exposes every statistic (SQLite memory databases use other pools)
+        if hasattr(pool, attribute):
+            # QueuePool.overflow() counts up from -pool_size until the pool is full
+            samples.append((name, {}, max(getattr(pool, attribute)(), 0)))
+    return samples
+
+
+def _cache_ratios(counters):
+    """Hit ratio per cache, derived from the aggregated hit and miss counters"""
+    lookups = {}
+    for (name, labels), value in counters.items():
+        if name in ('cache_hits_total', 'cache_misses_total'):
+            cache = dict(labels)['cache']
+            hits, misses = lookups.get(cache, (0, 0))
+            lookups[cache] = (hits + value, misses) if name == 'cache_hits_total' else (hits, misses + value)
+    return {
+        ('cache_hit_ratio', (('cache', cache),)): round(hits / (hits + misses), 4)
+        for cache, (hits, misses) in lookups.items() if hits + misses
+    }
+
+
+def _start_timer():
+    g.metrics_started = time.perf_counter()
+
+
+def _record_request(response):
+    started = g.pop('metrics_started', None)
+    if started is None:
+        return response
+
+    route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+    metrics.inc('http_requests_total', route=route, method=request.method, status=str(response.status_code))
+    metrics.observe('http_request_duration_seconds', time.perf_counter() - started, route=route)
+
+    directory = current_app.config.get('METRICS_DIR')
+    if directory:
+        now = time.monotonic()
+        if now - metrics._last_write >= current_app.config.get('METRICS_WRITE_INTERVAL', 5):
+            metrics._last_write = now
+            try:
+                metrics.write_snapshot(directory)
+            except OSError as e:
+                logging.error(f"Error writing metrics snapshot: {e}")
+
+    return response
+
+
+def metrics_view():
+    return Response(
+        metrics.render(current_app.config.get('METRICS_DIR')),
+        content_type='text/plain; version=0.0.4; charset=utf-8'
+    )
+
+
+def init_app(app):
+    """Record request, SQL and cache metrics and serve them at /metrics"""
+    if not app.config.get('METRICS_ENABLED', True):
+        return
+
+    directory = app.config.get('METRICS_DIR')
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    if not event.contains(Engine, 'after_cursor_execute', _after_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+    metrics.register_collector(_pool_gauges)
+
+    app.before_request(_start_timer)
+    app.after_request(_record_request)
+    app.add_url_rule('/metrics', 'metrics', internal_only(metrics_view))
@@ -0,0 +1,147 @@
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from datetime import datetime
+import cProfile
+import logging
+import os
+import random
+import time
+
+try:
+    import pyinstrument
+except ImportError:  # pyinstrument is optional; cProfile is always available
+    pyinstrument = None
+
+MAX_RECORDED_STATEMENTS = 200  # Bound memory for requests issuing runaway query counts
+
+class RequestProfile:
+    """Timings collected for the current request"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.query_count = 0
+        self.db_time = 0.0
+        self.serialize_time = 0.0
+        self.statements = []  # (duration, statement)
+        self.profiler = None
+
+    def record_query(self, statement, duration):
+        self.query_count += 1
+        self.db_time += duration
+        if len(self.statements) < MAX_RECORDED_STATEMENTS:
+            self.statements.append((duration, statement))
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def server_timing(self):
+        total = self.elapsed()
+        return ', '.join([
+            f'db;dur={self.db_time * 1000:.2f};desc="{self.query_count} queries"',
+            f'serialize;dur={self.serialize_time * 1000:.2f}',
+            f'app;dur={(total - self.db_time - self.serialize_time) * 1000:.2f}',
+            f'total;dur={total * 1000:.2f}'
+        ])
+
+
+def current_profile():
+    if not has_request_context():
+        return None
+    return g.get('request_profile')
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._profiling_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = current_profile()
+    started = getattr(context, '_profiling_started', None)
+    if profile is not None and started is not None:
+        profile.record_query(statement, time.perf_counter() - started)
+
+
+def _start_profile():
+    profile = RequestProfile()
+    g.request_profile = profile
+
+    sample_rate = current_app.config.get('PROFILING_SAMPLE_RATE', 0.0)
+    if sample_rate and random.random() < sample_rate:
+        if pyinstrument is not None and current_app.config.get('PROFILING_PROFILER') == 'pyinstrument':
+            profile.profiler = pyinstrument.Profiler()
+            profile.profiler.start()
+        else:
+            profile.profiler = cProfile.Profile()
+            profile.profiler.enable()
+
+
+def _finish_profile(response):
+    profile = current_profile()
+    if profile is None:
+        return response
+
+    response.headers['Server-Timing'] = profile.server_timing()
+
+    elapsed_ms = profile.elapsed() * 1000
+    if elapsed_ms >= current_app.config.get('PROFILING_SLOW_REQUEST_MS', 500):
+        slowest = sorted(profile.statements, key=lambda item: item[0], reverse=True)[:5]
+        details = '\n'.join(f'  {duration * 1000:.1f}ms {statement}' for duration, statement in slowest)
+        logging.warning(
+            f"Slow request {request.method} {request.path} took {elapsed_ms:.0f}ms "
+            f"({profile.query_count} queries, {profile.db_time * 1000:.0f}ms in DB)\n{details}"
+        )
+
+    return response
+
+
+def _dump_profile(exc):
+    profile = current_profile()
+    if profile is None or profile.profiler is None:
+        return
+
+    dump_dir = current_app.config.get('PROFILING_DUMP_DIR', 'profiles')
+    os.makedirs(dump_dir, exist_ok=True)
+    name = f"{datetime.utcnow():%Y%m%d-%H%M%S-%f}-{request.method}-{request.endpoint or 'unknown'}"
+
+    try:
+        if isinstance(profile.profiler, cProfile.Profile):
+            profile.profiler.disable()
+            profile.profiler.dump_stats(os.path.join(dump_dir, f'{name}.prof'))
+        else:
+            profile.profiler.stop()
+            with open(os.path.join(dump_dir, f'{name}.html'), 'w', encoding='utf-8') as f:
+                f.write(profile.profiler.output_html())
+    except Exception as e:
+        logging.error(f"Error writing profile for {request.path}: {e}")
+
+
+def _time_serialization(provider):
+    """Wrap the JSON provider so jsonify time is attributed to serialization"""
+    original = provider.response
+
+    def response(*args, **kwargs):
+        started = time.perf_counter()
+        result = original(*args, **kwargs)
+        profile = current_profile()
+        if profile is not None:
+            profile.serialize_time += time.perf_counter() - started
+        return result
+
+    provider.response = response
+
+
+def init_app(app):
+    """Opt-in per-request profiling, enabled with PROFILING_ENABLED"""
+    if not app.config.get('PROFILING_ENABLED'):
+        return
+
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+    _time_serialization(app.json)
+    app.before_request(_start_profile)
+    app.after_request(_finish_profile)
+    app.teardown_request(_dump_profile)
@@ -0,0 +1,126 @@
+from collections import OrderedDict, deque
+from config import Config
+import os
+import sqlite3
+import threading
+import time
+
+class RateLimiter:
+    """Sliding-window attempt counter per key, kept in process memory.
+
+    Each worker process counts on its own, so with N workers a client can make
+    up to N times the limit; use SQLiteRateLimiter when several workers serve
+    the app (serve.py picks it for more than one worker).
+
+    At most max_keys keys are tracked; past that, expired keys are dropped
+    first, then the least recently attempted ones.
+    """
+
+    def __init__(self, limit, window, max_keys=10000):
+        self.limit = limit
+        self.window = window
+        self.max_keys = max_keys
+        self._attempts = OrderedDict()  # key -> deque of time.monotonic() values, least recent first
+        self._lock = threading.Lock()
+
+    def hit(self, key):
+        """Record an attempt; returns the seconds to wait if the key is over its limit, else 0"""
+        now = time.monotonic()
+        with self._lock:
+            attempts = self._attempts.get(key)
+            if attempts is None:
+                if len(self._attempts) >= self.max_keys:
+                    self._prune(now)
+                attempts = self._attempts[key] = deque()
+            else:
+                self._attempts.move_to_end(key)
+
+            while attempts and attempts[0] <= now - self.window:
+                attempts.popleft()
+            # Rejected attempts are not recorded, so waiting out the window always works
+            if len(attempts) >= self.limit:
+                return attempts[0] + self.window - now
+            attempts.append(now)
+            return 0
+
+    def reset(self, key):
+        with self._lock:
+            self._attempts.pop(key, None)
+
+    def _prune(self, now):
+        for key, attempts in list(self._attempts.items()):
+            if not attempts or attempts[-1] <= now - self.window:
+                del self._attempts[key]
+        # Make room for the new key even when every tracked key is active
+        while len(self._attempts) >= self.max_keys:
+            self._attempts.popitem(last=False)
+
+
+class SQLiteRateLimiter:
+    """The same sliding window kept in a local SQLite file, shared by every worker on the host.
+
+    Attempts older than the window are deleted on every hit, so the table
+    only holds the attempts of the current window.
+    """
+
+    def __init__(self, path, name, limit, window):
+        self.path = path
+        self.name = name  # Limiters share the table, so keys are prefixed with it
+        self.limit = limit
+        self.window = window
+        self._local = threading.local()
+
+        connection = self._connect()
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS rate_limit_attempt (key TEXT NOT NULL, attempted_at REAL NOT NULL)'
+        )
+        connection.execute(
+            'CREATE INDEX IF NOT EXISTS ix_rate_limit_attempt_key ON rate_limit_attempt (key, attempted_at)'
+        )
+        connection.execute(
+            'CREATE INDEX IF NOT EXISTS ix_rate_limit_attempt_attempted_at ON rate_limit_attempt (attempted_at)'
+        )
+
+    def _connect(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or getattr(self._local, 'pid', None) != os.getpid():
+            # One connection per thread, reopened after fork
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def hit(self, key):
+        """Record an attempt; returns the seconds to wait if the key is over its limit, else 0"""
+        key = f'{self.name}:{key}'
+        now = time.time()
+        connection = self._connect()
+        # Serializes the count and the insert across processes
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            connection.execute('DELETE FROM rate_limit_attempt WHERE attempted_at <= ?', (now - self.window,))
+            count, oldest = connection.execute(
+                'SELECT COUNT(*), MIN(attempted_at) FROM rate_limit_attempt WHERE key = ?', (key,)
+            ).fetchone()
+            if count >= self.limit:
+                wait = oldest + self.window - now
+            else:
+                connection.execute('INSERT INTO rate_limit_attempt (key, attempted_at) VALUES (?, ?)', (key, now))
+                wait = 0
+            connection.execute('COMMIT')
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        return wait
+
+    def reset(self, key):
+        self._connect().execute('DELETE FROM rate_limit_attempt WHERE key = ?', (f'{self.name}:{key}',))
+
+
+def rate_limiter(name, limit, window):
+    """A limiter on the RATE_LIMIT_BACKEND store"""
+    if Config.RATE_LIMIT_BACKEND == 'sqlite':
+        return SQLiteRateLimiter(Config.RATE_LIMIT_PATH, name, limit, window)
+    return RateLimiter(limit, window)
@@ -0,0 +1,113 @@
+from backend.models.product import Product, ProductCategory, ProductSubcategory
+from backend.models.service import Service, ServiceCategory, ServiceSubcategory
+
+class ListingSerializer:
+    """Builds listing dicts from selected columns instead of hydrated ORM objects.
+
+    The output has the keys of Product.to_dict() / Service.to_dict(); created_at
+    stays a datetime and is encoded by the app's JSON provider. A fields list
+    (sparse fieldset) limits both the SELECTed columns and the serialized keys.
+    """
+
+    COMMON_FIELDS = [
+        'id', 'name', 'description', 'estimated_value', 'address', 'latitude', 'longitude',
+        'images', 'availability_status', 'favorite_count', 'pending_trade_count',
+        'user_id', 'created_at'
+    ]
+
+    FIELDS = {
+        'product': COMMON_FIELDS + ['condition', 'quantity'],
+        'service': COMMON_FIELDS + ['is_online']
+    }
+
+    # Fields computed from joins or other columns, mapped to what they need
+    DERIVED_FIELDS = {
+        'category': 'category',
+        'subcategory': 'subcategory',
+        'thumbnail': 'images'
+    }
+
+    # Keys added by endpoints after serialization, kept whatever fields are requested
+    ANNOTATIONS = ['type', 'distance', 'is_favorited']
+
+    MODELS = {
+        'product': (Product, ProductCategory, ProductSubcategory),
+        'service': (Service, ServiceCategory, ServiceSubcategory)
+    }
+
+    @staticmethod
+    def parse_fields(value):
+        """Parse a comma separated fields= value; None means every field.
+
+        Raises ValueError for unknown names. id is always included.
+        """
+        if not value:
+            return None
+
+        allowed = set(ListingSerializer.DERIVED_FIELDS)
+        for fields in ListingSerializer.FIELDS.values():
+            allowed.update(fields)
+
+        fields = ['id']
+        for field in value.split(','):
+            field = field.strip()
+            if not field or field in fields:
+                continue
+            if field not in allowed:
+                raise ValueError(f'Unknown field: {field}')
+            fields.append(field)
+        return fields
+
+    @staticmethod
+    def select_from(query, item_type, fields=None, required=()):
+        """Turn a filtered model query into one returning only the needed columns.
+
+        required names columns the caller uses itself (e.g. for sorting) even
+        when they are not in fields. Apply filter_by() calls before this: the
+        category joins move its target.
+        """
+        model, category, subcategory = ListingSerializer.MODELS[item_type]
+
+        if fields is None:
+            wanted = set(ListingSerializer.FIELDS[item_type]) | {'category', 'subcategory'}
+        else:
+            wanted = {ListingSerializer.DERIVED_FIELDS.get(field, field) for field in fields}
+        wanted.update(required)
+
+        columns = [getattr(model, field) for field in ListingSerializer.FIELDS[item_type] if field in wanted]
+        if 'category' in wanted:
+            columns.append(category.name.label('category'))
+        if 'subcategory' in wanted:
+            columns.append(subcategory.name.label('subcategory'))
+
+        query = query.with_entities(*columns)
+        if 'category' in wanted:
+            query = query.outerjoin(category, model.category_id == category.id)
+        if 'subcategory' in wanted:
+            query = query.outerjoin(subcategory, model.subcategory_id == subcategory.id)
+        return query
+
+    @staticmethod
+    def restrict(result, fields):
+        """Drop keys outside the sparse fieldset, keeping endpoint annotations"""
+        if fields is None:
+            return result
+
+        if 'thumbnail' in fields:
+            images = result.get('images')
+            result['thumbnail'] = images[0] if images else None
+
+        return {
+            key: value for key, value in result.items()
+            if key in fields or key in ListingSerializer.ANNOTATIONS
+        }
+
+    @staticmethod
+    def to_dict(row, item_type=None, fields=None):
+        result = row._asdict()
+        for counter in ('favorite_count', 'pending_trade_count'):
+            if counter in result:
+                result[counter] = result[counter] or 0
+        if item_type:
+            result['type'] = item_type
+        return ListingSerializer.restrict(result, fields)
@@ -0,0 +1,177 @@
+"""Read throughput under many concurrent readers with one writer.
+
+Builds a synthetic dataset in a throwaway SQLite file, then runs reader threads
+(listing detail and radius search) against the API while a single writer
+thread keeps updating listings. Each profile is run against a fresh database.
+The default profile uses the configured settings (WAL, synchronous=NORMAL, mmap).
+The sqlite-defaults profile uses SQLite's own rollback journal with
+synchronous=FULL, for comparison.
+
+    python benchmarks/bench_concurrency.py --readers 16 --duration 10
+    python benchmarks/bench_concurrency.py --profile tuned --readers 32
+"""
+import sys
+import os
+import argparse
+import random
+import tempfile
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PROFILE_KEYS = ('SQLITE_JOURNAL_MODE', 'SQLITE_SYNCHRONOUS', 'SQLITE_MMAP_SIZE')
+
+PROFILES = {
+    'tuned': None,  # Whatever Config holds, taken at startup
+    'sqlite-defaults': {'SQLITE_JOURNAL_MODE': 'delete', 'SQLITE_SYNCHRONOUS': 'full', 'SQLITE_MMAP_SIZE': 0}
+}
+
+
+def build_app(database_path, settings):
+    from config import Config
+    Config.SQLALCHEMY_DATABASE_URI = f'sqlite:///{database_path}'
+    for key, value in settings.items():
+        setattr(Config, key, value)
+
+    from backend.app import create_app
+    return create_app()
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def reader(app, product_ids, seed, deadline, results):
+    from backend.generate_data import CITIES
+
+    rng = random.Random(seed)
+    client = app.test_client()
+    latencies, errors = [], 0
+    while time.perf_counter() < deadline:
+        if rng.random() < 0.7:
+            path = f'/api/products/{rng.choice(product_ids)}'
+        else:
+            _, latitude, longitude, _ = rng.choice(CITIES)
+            path = f'/api/search/?lat={latitude:.4f}&lng={longitude:.4f}&radius=5&per_page=20'
+
+        started = time.perf_counter()
+        try:
+            status = client.get(path).status_code
+        except Exception:
+            status = None
+        latencies.append(time.perf_counter() - started)
+        if status != 200:
+            errors += 1
+    results.append((latencies, errors))
+
+
+def writer(app, products, tokens, seed, deadline, results):
+    rng = random.Random(seed)
+    client = app.test_client()
+    latencies, errors = [], 0
+    while time.perf_counter() < deadline:
+        product_id, user_id = rng.choice(products)
+        started = time.perf_counter()
+        try:
+            status = client.put(
+                f'/api/products/{product_id}',
+                json={'estimated_value': rng.randint(5, 500)},
+                headers={'Authorization': f'Bearer {tokens[user_id]}'}
+            ).status_code
+        except Exception:
+            status = None
+        latencies.append(time.perf_counter() - started)
+        if status != 200:
+            errors += 1
+    results.append((latencies, errors))
+
+
+def run_profile(name, args):
+    with tempfile.TemporaryDirectory() as tmp:
+        app = build_app(os.path.join(tmp, 'concurrency.db'), PROFILES[name])
+
+        with app.app_context():
+            from flask_jwt_extended import create_access_token
+            from sqlalchemy import select, text
+            from backend.app import db
+            from backend.generate_data import generate
+            from backend.models.product import Product
+
+            db.create_all()
+            generate(users=args.users, products=args.products, services=args.products // 2,
+                     trades=args.products // 2, favorites=args.products, seed=args.seed)
+            journal_mode = db.session.execute(text('PRAGMA journal_mode')).scalar()
+            products = [tuple(row) for row in db.session.execute(select(Product.id, Product.user_id))]
+            tokens = {user_id: create_access_token(identity=user_id) for _, user_id in products}
+            db.session.remove()
+
+        product_ids = [product_id for product_id, _ in products]
+        reader_results, writer_results = [], []
+        deadline = time.perf_counter() + args.duration
+        threads = [
+            threading.Thread(target=reader, args=(app, product_ids, args.seed + i, deadline, reader_results))
+            for i in range(args.readers)
+        ]
+        if not args.no_writer:
+            threads.append(threading.Thread(target=writer, args=(app, products, tokens, args.seed, deadline, writer_results)))
+
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        with app.app_context():
+            db.engine.dispose()
+
+    def summarize(results):
+        latencies = sorted(latency for latencies, _ in results for latency in latencies)
+        return {
+            'requests': len(latencies),
+            'errors': sum(errors for _, errors in results),
+            'rps': len(latencies) / elapsed,
+            'p50_ms': percentile(latencies, 0.50) * 1000,
+            'p95_ms': percentile(latencies, 0.95) * 1000
+        }
+
+    return journal_mode, summarize(reader_results), summarize(writer_results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Concurrent readers with one writer against SQLite')
+    parser.add_argument('--readers', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10, help='Seconds per profile')
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--products', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--profile', choices=['all'] + list(PROFILES), default='all')
+    parser.add_argument('--no-writer', action='store_true', help='Readers only')
+    args = parser.parse_args()
+
+    # Config reads the environment at import time
+    os.environ['RESPONSE_CACHE_BACKEND'] = 'none'
+    os.environ['METRICS_ENABLED'] = 'false'
+    os.environ['PROFILING_ENABLED'] = 'false'
+
+    from config import Config
+    PROFILES['tuned'] = {key: getattr(Config, key) for key in PROFILE_KEYS}
+
+    names = list(PROFILES) if args.profile == 'all' else [args.profile]
+    print(f"{args.readers} readers{'' if args.no_writer else ' + 1 writer'}, {args.duration:.0f}s per profile\n")
+    print(f"{'profile':<17}{'journal':>8}{'read rps':>10}{'read p50':>10}{'read p95':>10}{'errors':>8}"
+          f"{'write rps':>11}{'write p95':>11}{'errors':>8}")
+    for name in names:
+        journal_mode, reads, writes = run_profile(name, args)
+        print(
+            f"{name:<17}{journal_mode:>8}{reads['rps']:>10.1f}{reads['p50_ms']:>10.2f}{reads['p95_ms']:>10.2f}"
+            f"{reads['errors']:>8}{writes['rps']:>11.1f}{writes['p95_ms']:>11.2f}{writes['errors']:>8}"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""Outbound geocoding: new connections, the pooled client and the async fan-out.
+
+Starts a local stub of the Geocoding API that answers after a fixed latency,
+points GEOCODING_API_URL at it and geocodes a batch of distinct addresses:
+with a bare requests.get per address (a new connection each time), with
+GeocodingService.geocode_address in a loop and from a burst of threads (the
+pooled client), then with GeocodingService.geocode_many. A last run makes the
+stub fail to show retries and the circuit breaker cutting the batch short.
+The stub is plain HTTP on localhost, so the TLS handshakes pooling saves
+against the real API are not part of these numbers.
+
+    python benchmarks/bench_outbound.py --addresses 100 --latency 50
+    python benchmarks/bench_outbound.py --concurrency 16
+"""
+import sys
+import os
+import argparse
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class StubGeocoder(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive, like the real API
+    disable_nagle_algorithm = True  # Headers and body are separate writes
+    latency = 0.05
+    failing = False
+    connections = set()
+
+    def do_GET(self):
+        StubGeocoder.connections.add(self.client_address)
+        time.sleep(self.latency)
+        if self.failing:
+            self.send_response(503)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        address = parse_qs(urlparse(self.path).query).get('address', [''])[0]
+        body = json.dumps({
+            'status': 'OK',
+            'results': [{'geometry': {'location': {'lat': len(address) % 90, 'lng': len(address) % 180}}}]
+        }).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # The client gave up on its deadline
+
+    def log_message(self, *args):
+        pass
+
+
+def timed(label, function, addresses):
+    StubGeocoder.connections.clear()
+    started = time.perf_counter()
+    results = function(addresses)
+    elapsed = time.perf_counter() - started
+    found = sum(1 for latitude, _ in results if latitude is not None)
+    print(f"{label:<28}{elapsed * 1000:>10.0f}{found:>8}{len(StubGeocoder.connections):>13}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sequential versus concurrent geocoding against a stub API')
+    parser.add_argument('--addresses', type=int, default=100)
+    parser.add_argument('--latency', type=float, default=50, help='Stub response time in ms')
+    parser.add_argument('--concurrency', type=int, default=8, help='GEOCODING_CONCURRENCY')
+    parser.add_argument('--threads', type=int, default=16, help='Threads in the burst of blocking calls')
+    args = parser.parse_args()
+
+    StubGeocoder.latency = args.latency / 1000
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubGeocoder)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    # Config reads the environment at import time
+    os.environ['GEOCODING_API_URL'] = f'http://127.0.0.1:{server.server_address[1]}/geocode/json'
+    os.environ['GOOGLE_MAPS_API_KEY'] = 'stub'
+    os.environ['GEOCODING_CONCURRENCY'] = str(args.concurrency)
+
+    import requests
+    from backend.services.geocoding_service import GeocodingService
+    from config import Config
+
+    def unpooled(batch):
+        results = []
+        for address in batch:
+            response = requests.get(Config.GEOCODING_API_URL, params={'address': address, 'key': 'stub'}, timeout=10)
+            results.append(GeocodingService._parse_geocode(response.json(), address))
+        return results
+
+    def burst(batch):
+        with ThreadPoolExecutor(args.threads) as executor:
+            return list(executor.map(GeocodingService.geocode_address, batch))
+
+    addresses = [f'{number} Rua Augusta, Lisboa' for number in range(args.addresses)]
+    print(f"{args.addresses} addresses, {args.latency:.0f}ms stub latency, concurrency {args.concurrency}\n")
+    print(f"{'mode':<28}{'total ms':>10}{'found':>8}{'connections':>13}")
+
+    timed('requests.get per address', unpooled, addresses)
+    timed('sequential geocode_address', lambda batch: [GeocodingService.geocode_address(a) for a in batch], addresses)
+    timed(f'burst of {args.threads} threads', burst, addresses)
+    timed('geocode_many', GeocodingService.geocode_many, addresses)
+    # Second batch reuses the pooled keep-alive connections
+    timed('geocode_many (warm pool)', GeocodingService.geocode_many, addresses)
+
+    StubGeocoder.failing = True
+    print(f"\nStub returning 503; {Config.OUTBOUND_RETRIES} retries per blocking call, "
+          f"circuit opens after {Config.CIRCUIT_BREAKER_FAILURES} failures")
+    timed('sequential (upstream down)', lambda batch: [GeocodingService.geocode_address(a) for a in batch], addresses)
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
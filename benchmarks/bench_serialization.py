@@ -0,0 +1,108 @@
+"""Compare listing serialization throughput.
+
+Seeds a throwaway SQLite database with listings, then times turning them into
+a JSON response body three ways:
+
+  orm+stdlib     ORM objects -> to_dict() -> Flask's default jsonify
+  orm+fast       ORM objects -> to_dict() -> FastJSONProvider
+  columns+fast   selected columns -> ListingSerializer -> FastJSONProvider
+
+    python benchmarks/bench_serialization.py --listings 1000 --rounds 20
+"""
+import sys
+import os
+import argparse
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def build_app(database_path):
+    os.environ['DATABASE_URL'] = f'sqlite:///{database_path}'
+
+    from config import Config
+    Config.SQLALCHEMY_DATABASE_URI = os.environ['DATABASE_URL']
+
+    from backend.app import create_app
+    return create_app()
+
+
+def create_fixtures(count):
+    from backend.app import db
+    from backend.models.user import User
+    from backend.models.product import Product
+    from backend.seed_data import seed_product_categories
+
+    db.create_all()
+    seed_product_categories()
+
+    user = User(email='bench@example.com', username='bench', name='Bench',
+                surname='Mark', address='Bench Street 1')
+    user.password_hash = 'not-used'
+    db.session.add(user)
+    db.session.flush()
+
+    db.session.add_all([
+        Product(name=f'Listing {i}', description='Benchmark listing ' * 5, estimated_value=i,
+                condition='good', quantity=1, address='Bench Street 1', latitude=41.39,
+                longitude=2.17, images=['/static/uploads/a.jpg', '/static/uploads/b.jpg'],
+                user_id=user.id, category_id=1, subcategory_id=1)
+        for i in range(count)
+    ])
+    db.session.commit()
+
+
+def time_rounds(label, rounds, func):
+    func()  # warm up
+    started = time.perf_counter()
+    for _ in range(rounds):
+        size = len(func())
+    elapsed = (time.perf_counter() - started) / rounds
+    print(f'{label:<14} {elapsed * 1000:8.2f} ms/response  {size / 1024:8.1f} KiB')
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark listing serialization')
+    parser.add_argument('--listings', type=int, default=1000)
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = build_app(os.path.join(tmp, 'bench.db'))
+
+        with app.app_context():
+            from flask.json.provider import DefaultJSONProvider
+            from backend.app import db
+            from backend.models.product import Product
+            from backend.utils import json_provider
+            from backend.utils.serializers import ListingSerializer
+
+            create_fixtures(args.listings)
+            stdlib = DefaultJSONProvider(app)
+            print(f'{args.listings} listings, {args.rounds} rounds, '
+                  f'orjson {"available" if json_provider.orjson else "missing"}')
+
+            def orm_stdlib():
+                db.session.expunge_all()
+                results = [product.to_dict() for product in Product.query.all()]
+                return stdlib.response({'results': results}).get_data()
+
+            def orm_fast():
+                db.session.expunge_all()
+                results = [product.to_dict() for product in Product.query.all()]
+                return app.json.response({'results': results}).get_data()
+
+            def columns_fast():
+                rows = ListingSerializer.select_from(Product.query, 'product').all()
+                results = [ListingSerializer.to_dict(row) for row in rows]
+                return app.json.response({'results': results}).get_data()
+
+            baseline = time_rounds('orm+stdlib', args.rounds, orm_stdlib)
+            for label, func in (('orm+fast', orm_fast), ('columns+fast', columns_fast)):
+                elapsed = time_rounds(label, args.rounds, func)
+                print(f'{"":<14} {baseline / elapsed:8.2f}x vs orm+stdlib')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,181 @@
+"""Startup time and throughput of serve.py against the development server.
+
+Builds a synthetic dataset in a throwaway SQLite file, starts each server as a
+subprocess on a free port, measures the time until it answers its first
+request, then runs concurrent HTTP clients against listing and search
+endpoints for a fixed duration.
+
+    python benchmarks/bench_serving.py --clients 16 --duration 10
+    python benchmarks/bench_serving.py --workers 4 --threads 8
+
+The clients run in this process, so on small machines they compete with the
+servers for CPU; compare the two rows rather than reading absolute numbers.
+"""
+import sys
+import os
+import argparse
+import random
+import signal
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STARTUP_TIMEOUT = 60  # seconds
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def build_database(path, args):
+    os.environ['DATABASE_URL'] = f'sqlite:///{path}'
+
+    from backend.app import create_app, db
+    from backend.generate_data import generate
+    from sqlalchemy import select
+    from backend.models.product import Product
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        generate(users=args.users, products=args.products, services=args.products // 2,
+                 trades=args.products // 2, favorites=args.products, seed=args.seed)
+        product_ids = db.session.execute(select(Product.id)).scalars().all()
+        db.engine.dispose()
+    return product_ids
+
+
+def server_commands(port, args):
+    return {
+        'dev server': [
+            sys.executable, '-m', 'flask', '--app', 'run:app', 'run',
+            '--host', '127.0.0.1', '--port', str(port), '--debug'
+        ],
+        'serve.py': [
+            sys.executable, 'serve.py', '--bind', f'127.0.0.1:{port}',
+            '--workers', str(args.workers), '--threads', str(args.threads)
+        ]
+    }
+
+
+def wait_until_ready(session, base_url, process):
+    started = time.perf_counter()
+    while time.perf_counter() - started < STARTUP_TIMEOUT:
+        if process.poll() is not None:
+            raise RuntimeError(f'server exited with status {process.returncode}')
+        try:
+            if session.get(f'{base_url}/api/health', timeout=1).status_code < 500:
+                return time.perf_counter() - started
+        except Exception:
+            time.sleep(0.05)
+    raise RuntimeError('server did not start in time')
+
+
+def client(base_url, product_ids, seed, deadline, results):
+    import requests
+    from backend.generate_data import CITIES
+
+    rng = random.Random(seed)
+    session = requests.Session()
+    latencies, errors = [], 0
+    while time.perf_counter() < deadline:
+        if rng.random() < 0.7:
+            path = f'/api/products/{rng.choice(product_ids)}'
+        else:
+            _, latitude, longitude, _ = rng.choice(CITIES)
+            path = f'/api/search/?lat={latitude:.4f}&lng={longitude:.4f}&radius=5&per_page=20'
+
+        started = time.perf_counter()
+        try:
+            ok = session.get(base_url + path, timeout=30).status_code == 200
+        except Exception:
+            ok = False
+        latencies.append(time.perf_counter() - started)
+        errors += 0 if ok else 1
+    results.append((latencies, errors))
+
+
+def run_server(name, command, port, product_ids, args, env):
+    import requests
+
+    process = subprocess.Popen(
+        command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        start_new_session=True
+    )
+    base_url = f'http://127.0.0.1:{port}'
+    try:
+        startup = wait_until_ready(requests.Session(), base_url, process)
+
+        results = []
+        deadline = time.perf_counter() + args.duration
+        threads = [
+            threading.Thread(target=client, args=(base_url, product_ids, args.seed + i, deadline, results))
+            for i in range(args.clients)
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+    finally:
+        # Signal the whole group: the dev server's reloader and gunicorn's workers are children
+        os.killpg(process.pid, signal.SIGTERM)
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            os.killpg(process.pid, signal.SIGKILL)
+
+    latencies = sorted(latency for latencies, _ in results for latency in latencies)
+    p95 = latencies[max(0, int(len(latencies) * 0.95) - 1)] if latencies else 0.0
+    return {
+        'startup_s': startup,
+        'requests': len(latencies),
+        'errors': sum(errors for _, errors in results),
+        'rps': len(latencies) / elapsed,
+        'p95_ms': p95 * 1000
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare serve.py with the development server')
+    parser.add_argument('--clients', type=int, default=16, help='Concurrent HTTP clients')
+    parser.add_argument('--duration', type=float, default=10, help='Seconds of load per server')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() * 2 + 1)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--products', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    try:
+        import gunicorn  # noqa: F401
+    except ImportError:
+        sys.exit("gunicorn is required to benchmark serve.py: pip install gunicorn")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_path = os.path.join(tmp, 'serving.db')
+        product_ids = build_database(database_path, args)
+
+        env = dict(os.environ, DATABASE_URL=f'sqlite:///{database_path}', METRICS_DIR=os.path.join(tmp, 'metrics'))
+        print(f"{args.clients} clients, {args.duration:.0f}s per server; serve.py with "
+              f"{args.workers} workers x {args.threads} threads\n")
+        print(f"{'server':<12}{'startup s':>11}{'requests':>10}{'rps':>9}{'p95 ms':>9}{'errors':>8}")
+
+        for name in ('dev server', 'serve.py'):
+            port = free_port()
+            stats = run_server(name, server_commands(port, args)[name], port, product_ids, args, env)
+            print(
+                f"{name:<12}{stats['startup_s']:>11.2f}{stats['requests']:>10}{stats['rps']:>9.1f}"
+                f"{stats['p95_ms']:>9.2f}{stats['errors']:>8}"
+            )
+
+
+if __name__ == '__main__':
+    main()
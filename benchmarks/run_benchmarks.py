@@ -0,0 +1,414 @@
+"""Reproducible API benchmark with a regression check against a JSON baseline.
+
+Builds a synthetic clustered dataset in a throwaway SQLite database (see
+backend/generate_data.py), then drives search, map, listing CRUD and trade endpoints
+through the Flask test client, or over HTTP against a local WSGI server with
+--server. Reports p50/p95/p99 latency, throughput and SQL statements per
+request for each scenario.
+
+    python benchmarks/run_benchmarks.py                       # compare with baseline.json
+    python benchmarks/run_benchmarks.py --update-baseline     # record a new baseline
+    python benchmarks/run_benchmarks.py --server --requests 200 --output results.json
+
+The response cache is disabled unless --with-cache is given, so the numbers
+measure the endpoints themselves. Exits with status 1 when a scenario's p95
+latency exceeds the baseline by more than --tolerance, or when it issues more
+queries per request than the baseline.
+"""
+import sys
+import os
+import argparse
+import json
+import platform
+import random
+import tempfile
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+LATENCY_FLOOR_MS = 1.0  # Differences below this are noise, whatever the ratio
+
+
+class QueryCounter:
+    """Counts SQL statements executed by the app's engine"""
+
+    def __init__(self, engine):
+        from sqlalchemy import event
+
+        self.count = 0
+        event.listen(engine, 'after_cursor_execute', self._increment)
+
+    def _increment(self, *args):
+        self.count += 1
+
+
+class TestClientDriver:
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, json=None, headers=None):
+        response = self.client.open(path, method=method, json=json, headers=headers)
+        return response.status_code, response.get_json(silent=True)
+
+    def close(self):
+        pass
+
+
+class ServerDriver:
+    """Serves the app from a background thread and talks to it over HTTP"""
+
+    def __init__(self, app):
+        import requests
+        from werkzeug.serving import WSGIRequestHandler, make_server
+
+        class QuietHandler(WSGIRequestHandler):
+            def log_request(self, *args, **kwargs):
+                pass
+
+        # Single-threaded so per-request query counts stay exact
+        self.server = make_server('127.0.0.1', 0, app, threaded=False, request_handler=QuietHandler)
+        self.base_url = f'http://127.0.0.1:{self.server.server_port}'
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.session = requests.Session()
+
+    def request(self, method, path, json=None, headers=None):
+        response = self.session.request(method, self.base_url + path, json=json, headers=headers)
+        try:
+            body = response.json()
+        except ValueError:
+            body = None
+        return response.status_code, body
+
+    def close(self):
+        self.server.shutdown()
+        self.session.close()
+
+
+def build_app(database_path, with_cache):
+    # Config reads the environment at import time
+    os.environ['DATABASE_URL'] = f'sqlite:///{database_path}'
+    os.environ['RESPONSE_CACHE_BACKEND'] = 'memory' if with_cache else 'none'
+    os.environ['METRICS_ENABLED'] = 'false'
+    os.environ['PROFILING_ENABLED'] = 'false'
+
+    from config import Config
+    Config.SQLALCHEMY_DATABASE_URI = os.environ['DATABASE_URL']
+
+    from backend.app import create_app
+    return create_app()
+
+
+class Scenarios:
+    """Benchmark operations; each returns (method, path, json, headers) for one request"""
+
+    def __init__(self, rng, tokens, fixtures):
+        self.rng = rng
+        self.tokens = tokens
+        self.fixtures = fixtures
+        self.created_products = []
+
+    def _city(self):
+        from backend.generate_data import CITIES
+        _, latitude, longitude, _ = self.rng.choices(CITIES, weights=[city[3] for city in CITIES])[0]
+        return latitude + self.rng.uniform(-0.02, 0.02), longitude + self.rng.uniform(-0.02, 0.02)
+
+    def _auth(self, user_id):
+        return {'Authorization': f'Bearer {self.tokens[user_id]}'}
+
+    def search_radius(self):
+        latitude, longitude = self._city()
+        return 'GET', f'/api/search/?lat={latitude:.4f}&lng={longitude:.4f}&radius=5&per_page=20', None, None
+
+    def search_keyword(self):
+        from backend.generate_data import WORDS
+        return 'GET', f'/api/search/?keyword={self.rng.choice(WORDS)}&per_page=20', None, None
+
+    def search_bounds(self):
+        latitude, longitude = self._city()
+        return 'GET', (
+            f'/api/search/?north={latitude + 0.05:.4f}&south={latitude - 0.05:.4f}'
+            f'&east={longitude + 0.05:.4f}&west={longitude - 0.05:.4f}&per_page=50'
+        ), None, None
+
+    def search_sparse(self):
+        latitude, longitude = self._city()
+        return 'GET', (
+            f'/api/search/?lat={latitude:.4f}&lng={longitude:.4f}&radius=5'
+            f'&fields=name,estimated_value,thumbnail'
+        ), None, None
+
+    def map_data(self):
+        latitude, longitude = self._city()
+        return 'GET', (
+            f'/api/search/map-data?north={latitude + 0.1:.4f}&south={latitude - 0.1:.4f}'
+            f'&east={longitude + 0.1:.4f}&west={longitude - 0.1:.4f}'
+        ), None, None
+
+    def product_list(self):
+        return 'GET', f'/api/products/?page={self.rng.randint(1, 20)}&sort=popular', None, None
+
+    def product_get(self):
+        return 'GET', f'/api/products/{self.rng.choice(self.fixtures["product_ids"])}', None, None
+
+    def product_create(self):
+        user_id = self.rng.choice(self.fixtures['user_ids'])
+        latitude, longitude = self._city()
+        return 'POST', '/api/products/', {
+            'name': 'Benchmark product',
+            'description': 'Created by the benchmark',
+            'estimated_value': 25,
+            'condition': 'good',
+            'category_id': 1,
+            'address': 'Bench Street 1',
+            'latitude': latitude,
+            'longitude': longitude
+        }, self._auth(user_id)
+
+    def product_update(self):
+        product_id, user_id = self.rng.choice(self.created_products)
+        return 'PUT', f'/api/products/{product_id}', {
+            'estimated_value': self.rng.randint(5, 500)
+        }, self._auth(user_id)
+
+    def product_delete(self):
+        product_id, user_id = self.created_products.pop()
+        return 'DELETE', f'/api/products/{product_id}', None, self._auth(user_id)
+
+    def trade_inbox(self):
+        user_id = self.rng.choice(self.fixtures['receiver_ids'])
+        return 'GET', '/api/trades/inbox?limit=20', None, self._auth(user_id)
+
+    def trade_accept(self):
+        trade_id, receiver_id = self.fixtures['pending_trades'].pop()
+        return 'POST', f'/api/trades/{trade_id}/accept', {}, self._auth(receiver_id)
+
+    def trade_decline(self):
+        trade_id, receiver_id = self.fixtures['pending_trades'].pop()
+        return 'POST', f'/api/trades/{trade_id}/decline', {}, self._auth(receiver_id)
+
+
+READ_SCENARIOS = [
+    'search_radius', 'search_keyword', 'search_bounds', 'search_sparse', 'map_data',
+    'product_list', 'product_get', 'trade_inbox'
+]
+
+
+def load_fixtures():
+    from sqlalchemy import select
+    from backend.app import db
+    from backend.models.user import User
+    from backend.models.product import Product
+    from backend.models.trade import Trade
+
+    pending = db.session.execute(
+        select(Trade.id, Trade.receiver_id).where(Trade.status == 'pending').order_by(Trade.id)
+    ).all()
+    return {
+        'user_ids': db.session.execute(select(User.id)).scalars().all(),
+        'product_ids': db.session.execute(select(Product.id)).scalars().all(),
+        'receiver_ids': sorted({row.receiver_id for row in pending}),
+        'pending_trades': [tuple(row) for row in pending]
+    }
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile"""
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies, queries, errors):
+    latencies = sorted(latencies)
+    total = sum(latencies)
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 3),
+        'mean_ms': round(total / len(latencies) * 1000, 3),
+        'throughput_rps': round(len(latencies) / total, 1) if total else None,
+        'queries_per_request': round(queries / len(latencies), 2)
+    }
+
+
+def run_scenario(driver, counter, scenarios, name, count, expected_statuses):
+    latencies = []
+    queries = 0
+    errors = 0
+    operation = getattr(scenarios, name)
+
+    for _ in range(count):
+        method, path, payload, headers = operation()
+        before = counter.count
+        started = time.perf_counter()
+        status, body = driver.request(method, path, json=payload, headers=headers)
+        latencies.append(time.perf_counter() - started)
+        queries += counter.count - before
+
+        if status not in expected_statuses:
+            errors += 1
+        elif name == 'product_create':
+            scenarios.created_products.append((body['product']['id'], body['product']['user_id']))
+
+    return summarize(latencies, queries, errors)
+
+
+def run(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        app = build_app(os.path.join(tmp, 'benchmark.db'), args.with_cache)
+
+        with app.app_context():
+            from flask_jwt_extended import create_access_token
+            from backend.app import db
+            from backend.generate_data import generate
+
+            db.create_all()
+            started = time.perf_counter()
+            sizes = generate(
+                users=args.users, products=args.products, services=args.services,
+                trades=args.trades, favorites=args.favorites, seed=args.seed
+            )
+            print(f"Dataset {sizes} built in {time.perf_counter() - started:.1f}s")
+
+            fixtures = load_fixtures()
+            tokens = {user_id: create_access_token(identity=user_id) for user_id in fixtures['user_ids']}
+            counter = QueryCounter(db.engine)
+
+        driver = ServerDriver(app) if args.server else TestClientDriver(app)
+        scenarios = Scenarios(random.Random(args.seed), tokens, fixtures)
+
+        # Write scenarios consume fixtures, so cap them by what the dataset holds
+        trade_budget = len(fixtures['pending_trades']) // 2
+        # Trades may already be closed by an earlier accept that sold out their products (409)
+        plan = [(name, args.requests, (200,)) for name in READ_SCENARIOS] + [
+            ('product_create', args.requests, (201,)),
+            ('product_update', args.requests, (200,)),
+            ('product_delete', args.requests, (200,)),
+            ('trade_accept', min(args.requests, trade_budget), (200, 409)),
+            ('trade_decline', min(args.requests, trade_budget), (200, 409))
+        ]
+
+        results = {}
+        try:
+            for name, count, expected_statuses in plan:
+                if count <= 0:
+                    continue
+                # Warm-up requests are not measured (taxonomy and statement caches)
+                if name in READ_SCENARIOS:
+                    for _ in range(args.warmup):
+                        method, path, payload, headers = getattr(scenarios, name)()
+                        driver.request(method, path, json=payload, headers=headers)
+                results[name] = run_scenario(driver, counter, scenarios, name, count, expected_statuses)
+        finally:
+            driver.close()
+
+    return {
+        'meta': {
+            'dataset': sizes,
+            'seed': args.seed,
+            'requests_per_scenario': args.requests,
+            'driver': 'server' if args.server else 'test_client',
+            'response_cache': args.with_cache,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'recorded_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+        },
+        'scenarios': results
+    }
+
+
+def print_results(results, baseline=None):
+    base = (baseline or {}).get('scenarios', {})
+    print(f"\n{'scenario':<16}{'p50':>9}{'p95':>9}{'p99':>9}{'rps':>9}{'queries':>9}{'errors':>8}  vs baseline p95")
+    for name, stats in results['scenarios'].items():
+        line = (
+            f"{name:<16}{stats['p50_ms']:>9.2f}{stats['p95_ms']:>9.2f}{stats['p99_ms']:>9.2f}"
+            f"{stats['throughput_rps']:>9.1f}{stats['queries_per_request']:>9.2f}{stats['errors']:>8}"
+        )
+        if name in base:
+            change = (stats['p95_ms'] - base[name]['p95_ms']) / base[name]['p95_ms'] * 100
+            line += f"  {change:+.0f}%"
+        print(line)
+
+
+def find_regressions(results, baseline, tolerance):
+    regressions = []
+    for name, stats in results['scenarios'].items():
+        base = baseline.get('scenarios', {}).get(name)
+        if base is None:
+            continue
+
+        allowed_ms = base['p95_ms'] * (1 + tolerance)
+        if stats['p95_ms'] > allowed_ms and stats['p95_ms'] - base['p95_ms'] > LATENCY_FLOOR_MS:
+            regressions.append(f"{name}: p95 {stats['p95_ms']:.2f}ms > {allowed_ms:.2f}ms allowed")
+        if stats['queries_per_request'] > base['queries_per_request'] + 0.5:
+            regressions.append(
+                f"{name}: {stats['queries_per_request']} queries/request > {base['queries_per_request']} in baseline"
+            )
+        if stats['errors'] > base.get('errors', 0):
+            regressions.append(f"{name}: {stats['errors']} errors > {base.get('errors', 0)} in baseline")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the SwapCycle API')
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--products', type=int, default=5000)
+    parser.add_argument('--services', type=int, default=2000)
+    parser.add_argument('--trades', type=int, default=2000)
+    parser.add_argument('--favorites', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--requests', type=int, default=100, help='Measured requests per scenario')
+    parser.add_argument('--warmup', type=int, default=5, help='Unmeasured requests per read scenario')
+    parser.add_argument('--server', action='store_true', help='Drive a local WSGI server over HTTP')
+    parser.add_argument('--with-cache', action='store_true', help='Keep the response cache enabled')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--update-baseline', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=0.5, help='Allowed p95 slowdown ratio')
+    parser.add_argument('--output', help='Also write the results to this JSON file')
+    args = parser.parse_args()
+
+    results = run(args)
+
+    baseline = None
+    if os.path.exists(args.baseline) and not args.update_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    print_results(results, baseline)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nBaseline written to {args.baseline}")
+        return
+
+    if baseline is None:
+        print("\nNo baseline to compare with; record one with --update-baseline")
+        return
+
+    for key in ('dataset', 'driver', 'response_cache'):
+        if baseline['meta'].get(key) != results['meta'][key]:
+            print(f"\nWarning: {key} differs from the baseline's; comparisons are approximate")
+
+    regressions = find_regressions(results, baseline, args.tolerance)
+    if regressions:
+        print("\nREGRESSIONS:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+
+    print("\nOK: no regressions against baseline")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+"""Fire concurrent accepts at trades competing for the same product.
+
+Creates a throwaway SQLite database with one product of limited quantity and
+many pending trades requesting it, then accepts all of them at once through the
+API. Exactly `quantity` trades must end up accepted and every other trade must
+be auto-declined.
+
+    python benchmarks/stress_trade_accept.py --trades 300 --quantity 5 --workers 50
+"""
+import sys
+import os
+import argparse
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def build_app(database_path):
+    os.environ['DATABASE_URL'] = f'sqlite:///{database_path}'
+
+    from config import Config
+    Config.SQLALCHEMY_DATABASE_URI = os.environ['DATABASE_URL']
+    Config.SQLITE_BUSY_TIMEOUT_MS = 30000
+
+    from backend.app import create_app
+    return create_app()
+
+
+def create_fixtures(trade_count, quantity):
+    from backend.app import db
+    from backend.models.user import User
+    from backend.models.product import Product
+    from backend.models.trade import Trade
+    from backend.seed_data import seed_product_categories
+
+    db.create_all()
+    seed_product_categories()
+
+    def make_user(username):
+        user = User(email=f'{username}@example.com', username=username, name='Stress',
+                    surname='Test', address='Stress Street 1')
+        user.password_hash = 'not-used'
+        db.session.add(user)
+        return user
+
+    owner = make_user('owner')
+    proposer = make_user('proposer')
+    db.session.flush()
+
+    requested = Product(name='Last units', estimated_value=100, condition='new', quantity=quantity,
+                        address='Stress Street 1', user_id=owner.id, category_id=1)
+    db.session.add(requested)
+
+    offered = [
+        Product(name=f'Offer {i}', estimated_value=10, condition='good', quantity=1,
+                address='Stress Street 2', user_id=proposer.id, category_id=1)
+        for i in range(trade_count)
+    ]
+    db.session.add_all(offered)
+    db.session.flush()
+
+    trades = [
+        Trade(proposer_id=proposer.id, receiver_id=owner.id,
+              offered_product_id=product.id, requested_product_id=requested.id)
+        for product in offered
+    ]
+    db.session.add_all(trades)
+    db.session.commit()
+
+    return owner.id, requested.id, [trade.id for trade in trades]
+
+
+def run(trade_count, quantity, workers):
+    database = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+    database.close()
+
+    try:
+        app = build_app(database.name)
+
+        with app.app_context():
+            from flask_jwt_extended import create_access_token
+            owner_id, product_id, trade_ids = create_fixtures(trade_count, quantity)
+            headers = {'Authorization': f'Bearer {create_access_token(identity=owner_id)}'}
+
+        def accept(trade_id):
+            response = app.test_client().post(f'/api/trades/{trade_id}/accept', headers=headers)
+            return response.status_code
+
+        print(f"Accepting {trade_count} trades for a product with quantity {quantity} "
+              f"using {workers} concurrent workers...")
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            status_codes = Counter(executor.map(accept, trade_ids))
+        elapsed = time.perf_counter() - started
+
+        with app.app_context():
+            from backend.app import db
+            from backend.models.product import Product
+            from backend.models.trade import Trade
+
+            product = db.session.get(Product, product_id)
+            statuses = Counter(status for (status,) in db.session.query(Trade.status).all())
+
+        print(f"Finished in {elapsed:.2f}s ({trade_count / elapsed:.0f} accepts/s)")
+        print(f"HTTP responses: {dict(status_codes)}")
+        print(f"Trade statuses: {dict(statuses)}")
+        print(f"Product quantity={product.quantity} availability={product.availability_status} "
+              f"pending_trade_count={product.pending_trade_count}")
+
+        failures = []
+        if statuses['accepted'] != quantity:
+            failures.append(f"expected {quantity} accepted trades, got {statuses['accepted']}")
+        if status_codes[200] != statuses['accepted']:
+            failures.append('successful responses do not match accepted trades')
+        if product.quantity != 0 or product.availability_status != 'unavailable':
+            failures.append('product was not sold out exactly')
+        if statuses['pending'] or product.pending_trade_count:
+            failures.append('pending trades remain on a sold-out product')
+
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        if not failures:
+            print("OK: no overselling")
+
+        return not failures
+
+    finally:
+        os.unlink(database.name)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Concurrent trade acceptance stress test')
+    parser.add_argument('--trades', type=int, default=300)
+    parser.add_argument('--quantity', type=int, default=5)
+    parser.add_argument('--workers', type=int, default=50)
+    args = parser.parse_args()
+
+    sys.exit(0 if run(args.trades, args.quantity, args.workers) else 1)
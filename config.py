@@ -6,9 +6,73 @@ load_dotenv()
 class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or 'jwt-secret-key-change-in-production'
+    JWT_TOKEN_LOCATION = ['headers']  # /api/events/stream also reads ?jwt=, as EventSource cannot send headers
+    USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL', 60))  # seconds other workers may see a stale user; 0 disables
+    USER_CACHE_MAX_ENTRIES = int(os.environ.get('USER_CACHE_MAX_ENTRIES', 1000))
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')  # Werkzeug method; changes rehash on login
+    PASSWORD_SALT_LENGTH = int(os.environ.get('PASSWORD_SALT_LENGTH', 16))
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 2))  # Hashes computed at once per process
+    PASSWORD_HASH_QUEUE_SIZE = int(os.environ.get('PASSWORD_HASH_QUEUE_SIZE', 16))  # Waiting beyond this gets a 503
+    LOGIN_MAX_ATTEMPTS_PER_IP = int(os.environ.get('LOGIN_MAX_ATTEMPTS_PER_IP', 20))
+    LOGIN_MAX_ATTEMPTS_PER_EMAIL = int(os.environ.get('LOGIN_MAX_ATTEMPTS_PER_EMAIL', 5))
+    LOGIN_RATE_WINDOW_SECONDS = int(os.environ.get('LOGIN_RATE_WINDOW_SECONDS', 300))
+    RATE_LIMIT_BACKEND = os.environ.get('RATE_LIMIT_BACKEND', 'memory')  # memory counts per worker process; sqlite is shared by the host's workers
+    RATE_LIMIT_PATH = os.environ.get('RATE_LIMIT_PATH') or 'rate_limit.db'
+    TRUSTED_PROXY_HOPS = int(os.environ.get('TRUSTED_PROXY_HOPS', 0))  # Proxies whose X-Forwarded-For is trusted; 1 behind the Vite dev proxy
+    INTERNAL_API_TOKEN = os.environ.get('INTERNAL_API_TOKEN')  # X-Internal-Token for /metrics and cache stats; unset allows loopback clients only
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///swapcycle.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 10))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 20))
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', 30))  # seconds to wait for a free connection
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 1800))  # seconds
+    DB_POOL_PRE_PING = os.environ.get('DB_POOL_PRE_PING', 'true').lower() == 'true'
+    DB_STATEMENT_TIMEOUT_MS = int(os.environ.get('DB_STATEMENT_TIMEOUT_MS', 30000))  # PostgreSQL/MySQL; 0 disables
+    DATABASE_REPLICA_URL = os.environ.get('DATABASE_REPLICA_URL')  # Read-only views query it when set
+    DATABASE_REPLICA_LAG_SECONDS = float(os.environ.get('DATABASE_REPLICA_LAG_SECONDS', 5))  # Writers read the primary this long
+    SQLITE_JOURNAL_MODE = os.environ.get('SQLITE_JOURNAL_MODE', 'wal')
+    SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS', 'normal')
+    SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000))
+    SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', 268435456))  # bytes; 0 disables
     UPLOAD_FOLDER = os.environ.get('UPLOAD_FOLDER') or 'backend/static/uploads'
     MAX_CONTENT_LENGTH = int(os.environ.get('MAX_CONTENT_LENGTH', 16777216))
     GOOGLE_MAPS_API_KEY = os.environ.get('GOOGLE_MAPS_API_KEY')
     EXCHANGE_RATE_API_KEY = os.environ.get('EXCHANGE_RATE_API_KEY')
+    GEOCODING_API_URL = os.environ.get('GEOCODING_API_URL') or 'https://maps.googleapis.com/maps/api/geocode/json'
+    EXCHANGE_RATE_API_URL = os.environ.get('EXCHANGE_RATE_API_URL') or 'https://v6.exchangerate-api.com/v6'
+    OUTBOUND_TIMEOUT = float(os.environ.get('OUTBOUND_TIMEOUT', 10))  # seconds per upstream call
+    OUTBOUND_DEADLINE_SECONDS = float(os.environ.get('OUTBOUND_DEADLINE_SECONDS', 15))  # All upstream calls of one request
+    OUTBOUND_MAX_CONNECTIONS = int(os.environ.get('OUTBOUND_MAX_CONNECTIONS', 20))
+    OUTBOUND_MAX_KEEPALIVE = int(os.environ.get('OUTBOUND_MAX_KEEPALIVE', 10))
+    OUTBOUND_KEEPALIVE_SECONDS = float(os.environ.get('OUTBOUND_KEEPALIVE_SECONDS', 30))
+    OUTBOUND_POOLS = int(os.environ.get('OUTBOUND_POOLS', 4))  # Upstream hosts kept in the connection pool
+    OUTBOUND_PROVIDER_CONCURRENCY = int(os.environ.get('OUTBOUND_PROVIDER_CONCURRENCY', 8))  # Blocking calls in flight per provider
+    OUTBOUND_RETRIES = int(os.environ.get('OUTBOUND_RETRIES', 2))  # Retries of failed GETs; 0 disables
+    OUTBOUND_RETRY_BACKOFF = float(os.environ.get('OUTBOUND_RETRY_BACKOFF', 0.2))  # seconds, doubled per retry plus jitter
+    GEOCODING_CONCURRENCY = int(os.environ.get('GEOCODING_CONCURRENCY', 8))  # Parallel calls per batch
+    CIRCUIT_BREAKER_FAILURES = int(os.environ.get('CIRCUIT_BREAKER_FAILURES', 5))  # Consecutive failures that open it
+    CIRCUIT_BREAKER_RESET_SECONDS = float(os.environ.get('CIRCUIT_BREAKER_RESET_SECONDS', 30))
+    EVENT_STREAM_HEARTBEAT_SECONDS = int(os.environ.get('EVENT_STREAM_HEARTBEAT_SECONDS', 15))
+    EVENT_STREAM_BUFFER_SIZE = int(os.environ.get('EVENT_STREAM_BUFFER_SIZE', 100))
+    EVENT_STREAM_POLL_SECONDS = float(os.environ.get('EVENT_STREAM_POLL_SECONDS', 1))  # Delay for events written by other workers
+    EVENT_STREAM_MAX_CONNECTIONS = int(os.environ.get('EVENT_STREAM_MAX_CONNECTIONS', 32))  # Per worker; serve.py adds a thread for each
+    RESPONSE_CACHE_BACKEND = os.environ.get('RESPONSE_CACHE_BACKEND', 'memory')  # memory, sqlite, none
+    RESPONSE_CACHE_TTL = int(os.environ.get('RESPONSE_CACHE_TTL', 60))
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get('RESPONSE_CACHE_MAX_ENTRIES', 1000))
+    RESPONSE_CACHE_PATH = os.environ.get('RESPONSE_CACHE_PATH') or 'response_cache.db'
+    COMPRESSION_ENABLED = os.environ.get('COMPRESSION_ENABLED', 'true').lower() == 'true'
+    COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', 500))  # bytes
+    PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', 'false').lower() == 'true'
+    PROFILING_SLOW_REQUEST_MS = int(os.environ.get('PROFILING_SLOW_REQUEST_MS', 500))
+    PROFILING_SAMPLE_RATE = float(os.environ.get('PROFILING_SAMPLE_RATE', 0.0))  # Share of requests profiled
+    PROFILING_PROFILER = os.environ.get('PROFILING_PROFILER', 'cprofile')  # cprofile, pyinstrument
+    PROFILING_DUMP_DIR = os.environ.get('PROFILING_DUMP_DIR') or 'profiles'
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() == 'true'
+    METRICS_DIR = os.environ.get('METRICS_DIR')  # Shared by worker processes; unset for a single process
+    METRICS_WRITE_INTERVAL = int(os.environ.get('METRICS_WRITE_INTERVAL', 5))  # seconds
+    SERVER_BIND = os.environ.get('SERVER_BIND', '0.0.0.0:5001')
+    SERVER_WORKERS = int(os.environ.get('SERVER_WORKERS', 0))  # 0 picks 2 x CPUs + 1
+    SERVER_THREADS = int(os.environ.get('SERVER_THREADS', 4))  # Per worker, for requests; event streams get their own
+    SERVER_TIMEOUT = int(os.environ.get('SERVER_TIMEOUT', 30))  # seconds
+    SERVER_GRACEFUL_TIMEOUT = int(os.environ.get('SERVER_GRACEFUL_TIMEOUT', 30))  # seconds to finish requests on reload/stop
+    SERVER_MAX_REQUESTS = int(os.environ.get('SERVER_MAX_REQUESTS', 0))  # Recycle workers after this many requests; 0 disables
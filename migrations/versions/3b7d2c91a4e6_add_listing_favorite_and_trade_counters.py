@@ -0,0 +1,53 @@
+"""Add favorite and pending trade counters to products and services
+
+Revision ID: 3b7d2c91a4e6
+Revises: 2665985ea24b
+Create Date: 2026-10-19 09:12:41.208113
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b7d2c91a4e6'
+down_revision = '2665985ea24b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('product', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('favorite_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('pending_trade_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.create_index('ix_product_availability_favorite_count', ['availability_status', 'favorite_count'], unique=False)
+        batch_op.create_index('ix_product_availability_pending_trade_count', ['availability_status', 'pending_trade_count'], unique=False)
+
+    with op.batch_alter_table('service', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('favorite_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('pending_trade_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.create_index('ix_service_availability_favorite_count', ['availability_status', 'favorite_count'], unique=False)
+        batch_op.create_index('ix_service_availability_pending_trade_count', ['availability_status', 'pending_trade_count'], unique=False)
+
+    # Backfill counters from existing favorites and pending trades
+    for table in ('product', 'service'):
+        op.execute(
+            f"UPDATE {table} SET "
+            f"favorite_count = (SELECT COUNT(*) FROM favorite WHERE favorite.{table}_id = {table}.id), "
+            f"pending_trade_count = (SELECT COUNT(*) FROM trade WHERE trade.status = 'pending' AND "
+            f"(trade.offered_{table}_id = {table}.id OR trade.requested_{table}_id = {table}.id))"
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('service', schema=None) as batch_op:
+        batch_op.drop_index('ix_service_availability_pending_trade_count')
+        batch_op.drop_index('ix_service_availability_favorite_count')
+        batch_op.drop_column('pending_trade_count')
+        batch_op.drop_column('favorite_count')
+
+    with op.batch_alter_table('product', schema=None) as batch_op:
+        batch_op.drop_index('ix_product_availability_pending_trade_count')
+        batch_op.drop_index('ix_product_availability_favorite_count')
+        batch_op.drop_column('pending_trade_count')
+        batch_op.drop_column('favorite_count')
@@ -0,0 +1,28 @@
+"""Add composite indexes for trade inbox and outbox queries
+
+Revision ID: 5e21c7f0b9d3
+Revises: 3b7d2c91a4e6
+Create Date: 2026-10-19 10:03:17.554920
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e21c7f0b9d3'
+down_revision = '3b7d2c91a4e6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('trade', schema=None) as batch_op:
+        batch_op.create_index('ix_trade_receiver_status_created', ['receiver_id', 'status', 'created_at'], unique=False)
+        batch_op.create_index('ix_trade_proposer_status_created', ['proposer_id', 'status', 'created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('trade', schema=None) as batch_op:
+        batch_op.drop_index('ix_trade_proposer_status_created')
+        batch_op.drop_index('ix_trade_receiver_status_created')
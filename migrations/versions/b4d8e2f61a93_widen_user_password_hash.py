@@ -0,0 +1,32 @@
+"""Widen user.password_hash for scrypt hashes and stronger parameters
+
+Revision ID: b4d8e2f61a93
+Revises: 7a4f18d6c2b0
+Create Date: 2026-10-19 16:05:12.418206
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4d8e2f61a93'
+down_revision = '7a4f18d6c2b0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.alter_column('password_hash',
+               existing_type=sa.String(length=128),
+               type_=sa.String(length=256),
+               existing_nullable=False)
+
+
+def downgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.alter_column('password_hash',
+               existing_type=sa.String(length=256),
+               type_=sa.String(length=128),
+               existing_nullable=False)
@@ -0,0 +1,37 @@
+"""Add stream_event table shared by the event streams of all workers
+
+Revision ID: c6f3a9d1e7b4
+Revises: b4d8e2f61a93
+Create Date: 2026-10-19 18:42:07.531964
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c6f3a9d1e7b4'
+down_revision = 'b4d8e2f61a93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('stream_event',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('event_type', sa.String(length=40), nullable=False),
+    sa.Column('data', sa.JSON(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sqlite_autoincrement=True
+    )
+    with op.batch_alter_table('stream_event', schema=None) as batch_op:
+        batch_op.create_index('ix_stream_event_user_id_id', ['user_id', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('stream_event', schema=None) as batch_op:
+        batch_op.drop_index('ix_stream_event_user_id_id')
+
+    op.drop_table('stream_event')
@@ -0,0 +1,38 @@
+"""Make trade.created_at NOT NULL, since keyset cursors sort and encode it
+
+Revision ID: d2a7f5c8b3e1
+Revises: c6f3a9d1e7b4
+Create Date: 2026-10-19 21:14:36.905127
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# Current time in the format SQLAlchemy stores DateTime values in on SQLite
+NOW = "strftime('%Y-%m-%d %H:%M:%f000', 'now')"
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2a7f5c8b3e1'
+down_revision = 'c6f3a9d1e7b4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Rows inserted without it fall back to their last update, else to now
+    op.execute(f"UPDATE trade SET created_at = COALESCE(updated_at, {NOW}) WHERE created_at IS NULL")
+
+    with op.batch_alter_table('trade', schema=None) as batch_op:
+        batch_op.alter_column('created_at',
+               existing_type=sa.DateTime(),
+               nullable=False,
+               server_default=sa.text(f'({NOW})'))
+
+
+def downgrade():
+    with op.batch_alter_table('trade', schema=None) as batch_op:
+        batch_op.alter_column('created_at',
+               existing_type=sa.DateTime(),
+               nullable=True,
+               server_default=None)
@@ -0,0 +1,172 @@
+"""Production entry point: the app under gunicorn with preforked, threaded workers.
+
+The app is created and its caches warmed once in the master process, then
+forked, so workers share those pages copy-on-write and answer their first
+request warm. run.py remains the development server.
+
+Event streams (/api/events/stream) reach clients on any worker: events are
+written to the stream_event table and each worker polls it while it has
+subscribers. An open stream holds a worker thread for its whole life, so each
+worker gets EVENT_STREAM_MAX_CONNECTIONS threads for streams on top of its
+SERVER_THREADS for requests, and answers 503 beyond that many streams; open
+streams can never starve ordinary requests. The server holds at most
+workers x EVENT_STREAM_MAX_CONNECTIONS streams in total.
+
+With more than one worker, the response cache and the login rate limits move
+to local SQLite files every worker shares (RESPONSE_CACHE_PATH, RATE_LIMIT_PATH),
+so a write invalidates cached responses, users and favorites in all of them.
+
+    python serve.py                                   # SERVER_* settings from the environment
+    python serve.py --workers 4 --threads 8 --bind 127.0.0.1:8000
+
+Signals to the master process:
+    HUP     graceful restart: new workers replace old ones after they finish their requests
+    USR2    re-exec the master with new code next to the old one; then send WINCH and
+            TERM to the old master to retire it, for zero-downtime code reloads
+    TERM    graceful shutdown within SERVER_GRACEFUL_TIMEOUT
+"""
+import sys
+import os
+import argparse
+import glob
+import multiprocessing
+import time
+
+WARM_PATHS = [
+    '/api/utils/categories/all',
+    '/api/products/categories',
+    '/api/services/categories',
+    '/api/search/categories'
+]
+
+
+def warm_caches(app):
+    """Fill the caches every worker would otherwise build on its first requests"""
+    from backend.services.taxonomy_service import TaxonomyService
+    from backend.services.exchange_service import ExchangeService
+
+    with app.app_context():
+        TaxonomyService.warm()
+        # Fetches once here instead of once per worker when the rates file is stale
+        ExchangeService.get_exchange_rates()
+
+    # Cached category responses land in the response cache shared by the forks
+    client = app.test_client()
+    for path in WARM_PATHS:
+        client.get(path)
+
+
+def post_fork(server, worker):
+    from backend.app import db
+    from backend.utils.metrics import metrics
+
+    # Pooled connections opened by the master must not be shared between processes
+    with server.app.application.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+    metrics.reset()
+
+
+def worker_exit(server, worker):
+    from backend.utils.metrics import metrics
+
+    app = server.app.application
+    directory = app.config.get('METRICS_DIR')
+    if directory:
+        # Keep this worker's final counts in the aggregated /metrics
+        with app.app_context():
+            metrics.write_snapshot(directory)
+
+
+def worker_count(config, args):
+    return args.workers or config['SERVER_WORKERS'] or multiprocessing.cpu_count() * 2 + 1
+
+
+def share_state_between_workers(config):
+    """Move per-process stores to ones every worker on the host sees"""
+    if config.RESPONSE_CACHE_BACKEND == 'memory':
+        # Invalidations would only reach the worker that handled the write. Its
+        # version counters also tag the user and favorites caches of every worker.
+        config.RESPONSE_CACHE_BACKEND = 'sqlite'
+    elif config.RESPONSE_CACHE_BACKEND != 'sqlite':
+        sys.exit("Several workers need RESPONSE_CACHE_BACKEND=sqlite: its version counters "
+                 "invalidate the user and favorites caches of every worker")
+    if config.RATE_LIMIT_BACKEND == 'memory':
+        # Otherwise each worker allows the full login limit on its own
+        config.RATE_LIMIT_BACKEND = 'sqlite'
+
+
+def build_options(config, args):
+    workers = worker_count(config, args)
+    return {
+        'bind': args.bind or config['SERVER_BIND'],
+        'workers': workers,
+        # Streams get their own threads, so requests keep all of SERVER_THREADS
+        'threads': (args.threads or config['SERVER_THREADS']) + config['EVENT_STREAM_MAX_CONNECTIONS'],
+        'worker_class': 'gthread',
+        'preload_app': True,
+        'timeout': config['SERVER_TIMEOUT'],
+        'graceful_timeout': config['SERVER_GRACEFUL_TIMEOUT'],
+        'max_requests': config['SERVER_MAX_REQUESTS'],
+        'max_requests_jitter': config['SERVER_MAX_REQUESTS'] // 10,
+        'keepalive': 5,
+        'accesslog': '-' if args.access_log else None,
+        'post_fork': post_fork,
+        'worker_exit': worker_exit
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve SwapCycle with preforked gunicorn workers')
+    parser.add_argument('--bind', help='host:port (defaults to SERVER_BIND)')
+    parser.add_argument('--workers', type=int, help='Worker processes (defaults to SERVER_WORKERS)')
+    parser.add_argument('--threads', type=int, help='Request threads per worker (defaults to SERVER_THREADS)')
+    parser.add_argument('--access-log', action='store_true', help='Log every request to stdout')
+    args = parser.parse_args()
+
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        sys.exit("gunicorn is required to serve in production: pip install gunicorn")
+
+    # Workers publish metrics snapshots so /metrics covers all of them; Config reads this at import
+    os.environ.setdefault('METRICS_DIR', 'metrics')
+
+    from config import Config
+    # Before create_app, which builds the stores from Config
+    if worker_count(vars(Config), args) > 1:
+        share_state_between_workers(Config)
+
+    started = time.perf_counter()
+    from backend.app import create_app
+    app = create_app()
+    warm_caches(app)
+
+    directory = app.config.get('METRICS_DIR')
+    if directory:
+        # Snapshots of a previous run's workers would be added to this run's counters
+        for path in glob.glob(os.path.join(directory, '*.json')):
+            os.remove(path)
+
+    options = build_options(app.config, args)
+    print(f"App loaded and caches warmed in {time.perf_counter() - started:.2f}s; "
+          f"starting {options['workers']} workers x {options['threads']} threads on {options['bind']}")
+
+    class SwapCycleServer(BaseApplication):
+        def __init__(self, application, options):
+            self.application = application
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return self.application
+
+    SwapCycleServer(app, options).run()
+
+
+if __name__ == '__main__':
+    main()
@@ -17,6 +17,11 @@ api.interceptors.request.use(
    if (token) {
      config.headers.Authorization = `Bearer ${token}`;
    }
+   // Lets the API read from the primary database right after our own writes
+   const readAfter = sessionStorage.getItem('readAfter');
+   if (readAfter) {
+     config.headers['X-Read-After'] = readAfter;
+   }
    return config;
  },
  (error) => {
@@ -27,6 +32,10 @@ api.interceptors.request.use(
 // FIX: Interceptor to handle error responses (auto logout on invalid token)
 api.interceptors.response.use(
  (response) => {
+   const readAfter = response.headers['x-read-after'];
+   if (readAfter) {
+     sessionStorage.setItem('readAfter', readAfter);
+   }
    return response;
  },
  (error) => {
@@ -0,0 +1,124 @@
+import os
+import tempfile
+
+# Config reads the environment once at import, so point it at scratch files first
+_scratch = tempfile.mkdtemp(prefix='swapcycle-tests-')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(_scratch, 'test.db')}"
+os.environ['RESPONSE_CACHE_BACKEND'] = 'memory'
+os.environ['RATE_LIMIT_BACKEND'] = 'memory'
+os.environ['PROFILING_ENABLED'] = 'false'
+os.environ.pop('METRICS_DIR', None)
+os.environ.pop('DATABASE_REPLICA_URL', None)
+
+import pytest
+from flask_jwt_extended import create_access_token
+from backend.app import create_app, db as _db
+from backend.models.user import User
+from backend.models.product import Product, ProductCategory
+from backend.models.service import Service, ServiceCategory
+from backend.models.trade import Trade
+from backend.services.cache_service import response_cache
+from backend.services.favorite_service import FavoriteService
+from backend.services.user_cache import user_cache
+
+
+@pytest.fixture(scope='session')
+def app():
+    return create_app()
+
+
+@pytest.fixture
+def scratch_dir():
+    return _scratch
+
+
+@pytest.fixture
+def db(app):
+    """A fresh schema per test, with every in-process cache emptied"""
+    with app.app_context():
+        _db.create_all()
+        yield _db
+        _db.session.remove()
+        _db.drop_all()
+
+    response_cache.clear()
+    user_cache.clear()
+    with FavoriteService._lock:
+        FavoriteService._cache.clear()
+
+
+@pytest.fixture
+def client(app, db):
+    return app.test_client()
+
+
+@pytest.fixture
+def make_user(db):
+    counter = iter(range(1, 1000))
+
+    def make_user(**values):
+        n = next(counter)
+        user = User(
+            email=f'user{n}@example.com', username=f'user{n}', password_hash='x',
+            name='Test', surname=f'User {n}', address='Carrer de Mallorca 1, Barcelona', **values
+        )
+        db.session.add(user)
+        db.session.commit()
+        return user
+
+    return make_user
+
+
+@pytest.fixture
+def make_product(db):
+    def make_product(user, **values):
+        category = ProductCategory.query.first()
+        if category is None:
+            category = ProductCategory(name='Electronics')
+            db.session.add(category)
+        values.setdefault('quantity', 1)
+        product = Product(
+            name='Camera', estimated_value=100, condition='good',
+            address='Carrer de Mallorca 1, Barcelona', user_id=user.id, category=category, **values
+        )
+        db.session.add(product)
+        db.session.commit()
+        return product
+
+    return make_product
+
+
+@pytest.fixture
+def make_service(db):
+    def make_service(user, **values):
+        category = ServiceCategory.query.first()
+        if category is None:
+            category = ServiceCategory(name='Lessons')
+            db.session.add(category)
+        service = Service(name='Guitar lessons', estimated_value=30, is_online=True,
+                          user_id=user.id, category=category, **values)
+        db.session.add(service)
+        db.session.commit()
+        return service
+
+    return make_service
+
+
+@pytest.fixture
+def make_trade(db):
+    def make_trade(proposer, receiver, **items):
+        trade = Trade(proposer_id=proposer.id, receiver_id=receiver.id, status='pending', **items)
+        db.session.add(trade)
+        db.session.commit()
+        return trade
+
+    return make_trade
+
+
+@pytest.fixture
+def auth_headers(app):
+    def auth_headers(user):
+        with app.app_context():
+            return {'Authorization': f'Bearer {create_access_token(identity=user.id)}'}
+
+    return auth_headers
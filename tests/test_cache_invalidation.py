@@ -0,0 +1,206 @@
+import os
+import subprocess
+import sys
+import textwrap
+import pytest
+from sqlalchemy import event
+from backend.models.favorite import Favorite
+from backend.models.product import ProductCategory
+from backend.models.user import User
+from backend.services.cache_service import SQLiteCacheBackend, response_cache
+from backend.services.favorite_service import FavoriteService
+from backend.services.trade_service import TradeService
+from backend.services.user_cache import user_cache
+
+ENTITY_TYPES = ['favorite', 'product', 'service', 'taxonomy', 'trade']
+
+
+def versions():
+    return dict(zip(ENTITY_TYPES, response_cache.backend.get_versions(ENTITY_TYPES)))
+
+
+def bumped(before):
+    after = versions()
+    return {name for name in ENTITY_TYPES if after[name] != before[name]}
+
+
+def test_listing_write_invalidates_cached_listings(client, db, make_user, make_product):
+    product = make_product(make_user())
+
+    assert client.get('/api/products/').headers['X-Cache'] == 'MISS'
+    assert client.get('/api/products/').headers['X-Cache'] == 'HIT'
+
+    product.name = 'Film camera'
+    db.session.commit()
+
+    response = client.get('/api/products/')
+    assert response.headers['X-Cache'] == 'MISS'
+    assert 'Film camera' in response.get_data(as_text=True)
+
+
+def test_personalised_requests_are_not_cached(client, db, make_user, make_product, auth_headers):
+    user = make_user()
+    make_product(user)
+
+    response = client.get('/api/products/', headers=auth_headers(user))
+    assert response.headers.get('X-Cache') is None
+    assert client.get('/api/products/?with_favorites=true').headers.get('X-Cache') is None
+
+
+def test_taxonomy_write_invalidates_categories(client, db):
+    client.get('/api/products/categories')
+    assert client.get('/api/products/categories').headers['X-Cache'] == 'HIT'
+
+    db.session.add(ProductCategory(name='Furniture'))
+    db.session.commit()
+
+    response = client.get('/api/products/categories')
+    assert response.headers['X-Cache'] == 'MISS'
+    assert 'Furniture' in response.get_data(as_text=True)
+
+
+@pytest.mark.parametrize('listing', ['product', 'service'])
+def test_favorite_invalidates_its_listing_type(db, make_user, make_product, make_service, listing):
+    owner, fan = make_user(), make_user()
+    item = make_product(owner) if listing == 'product' else make_service(owner)
+    before = versions()
+
+    db.session.add(Favorite(user_id=fan.id, **{f'{listing}_id': item.id}))
+    db.session.commit()
+
+    # favorite_count orders sort=popular
+    assert bumped(before) == {'favorite', listing}
+
+
+def test_trade_insert_invalidates_listing_types(db, make_user, make_product, make_service, make_trade):
+    owner, buyer = make_user(), make_user()
+    product = make_product(owner)
+    service = make_service(buyer)
+    before = versions()
+
+    make_trade(buyer, owner, requested_product_id=product.id, offered_service_id=service.id)
+
+    # pending_trade_count orders sort=most_wanted
+    assert bumped(before) == {'trade', 'product', 'service'}
+
+
+@pytest.mark.parametrize('close', ['decline', 'cancel'])
+def test_closing_a_trade_invalidates_its_listing_types(db, make_user, make_service, make_trade, close):
+    owner, buyer = make_user(), make_user()
+    service = make_service(owner)
+    trade = make_trade(buyer, owner, requested_service_id=service.id)
+    before = versions()
+
+    if close == 'decline':
+        TradeService.decline_trade(trade.id, owner.id)
+    else:
+        TradeService.cancel_trade(trade.id, buyer.id)
+
+    assert bumped(before) == {'trade', 'service'}
+
+
+def test_favorite_cache_is_dropped_when_favorites_change(db, make_user, make_product):
+    owner, fan = make_user(), make_user()
+    product = make_product(owner)
+    assert FavoriteService.get_user_favorite_ids(fan.id) == (set(), set())
+
+    db.session.add(Favorite(user_id=fan.id, product_id=product.id))
+    db.session.commit()
+
+    assert FavoriteService.get_user_favorite_ids(fan.id) == ({product.id}, set())
+
+
+def test_user_cache_is_evicted_when_the_user_changes(db, make_user):
+    user_id = make_user().id
+    db.session.remove()
+    assert user_cache.get(user_id, 60).name == 'Test'
+
+    db.session.get(User, user_id).name = 'Renamed'
+    db.session.commit()
+    db.session.remove()
+
+    assert user_cache.get(user_id, 60).name == 'Renamed'
+
+
+def test_user_cache_serves_hits_without_a_query(db, make_user):
+    user_id = make_user().id
+    db.session.remove()
+    user_cache.get(user_id, 60)
+    db.session.remove()
+
+    statements = []
+
+    def listener(connection, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    try:
+        assert user_cache.get(user_id, 60).id == user_id
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', listener)
+
+    assert statements == []
+
+
+class TestAcrossWorkers:
+    """Writes committed by another process invalidate this process's caches through the shared SQLite versions"""
+
+    @pytest.fixture(autouse=True)
+    def shared_cache(self, db, scratch_dir, monkeypatch):
+        path = os.path.join(scratch_dir, 'response_cache.db')
+        if os.path.exists(path):
+            os.remove(path)
+        monkeypatch.setattr(response_cache, 'backend', SQLiteCacheBackend(path))
+        self.cache_path = path
+
+    def run_worker(self, code):
+        """Run code in a separate process sharing the database and the cache file"""
+        script = textwrap.dedent("""
+            from backend.app import create_app, db
+            from backend.models.favorite import Favorite
+            from backend.models.user import User
+            with create_app().app_context():
+        """) + textwrap.indent(textwrap.dedent(code), '    ')
+        env = dict(os.environ, RESPONSE_CACHE_BACKEND='sqlite', RESPONSE_CACHE_PATH=self.cache_path)
+        subprocess.run([sys.executable, '-c', script], env=env, check=True, cwd=os.getcwd())
+
+    def test_listing_responses(self, client, db, make_user, make_product):
+        product = make_product(make_user())
+        client.get('/api/products/')
+        assert client.get('/api/products/').headers['X-Cache'] == 'HIT'
+
+        self.run_worker(f"""
+            db.session.execute(db.text("UPDATE product SET name = 'Film camera' WHERE id = {product.id}"))
+            from backend.services.outbox_service import OutboxService
+            OutboxService.record(db.session, 'product', [{product.id}], 'update')
+            db.session.commit()
+        """)
+
+        response = client.get('/api/products/')
+        assert response.headers['X-Cache'] == 'MISS'
+        assert 'Film camera' in response.get_data(as_text=True)
+
+    def test_favorites(self, db, make_user, make_product):
+        owner, fan = make_user(), make_user()
+        product = make_product(owner)
+        assert FavoriteService.get_user_favorite_ids(fan.id) == (set(), set())
+
+        self.run_worker(f"""
+            db.session.add(Favorite(user_id={fan.id}, product_id={product.id}))
+            db.session.commit()
+        """)
+
+        assert FavoriteService.get_user_favorite_ids(fan.id) == ({product.id}, set())
+
+    def test_users(self, db, make_user):
+        user_id = make_user().id
+        db.session.remove()
+        assert user_cache.get(user_id, 60).name == 'Test'
+
+        self.run_worker(f"""
+            db.session.get(User, {user_id}).name = 'Renamed'
+            db.session.commit()
+        """)
+        db.session.remove()
+
+        assert user_cache.get(user_id, 60).name == 'Renamed'
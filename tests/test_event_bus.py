@@ -0,0 +1,79 @@
+from datetime import datetime
+import time
+import pytest
+from sqlalchemy import insert
+from backend.models.stream_event import StreamEvent
+from backend.services.event_bus import StreamLimitReached, event_bus
+
+
+@pytest.fixture
+def bus(db, monkeypatch):
+    monkeypatch.setattr(event_bus, 'poll_interval', 0.02)
+    subscriptions = []
+
+    def subscribe(user_id, **kwargs):
+        subscription, complete = event_bus.subscribe(user_id, **kwargs)
+        subscriptions.append(subscription)
+        return subscription, complete
+
+    yield subscribe
+    for subscription in subscriptions:
+        event_bus.unsubscribe(subscription)
+
+
+def write_event(db, event_id, user_id=1):
+    """Commit an event row with a chosen id, as a transaction committing out of order would leave it"""
+    with db.engine.begin() as connection:
+        connection.execute(insert(StreamEvent.__table__), [
+            {'id': event_id, 'user_id': user_id, 'event_type': 'trade.updated', 'data': {}, 'created_at': datetime.utcnow()}
+        ])
+    event_bus.notify()
+
+
+def received(subscription, wait=0.3):
+    deadline = time.monotonic() + wait
+    ids = []
+    while time.monotonic() < deadline:
+        events, _ = subscription.get(0.05)
+        ids.extend(event['id'] for event in events)
+    return ids
+
+
+def test_new_events_reach_the_users_subscriptions(db, bus):
+    write_event(db, 1)
+    mine, _ = bus(1)
+    theirs, _ = bus(2)
+
+    write_event(db, 2)
+    write_event(db, 3, user_id=2)
+
+    assert received(mine) == [2]
+    assert received(theirs) == [3]
+
+
+def test_events_committed_behind_the_newest_are_delivered_once(db, bus):
+    subscription, _ = bus(1)
+
+    write_event(db, 5)
+    assert received(subscription) == [5]
+
+    write_event(db, 4)
+    assert received(subscription) == [4]
+    assert received(subscription) == []
+
+
+def test_replay_after_last_event_id_does_not_duplicate_polled_events(db, bus):
+    for event_id in (1, 2, 3):
+        write_event(db, event_id)
+
+    subscription, complete = bus(1, last_event_id=1)
+    write_event(db, 4)
+
+    assert complete
+    assert received(subscription) == [2, 3, 4]
+
+
+def test_subscriptions_are_capped_per_process(db, bus):
+    bus(1, max_subscriptions=1)
+    with pytest.raises(StreamLimitReached):
+        bus(2, max_subscriptions=1)
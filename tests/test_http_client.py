@@ -0,0 +1,64 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+import time
+import pytest
+import requests
+from backend.services.http_client import DeadlineExceeded, http_client
+from config import Config
+
+
+class Upstream(BaseHTTPRequestHandler):
+    """Answers /slow after a second, /unavailable with a 503 and anything else with a 200"""
+    hits = 0
+
+    def do_GET(self):
+        Upstream.hits += 1
+        if self.path.startswith('/slow'):
+            time.sleep(1)
+        self.send_response(503 if self.path.startswith('/unavailable') else 200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope='module')
+def upstream():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Upstream)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_port}'
+    server.shutdown()
+
+
+@pytest.fixture(autouse=True)
+def fast_upstream(monkeypatch):
+    monkeypatch.setattr(Config, 'OUTBOUND_RETRIES', 2)
+    monkeypatch.setattr(Config, 'OUTBOUND_RETRY_BACKOFF', 0.01)
+    Upstream.hits = 0
+
+
+def test_retries_failed_responses_and_returns_the_last(upstream):
+    response = http_client.get('test-unavailable', upstream + '/unavailable')
+
+    assert response.status_code == 503
+    assert Upstream.hits == 3
+
+
+def test_retries_stop_at_the_deadline(upstream, monkeypatch):
+    monkeypatch.setattr(Config, 'OUTBOUND_TIMEOUT', 0.3)
+    started = time.monotonic()
+
+    with pytest.raises(requests.Timeout):
+        http_client.get('test-slow', upstream + '/slow', deadline=time.monotonic() + 0.5)
+
+    # Without the deadline three attempts would take 3 x OUTBOUND_TIMEOUT
+    assert time.monotonic() - started < 0.85
+    assert Upstream.hits == 2
+
+
+def test_no_call_is_made_once_the_deadline_has_passed(upstream):
+    with pytest.raises(DeadlineExceeded):
+        http_client.get('test-ok', upstream + '/ok', deadline=time.monotonic() - 1)
+
+    assert Upstream.hits == 0
@@ -0,0 +1,135 @@
+from datetime import timedelta
+from sqlalchemy import insert, update
+from backend.models.favorite import Favorite
+from backend.models.outbox import OutboxEvent
+from backend.models.product import Product
+from backend.services.outbox_service import OutboxService
+from backend.services.trade_service import TradeService
+
+
+def entries(**filters):
+    return [(e.entity_type, e.entity_id, e.operation) for e in OutboxEvent.query.filter_by(**filters).order_by(OutboxEvent.id)]
+
+
+def last_seq():
+    return OutboxEvent.query.order_by(OutboxEvent.id.desc()).first().id
+
+
+def test_orm_writes_are_recorded(db, make_user, make_product):
+    owner = make_user()
+    product = make_product(owner)
+
+    product.name = 'Film camera'
+    db.session.commit()
+    db.session.delete(product)
+    db.session.commit()
+
+    assert entries(entity_type='product') == [
+        ('product', product.id, 'insert'),
+        ('product', product.id, 'update'),
+        ('product', product.id, 'delete'),
+    ]
+
+
+def test_rolled_back_writes_leave_no_entry(db, make_user, make_product):
+    product = make_product(make_user())
+    product.name = 'Never saved'
+    db.session.flush()
+    db.session.rollback()
+
+    assert entries(operation='update') == []
+
+
+def test_core_writes_are_recorded_with_the_statement(db, make_user, make_product):
+    owner = make_user()
+    product = make_product(owner)
+    values = {'name': 'Imported', 'estimated_value': 5, 'condition': 'new', 'address': 'Lisboa',
+              'user_id': owner.id, 'category_id': product.category_id}
+
+    result = db.session.execute(insert(Product).returning(Product.id), [values, values])
+    OutboxService.record(db.session, 'product', result.scalars().all(), 'insert')
+    db.session.commit()
+
+    assert [operation for _, _, operation in entries(entity_type='product')] == ['insert'] * 3
+
+
+def test_core_writes_are_discarded_on_rollback(db, make_user, make_product):
+    product = make_product(make_user())
+
+    db.session.execute(update(Product.__table__).where(Product.__table__.c.id == product.id).values(name='x'))
+    OutboxService.record(db.session, 'product', [product.id], 'update')
+    db.session.rollback()
+
+    assert entries(operation='update') == []
+
+
+def test_accept_records_the_trade_its_declined_siblings_and_products(db, make_user, make_product, make_trade):
+    owner, buyer, other_buyer = make_user(), make_user(), make_user()
+    product = make_product(owner, quantity=1)
+    trade = make_trade(buyer, owner, requested_product_id=product.id)
+    sibling = make_trade(other_buyer, owner, requested_product_id=product.id)
+    since = last_seq()
+
+    TradeService.accept_trade(trade.id, owner.id)
+
+    recorded = {(e.entity_type, e.entity_id) for e in OutboxService.read_changes(since)}
+    assert recorded == {('trade', trade.id), ('trade', sibling.id), ('product', product.id)}
+
+
+def test_trade_and_favorite_entries_are_visible_to_their_users_only(db, make_user, make_product, make_trade):
+    owner, buyer, stranger = make_user(), make_user(), make_user()
+    product = make_product(owner)
+    trade = make_trade(buyer, owner, requested_product_id=product.id)
+    db.session.add(Favorite(user_id=buyer.id, product_id=product.id))
+    db.session.commit()
+
+    def visible(user):
+        return {(e.entity_type, e.entity_id) for e in OutboxService.read_changes(user_id=user.id)
+                if e.entity_type in ('trade', 'favorite')}
+
+    assert ('trade', trade.id) in visible(owner)
+    assert ('trade', trade.id) in visible(buyer)
+    assert visible(stranger) == set()
+    assert {entity_type for entity_type, _ in visible(buyer)} == {'trade', 'favorite'}
+
+
+def test_changes_feed_filters_by_caller_and_type(client, db, make_user, make_product, make_trade, auth_headers):
+    owner, buyer, stranger = make_user(), make_user(), make_user()
+    product = make_product(owner)
+    make_trade(buyer, owner, requested_product_id=product.id)
+
+    feed = client.get('/api/changes/', headers=auth_headers(stranger)).get_json()
+    assert {change['type'] for change in feed['changes']} == {'product'}
+
+    feed = client.get('/api/changes/?types=trade', headers=auth_headers(buyer)).get_json()
+    assert [change['type'] for change in feed['changes']] == ['trade']
+
+    response = client.get('/api/changes/?types=user', headers=auth_headers(buyer))
+    assert response.status_code == 400
+
+
+def test_sequence_numbers_are_not_reused_after_pruning(db, make_user, make_product):
+    product = make_product(make_user())
+    last_id = last_seq()
+
+    assert OutboxService.prune(older_than=timedelta(seconds=-1)) == 1
+    product.name = 'Renamed'
+    db.session.commit()
+
+    assert OutboxEvent.query.one().id > last_id
+
+
+def test_commit_listeners_receive_changed_types(db, make_user, make_product, make_service, make_trade):
+    changed = []
+    OutboxService.on_commit(changed.append)
+    try:
+        owner, buyer = make_user(), make_user()
+        product = make_product(owner)
+        service = make_service(buyer)
+        changed.clear()
+
+        make_trade(buyer, owner, requested_product_id=product.id, offered_service_id=service.id)
+    finally:
+        OutboxService.COMMIT_LISTENERS.remove(changed.append)
+
+    assert changed == [{'trade', 'product', 'service'}]
@@ -0,0 +1,78 @@
+import os
+import time
+import pytest
+from backend.utils.rate_limit import RateLimiter, SQLiteRateLimiter
+
+
+@pytest.fixture
+def sqlite_path(scratch_dir):
+    path = os.path.join(scratch_dir, 'rate_limit.db')
+    if os.path.exists(path):
+        os.remove(path)
+    return path
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def limiter_factory(request, sqlite_path):
+    def factory(limit, window, name='login'):
+        if request.param == 'memory':
+            return RateLimiter(limit, window)
+        return SQLiteRateLimiter(sqlite_path, name, limit, window)
+
+    return factory
+
+
+def test_limit_is_enforced_per_key(limiter_factory):
+    limiter = limiter_factory(limit=2, window=60)
+
+    assert limiter.hit('1.2.3.4') == 0
+    assert limiter.hit('1.2.3.4') == 0
+    assert 0 < limiter.hit('1.2.3.4') <= 60
+    assert limiter.hit('5.6.7.8') == 0
+
+
+def test_reset_clears_a_key(limiter_factory):
+    limiter = limiter_factory(limit=1, window=60)
+    limiter.hit('a@example.com')
+    assert limiter.hit('a@example.com') > 0
+
+    limiter.reset('a@example.com')
+
+    assert limiter.hit('a@example.com') == 0
+
+
+def test_attempts_expire_after_the_window(limiter_factory):
+    limiter = limiter_factory(limit=1, window=0.05)
+    limiter.hit('key')
+    assert limiter.hit('key') > 0
+
+    time.sleep(0.06)
+
+    assert limiter.hit('key') == 0
+
+
+def test_memory_limiter_keeps_at_most_max_keys():
+    limiter = RateLimiter(limit=1, window=60, max_keys=3)
+    for key in 'abcd':
+        limiter.hit(key)
+
+    assert len(limiter._attempts) == 3
+    # The least recently attempted key was dropped, so it may try again
+    assert limiter.hit('a') == 0
+
+
+def test_sqlite_limiters_share_counts_across_workers(sqlite_path):
+    first = SQLiteRateLimiter(sqlite_path, 'login_ip', 2, 60)
+    second = SQLiteRateLimiter(sqlite_path, 'login_ip', 2, 60)
+
+    assert first.hit('1.2.3.4') == 0
+    assert second.hit('1.2.3.4') == 0
+    assert first.hit('1.2.3.4') > 0
+
+
+def test_sqlite_limiters_with_different_names_count_apart(sqlite_path):
+    by_ip = SQLiteRateLimiter(sqlite_path, 'login_ip', 1, 60)
+    by_email = SQLiteRateLimiter(sqlite_path, 'login_email', 1, 60)
+
+    assert by_ip.hit('same') == 0
+    assert by_email.hit('same') == 0
@@ -0,0 +1,119 @@
+from datetime import datetime, timedelta
+import pytest
+from backend.models.product import Product
+from backend.models.trade import Trade
+from backend.routes.trades import decode_cursor, encode_cursor
+from backend.services.trade_service import TradeError, TradeService
+
+
+@pytest.fixture
+def inbox(db, make_user, make_product, make_trade):
+    """A receiver with seven pending trades, three of them created at the same instant"""
+    owner, buyer = make_user(), make_user()
+    product = make_product(owner, quantity=10)
+    trades = [make_trade(buyer, owner, requested_product_id=product.id) for _ in range(7)]
+
+    start = datetime(2026, 1, 1)
+    for i, trade in enumerate(trades):
+        trade.created_at = start + timedelta(minutes=min(i, 3))
+    db.session.commit()
+    return owner, trades
+
+
+def test_cursor_round_trip(db, inbox):
+    _, trades = inbox
+    assert decode_cursor(encode_cursor(trades[0])) == (trades[0].created_at, trades[0].id)
+
+
+def test_inbox_pages_cover_every_trade_once_newest_first(client, inbox, auth_headers):
+    owner, trades = inbox
+    seen = []
+    cursor = None
+    while True:
+        url = '/api/trades/inbox?limit=3' + (f'&cursor={cursor}' if cursor else '')
+        page = client.get(url, headers=auth_headers(owner)).get_json()
+        seen.extend(trade['id'] for trade in page['trades'])
+        cursor = page['next_cursor']
+        if cursor is None:
+            break
+
+    expected = sorted(trades, key=lambda trade: (trade.created_at, trade.id), reverse=True)
+    assert seen == [trade.id for trade in expected]
+
+
+@pytest.mark.parametrize('cursor', ['garbage', '2026-01-01T00:00:00_x', '_1'])
+def test_invalid_cursor_is_rejected(client, inbox, auth_headers, cursor):
+    owner, _ = inbox
+    response = client.get(f'/api/trades/inbox?cursor={cursor}', headers=auth_headers(owner))
+    assert response.status_code == 400
+
+
+def test_created_at_is_filled_by_the_database_when_omitted(db, make_user):
+    owner, buyer = make_user(), make_user()
+    db.session.execute(Trade.__table__.insert().values(proposer_id=buyer.id, receiver_id=owner.id, status='pending'))
+    db.session.commit()
+
+    trade = Trade.query.one()
+    assert isinstance(trade.created_at, datetime)
+    assert encode_cursor(trade)
+
+
+def test_accept_reserves_stock_and_declines_siblings_on_sold_out_items(db, make_user, make_product, make_trade):
+    owner, buyer, other_buyer = make_user(), make_user(), make_user()
+    product = make_product(owner, quantity=1)
+    trade = make_trade(buyer, owner, requested_product_id=product.id)
+    sibling = make_trade(other_buyer, owner, requested_product_id=product.id)
+
+    accepted, declined_ids = TradeService.accept_trade(trade.id, owner.id)
+
+    assert accepted.status == 'accepted'
+    assert declined_ids == [sibling.id]
+    assert db.session.get(Trade, sibling.id).status == 'declined'
+    product = db.session.get(Product, product.id)
+    assert (product.quantity, product.availability_status, product.pending_trade_count) == (0, 'unavailable', 0)
+
+
+def test_accept_keeps_siblings_while_stock_remains(db, make_user, make_product, make_trade):
+    owner, buyer, other_buyer = make_user(), make_user(), make_user()
+    product = make_product(owner, quantity=2)
+    trade = make_trade(buyer, owner, requested_product_id=product.id)
+    sibling = make_trade(other_buyer, owner, requested_product_id=product.id)
+
+    assert TradeService.accept_trade(trade.id, owner.id)[1] == []
+    assert db.session.get(Trade, sibling.id).status == 'pending'
+    assert db.session.get(Product, product.id).quantity == 1
+
+
+def test_a_trade_is_accepted_only_once(db, make_user, make_product, make_trade):
+    owner, buyer = make_user(), make_user()
+    product = make_product(owner, quantity=5)
+    trade = make_trade(buyer, owner, requested_product_id=product.id)
+
+    TradeService.accept_trade(trade.id, owner.id)
+    with pytest.raises(TradeError) as error:
+        TradeService.accept_trade(trade.id, owner.id)
+
+    assert error.value.status_code == 409
+    assert db.session.get(Product, product.id).quantity == 4
+
+
+def test_accept_fails_without_side_effects_when_out_of_stock(db, make_user, make_product, make_trade):
+    owner, buyer = make_user(), make_user()
+    product = make_product(owner, quantity=0)
+    trade = make_trade(buyer, owner, requested_product_id=product.id)
+
+    with pytest.raises(TradeError) as error:
+        TradeService.accept_trade(trade.id, owner.id)
+
+    assert error.value.status_code == 409
+    assert db.session.get(Trade, trade.id).status == 'pending'
+
+
+def test_only_the_receiver_may_accept(db, make_user, make_product, make_trade):
+    owner, buyer = make_user(), make_user()
+    trade = make_trade(buyer, owner, requested_product_id=make_product(owner).id)
+
+    with pytest.raises(TradeError) as error:
+        TradeService.accept_trade(trade.id, buyer.id)
+
+    assert error.value.status_code == 403
@@ -8,7 +8,9 @@ export default defineConfig({
     proxy: {
       '/api': {
         target: 'http://localhost:5001',
-        changeOrigin: true
+        changeOrigin: true,
+        // Sends X-Forwarded-For; run the API with TRUSTED_PROXY_HOPS=1
+        xfwd: true
       }
     }
   }